@@ -2,6 +2,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 from datetime import timedelta
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.bars import load_bars
 
 # === 🧪 Load + Explore Parquet ===
 FILE = "tick_data/BTCUSDT_2024-03-01_max10000.parquet"
@@ -29,13 +33,8 @@ plt.tight_layout()
 plt.show()
 
 # === 🔁 Resample to 1-Minute OHLCV ===
-df.set_index("T", inplace=True)
-ohlcv = df.resample("1min").agg({
-    "p": ["first", "max", "min", "last"],
-    "q": "sum"
-})
-ohlcv.columns = ["open", "high", "low", "close", "volume"]
-ohlcv.dropna(inplace=True)
+ohlcv = load_bars("BTCUSDT", "2024-03-01", "1min", parquet_file=FILE)
+ohlcv = ohlcv[["open", "high", "low", "close", "volume"]]
 
 print("\n--- OHLCV SAMPLE ---")
 print(ohlcv.head())
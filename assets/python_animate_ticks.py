@@ -1,7 +1,10 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.utils.tick_charts import iter_cumulative_frames, save_frames_gif
 
 # === CONFIG ===
 SYMBOL = "BTCUSDT"
@@ -18,35 +21,25 @@ df["p"] = df["p"].astype(float)
 df["q"] = df["q"].astype(float)
 df["prev_p"] = df["p"].shift(1)
 df = df.dropna().reset_index(drop=True)
-df["color"] = df.apply(lambda row: "green" if row["p"] >= row["prev_p"] else "red", axis=1)
 
 # === FIXED AXIS RANGE ===
 ymin, ymax = df["p"].min() - 5, df["p"].max() + 5
 xmin, xmax = df["T"].min(), df["T"].max()
 
 # === ANIMATION SETUP ===
+# Static axes are drawn once; each frame only adds its own FRAME_SIZE ticks
 fig, ax = plt.subplots(figsize=(10, 5))
-
-def update(frame_idx):
-    ax.clear()
-    window = df.iloc[: (frame_idx + 1) * FRAME_SIZE]  # <-- CUMULATIVE WINDOW
-    for _, row in window.iterrows():
-        t = row["T"]
-        open_p = row["prev_p"]
-        close_p = row["p"]
-        color = row["color"]
-        ax.plot([t, t], [open_p, close_p], color=color, linewidth=2 + row["q"] * 0.2, alpha=0.8)
-
-    ax.set_xlim(xmin, xmax)
-    ax.set_ylim(ymin, ymax)
-    ax.set_title(f"{SYMBOL} Cumulative Tick Candles (Frame {frame_idx + 1})")
-    ax.set_xlabel("Time")
-    ax.set_ylabel("Price")
-    ax.grid(True)
-
-frame_count = len(df) // FRAME_SIZE
-
-ani = animation.FuncAnimation(fig, update, frames=frame_count, interval=1000 // FPS)
-ani.save(OUT_PATH, writer='pillow', dpi=120)
+ax.set_xlim(xmin, xmax)
+ax.set_ylim(ymin, ymax)
+ax.xaxis_date()
+ax.set_xlabel("Time")
+ax.set_ylabel("Price")
+ax.grid(True)
+
+frames = iter_cumulative_frames(
+    fig, ax, df["T"].values, df["prev_p"].values, df["p"].values, df["q"].values,
+    frame_size=FRAME_SIZE, title_fmt=f"{SYMBOL} Cumulative Tick Candles (Frame {{frame}})", dpi=120
+)
+save_frames_gif(frames, OUT_PATH, fps=FPS)
 
 print(f"\n✅ Cumulative tick animation saved to: {OUT_PATH.resolve()}")
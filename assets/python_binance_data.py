@@ -5,6 +5,10 @@ import pandas as pd
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.tick_store import TickStore
 
 BASE_URL = "https://api.binance.com"  
 
@@ -55,7 +59,28 @@ def save_to_parquet(data: list, symbol: str, output_dir: str, filename_part: str
     print(f"✅ Saved {symbol} data to {output_path}")
 
 
-def download_binance_trades(symbol: str, date: str, output_dir: str, max_trades=10000):
+def save_to_tick_store(data: list, symbol: str, store_root: str):
+    store = TickStore(store_root)
+    written = store.append(symbol, data)
+    if not written:
+        print(f"⚠ No data for {symbol}")
+        return
+    for date in store.dates(symbol):
+        store.compact(symbol, date)
+    print(f"✅ Stored {written} {symbol} trades in {store.root}")
+
+
+def download_binance_trades(symbol: str, date: str, output_dir: str, max_trades=10000, store_root=None):
+    if store_root is not None:
+        # Typed, memory-mappable columns; max_trades=None keeps the full tape
+        start_dt = datetime.strptime(date, "%Y-%m-%d")
+        start_time = int(start_dt.timestamp() * 1000)
+        end_time = int((start_dt + timedelta(days=1)).timestamp() * 1000)
+        print(f"📦 Downloading {symbol} for {date} into tick store")
+        data = get_agg_trades(symbol, start_time, end_time, max_trades=max_trades)
+        save_to_tick_store(data, symbol, store_root)
+        return
+
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     file_path = Path(output_dir) / f"{symbol}_{date}_max{max_trades}.parquet"
     if file_path.exists():
@@ -4,6 +4,11 @@ from binance_data import download_binance_trades
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path  # ← THIS IS THE FIX
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.tick_store import STORE_ROOT
 
 TICKERS = [
     "BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT",
@@ -15,7 +20,14 @@ DATE = "2024-03-01"
 MAX_TRADES = 10_000
 MAX_WORKERS = 5
 
+def main_store():
+    # Full, uncapped tapes: async sharded downloader writing into the tick store
+    from core.data.binance_downloader import download_trades
+    asyncio.run(download_trades(TICKERS, [DATE], store_root=STORE_ROOT))
+
 def main():
+    if "--store" in sys.argv:
+        return main_store()
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {
             executor.submit(download_binance_trades, symbol, DATE, OUTPUT_DIR, MAX_TRADES): symbol
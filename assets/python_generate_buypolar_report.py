@@ -4,6 +4,10 @@ from matplotlib.backends.backend_pdf import PdfPages
 from pathlib import Path
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.bars import load_bars
 
 # === CONFIG ===
 SYMBOL = "BTCUSDT"
@@ -25,18 +29,9 @@ if not LOGO_PATH.exists():
     img.save(LOGO_PATH)
 
 # === LOAD & PREPARE DATA ===
-df = pd.read_parquet(FILE)
-df["T"] = pd.to_datetime(df["T"])
-df["p"] = df["p"].astype(float)
-df["q"] = df["q"].astype(float)
-
-df.set_index("T", inplace=True)
-ohlcv = df.resample("1min").agg({
-    "p": ["first", "max", "min", "last"],
-    "q": "sum"
-})
-ohlcv.columns = ["open", "high", "low", "close", "volume"]
-ohlcv.dropna(inplace=True)
+# Pre-aggregated 1-min bars from the bar cache (falls back to the tick file)
+ohlcv = load_bars(SYMBOL, DATE, "1min", parquet_file=FILE)
+ohlcv = ohlcv[["open", "high", "low", "close", "volume"]]
 
 # === ANALYTICS ===
 ohlcv["sma_5"] = ohlcv["close"].rolling(5).mean()
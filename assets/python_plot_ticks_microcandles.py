@@ -3,6 +3,11 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.backends.backend_pdf import PdfPages
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.bars import load_bars
+from core.utils.tick_charts import draw_candles
 
 # === CONFIG ===
 SYMBOL = "BTCUSDT"
@@ -13,14 +18,8 @@ REPORT_PATH = REPORT_DIR / f"{SYMBOL}_{DATE}_microcandles.pdf"
 CANDLE_INTERVAL = "0.01s"
 CHUNK_SIZE = 1000  # how many candles per page (5s * 120 = 10 minutes)
 
-# === LOAD TICK DATA ===
-df = pd.read_parquet(FILE)
-df["T"] = pd.to_datetime(df["T"])
-df["p"] = df["p"].astype(float)
-df.set_index("T", inplace=True)
-
-# === RESAMPLE TO MICRO CANDLES ===
-ohlc = df["p"].resample(CANDLE_INTERVAL).ohlc().dropna()
+# === LOAD MICRO CANDLES (bar cache, or one pass over the tick file) ===
+ohlc = load_bars(SYMBOL, DATE, CANDLE_INTERVAL, parquet_file=FILE)
 ohlc.reset_index(inplace=True)
 ohlc["group"] = ohlc.index // CHUNK_SIZE
 
@@ -29,11 +28,9 @@ REPORT_DIR.mkdir(exist_ok=True)
 with PdfPages(REPORT_PATH) as pdf:
     for group_id, chunk in ohlc.groupby("group"):
         fig, ax = plt.subplots(figsize=(10, 5))
-        for _, row in chunk.iterrows():
-            t = row["T"]
-            color = "green" if row["close"] >= row["open"] else "red"
-            ax.plot([t, t], [row["low"], row["high"]], color=color, linewidth=1)  # wick
-            ax.plot([t, t], [row["open"], row["close"]], color=color, linewidth=4)  # body
+        # One wick collection + one body collection per page
+        draw_candles(ax, chunk["T"].values, chunk["open"].values, chunk["high"].values,
+                     chunk["low"].values, chunk["close"].values)
 
         ax.set_title(f"{SYMBOL} Micro-Candles (5s) | {DATE} | Page {group_id + 1}")
         ax.set_xlabel("Time")
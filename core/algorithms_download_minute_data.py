@@ -2,18 +2,13 @@
 import os
 import yfinance as yf
 import pandas as pd
+import sys
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
-import pandas_market_calendars as mcal
 
-# NYSE market open check (Eastern time)
-nyse = mcal.get_calendar("NYSE")
-today = pd.Timestamp.now(tz="US/Eastern").normalize()
-schedule = nyse.valid_days(start_date=today - pd.Timedelta(days=1), end_date=today)
-
-if len(schedule) == 0:
-    print("⚠️ Market is closed today — try again on a trading day.")
-    exit()
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.minute_lake import MinuteLake
+from core.data.calendars import sessions
 
 # Tickers to download (US, China, Europe, Norway)
 TICKERS = [
@@ -31,18 +26,16 @@ TICKERS = [
     "EQNR.OL", "NHY.OL", "DNB.OL", "MOWI.OL", "YAR.OL", "TEL.OL", "ORK.OL", "SALM.OL", "AKERBP.OL", "TGS.OL"
 ]
 
-# Create save path relative to script
-SAVE_DIR = Path("data/raw/minute")
-SAVE_DIR.mkdir(parents=True, exist_ok=True)
+# Minute bars accumulate in the lake (ticker/month partitions) across runs
+LAKE = MinuteLake("data/lake/minute")
 
-# Download + save minute data
+# Download + merge minute data
 def fetch_and_save(ticker):
     try:
         df = yf.download(ticker, period="7d", interval="1m", progress=False)
         if not df.empty:
-            save_path = SAVE_DIR / f"{ticker}.parquet"
-            df.to_parquet(save_path)
-            print(f"✅ Saved {ticker}")
+            added = LAKE.append(ticker, df)
+            print(f"✅ Saved {ticker} ({added} new bars)")
         else:
             print(f"⚠️ No data for {ticker}")
     except Exception as e:
@@ -50,5 +43,12 @@ def fetch_and_save(ticker):
 
 # Run parallel download
 if __name__ == "__main__":
+    # NYSE market open check (cached session table)
+    today = pd.Timestamp.now(tz="US/Eastern").normalize()
+    nyse = sessions("NYSE")
+    if not (nyse.is_trading_day(today) or nyse.is_trading_day(today - pd.Timedelta(days=1))):
+        print("⚠️ Market is closed today — try again on a trading day.")
+        exit()
+
     with ThreadPoolExecutor(max_workers=5) as executor:
         executor.map(fetch_and_save, TICKERS)
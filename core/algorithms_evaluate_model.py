@@ -4,18 +4,23 @@
 import torch
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 from sklearn.metrics import mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
 from models import SimpleMLP
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.query import exec_samples
+
 # Paths
 DATA_PATH = Path("data/simulated/exec_dataset.parquet")
 MODEL_PATH = Path("model/simple_mlp.pt")
 SAVE_PATH = Path("results/eval_predictions.csv")
 
 def load_data():
-    df = pd.read_parquet(DATA_PATH)
+    df = exec_samples(columns=["ticker", "date", "start_time", "order_size", "duration", "minutes_since_open",
+                               "volume_ratio", "price_volatility", "slippage"], path=DATA_PATH)
     df = df.replace([np.inf, -np.inf], np.nan).dropna()
 
     # Features and target
@@ -4,17 +4,20 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from pathlib import Path
 import seaborn as sns
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.query import bars, exec_samples
 
 # Set up paths
-RAW_PATH = Path("data/raw/minute")
 SIM_PATH = Path("data/simulated/exec_dataset.parquet")
 PRED_PATH = Path("results/eval_predictions.csv")
 PLOT_DIR = Path("plots")
 PLOT_DIR.mkdir(exist_ok=True)
 
-# Load data
-raw_files = list(RAW_PATH.glob("*.parquet"))
-sim_df = pd.read_parquet(SIM_PATH)
+# Load data (only the columns the plots use)
+sim_df = exec_samples(columns=["ticker", "date", "start_time", "order_size", "vwap", "minutes_since_open",
+                               "volume_ratio", "price_volatility", "slippage"], path=SIM_PATH)
 pred_df = pd.read_csv(PRED_PATH)
 
 # Merge pred_df with sim_df to get order_size and vwap
@@ -84,7 +87,8 @@ with PdfPages(PLOT_DIR / "model_performance.pdf") as pdf:
 
     # 6-10. VWAP Through the Day (5 Tickers)
     for ticker in example_tickers:
-        ticker_df = sim_df[sim_df["ticker"] == ticker]
+        ticker_df = exec_samples({"ticker": ticker}, columns=["minutes_since_open", "vwap", "order_size"],
+                                 path=SIM_PATH)
         plt.figure(figsize=(10, 6))
         plt.plot(ticker_df["minutes_since_open"], ticker_df["vwap"], label="VWAP")
         plt.twinx()
@@ -98,10 +102,9 @@ with PdfPages(PLOT_DIR / "model_performance.pdf") as pdf:
 
     # 11-15. Price and Volume (5 Tickers)
     for ticker in example_tickers:
-        raw_df = pd.read_parquet(RAW_PATH / f"{ticker}.parquet")
-        raw_df = raw_df[raw_df.index.date == pd.Timestamp("2025-04-04").date()]
-        if isinstance(raw_df.columns, pd.MultiIndex):
-            raw_df.columns = raw_df.columns.get_level_values(0)  # Flatten MultiIndex
+        day = pd.Timestamp("2025-04-04", tz="US/Eastern")
+        raw_df = bars([ticker], day, day + pd.Timedelta(days=1), columns=["close", "volume"], session=None)
+        raw_df = raw_df.rename(columns={"close": "Close", "volume": "Volume"})
         plt.figure(figsize=(10, 6))
         plt.plot(raw_df.index, raw_df["Close"], label="Close")
         plt.twinx()
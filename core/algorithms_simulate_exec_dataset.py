@@ -2,19 +2,21 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from glob import glob
-import pandas_market_calendars as mcal
 import sys
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.minute_lake import MinuteLake
+from core.data.calendars import sessions
+
 # Set up folders
-RAW_PATH = Path("data/raw/minute")
+LAKE = MinuteLake("data/lake/minute")
 SAVE_PATH = Path("data/simulated")
 SAVE_PATH.mkdir(parents=True, exist_ok=True)
 
 # Check if today is a valid trading day
-nyse = mcal.get_calendar("NYSE")
+nyse = sessions("NYSE")
 today = pd.Timestamp.today(tz='US/Eastern').normalize()
-valid_days = nyse.valid_days(start_date=today - pd.Timedelta(days=7), end_date=today)
+valid_days = nyse.valid_days(start=today - pd.Timedelta(days=7), end=today + pd.Timedelta(days=1))
 latest_valid_day = valid_days.max().normalize()
 print(f"Latest valid trading day: {latest_valid_day}")
 
@@ -43,12 +45,10 @@ def simulate_sample(df, ticker):
     df.index = pd.to_datetime(df.index, utc=True).tz_convert('US/Eastern')
     df = df.sort_index()
 
-    try:
-        df = df.between_time("09:30", "15:30")
-        print(f"{ticker}: Rows after time filter: {len(df)}")
-    except Exception as e:
-        print(f"⚠️ Could not filter trading hours for {ticker}: {e}")
-        return []
+    # Regular session minus the last 30 minutes, via the cached session table
+    in_session = nyse.mask(df.index) & nyse.mask(df.index + pd.Timedelta(minutes=30))
+    df = df[in_session]
+    print(f"{ticker}: Rows after time filter: {len(df)}")
 
     df = df[df["Volume"] > 0]
     print(f"{ticker}: Rows after volume filter: {len(df)}")
@@ -116,22 +116,15 @@ def simulate_sample(df, ticker):
 
 def main():
     all_samples = []
-    for path in glob(str(RAW_PATH / "*.parquet")):
-        ticker = Path(path).stem
+    day_start = latest_valid_day.tz_localize(None).tz_localize("US/Eastern")
+    day_end = day_start + pd.Timedelta(days=1)
+    for ticker in LAKE.tickers():
         try:
-            df = pd.read_parquet(path)
+            # Lake bars are already flat and UTC; only the last valid day is read
+            df = LAKE.read(ticker, start=day_start, end=day_end, columns=["close", "volume"])
+            df.columns = [c.capitalize() for c in df.columns]
+            df.index = df.index.tz_convert('US/Eastern')
             print(f"\nProcessing {ticker}:")
-            print(f"Raw data index range: {df.index.min()} to {df.index.max()}")
-            print(f"Unique dates in raw data: {sorted(set(df.index.date))}")
-
-            # Ensure flat DataFrame structure
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)  # Keep only Price level (Close, Volume, etc.)
-            df = df.reset_index(level='Ticker', drop=True) if 'Ticker' in df.index.names else df
-
-            # Filter only data for the last valid trading day
-            df.index = pd.to_datetime(df.index, utc=True).tz_convert('US/Eastern')
-            df = df[df.index.date == latest_valid_day.date()]
             print(f"Filtered data rows for {latest_valid_day.date()}: {len(df)}")
 
             samples = simulate_sample(df, ticker)
@@ -1,13 +1,16 @@
-import pandas as pd
-df = pd.read_parquet("data/raw/minute/AAPL.parquet")
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.query import bars, exec_samples
+
+df = bars(["AAPL"], session=None)
 print(df.head())
 
-import pandas as pd
-df = pd.read_parquet("data/raw/minute/TSLA.parquet")
+df = bars(["TSLA"], session=None)
 print(df.head())
 
-import pandas as pd
-df = pd.read_parquet("data/simulated/exec_dataset.parquet")
+df = exec_samples()
 print(df.head())
 print(df.shape)
 print(df.isna().sum())
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Cached daily price data for backtests.
+
+Each ticker's yfinance history is stored once as Parquet under
+data/cache/daily/ together with the date range it covers, so repeated
+backtests (and every worker of a parallel run) read from disk and only
+ranges that are not cached yet are downloaded.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "daily"
+
+FIELDS = ["open", "high", "low", "close", "adj_close", "volume"]
+
+
+def _cache_path(ticker, cache_dir):
+    return Path(cache_dir) / f"{ticker}.parquet"
+
+
+def _coverage_path(cache_dir):
+    return Path(cache_dir) / "coverage.json"
+
+
+def _read_coverage(cache_dir):
+    path = _coverage_path(cache_dir)
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_coverage(coverage, cache_dir):
+    path = _coverage_path(cache_dir)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(coverage, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _download(ticker, start, end):
+    import yfinance as yf
+
+    df = yf.download(ticker, start=start, end=end, auto_adjust=False, progress=False)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=FIELDS)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df.columns = [str(c).lower().replace(" ", "_") for c in df.columns]
+    index = pd.DatetimeIndex(df.index)
+    df.index = (index.tz_localize(None) if index.tz is not None else index).normalize()
+    return df.reindex(columns=FIELDS).astype("float64")
+
+
+def _missing_ranges(start, end, span, last=None):
+    """[start, end) pieces not covered by the cached `span` (the cache stays one contiguous range).
+
+    The range after the span starts at the `last` cached session, so that
+    bar is always downloaded again in case it was stored before the close.
+    """
+    if not span:
+        return [(start, end)]
+    ranges = []
+    if start < span[0]:
+        ranges.append((start, span[0]))
+    if end > span[1]:
+        ranges.append((min(span[1], last) if last else span[1], end))
+    return ranges
+
+
+def ensure_cached(tickers, start, end, cache_dir=CACHE_DIR, refresh=False):
+    """Download whatever part of [start, end) is missing from the cache.
+
+    Only the gaps before and after the cached range are fetched, and the
+    recorded coverage only grows over gaps that returned data. Coverage
+    never reaches past today, so a bar downloaded during the session
+    (or missing because the session has not closed) is fetched again on
+    the next run.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    coverage = _read_coverage(cache_dir)
+    start, end = str(pd.Timestamp(start).date()), str(pd.Timestamp(end).date())
+    today = str(pd.Timestamp.today().date())
+
+    for ticker in tickers:
+        path = _cache_path(ticker, cache_dir)
+        span = None if refresh or not path.exists() else coverage.get(ticker)
+        if span and span[0] <= start and span[1] >= end:
+            continue
+        cached = pd.read_parquet(path) if span else None
+        last = str(cached.index.max().date()) if cached is not None and len(cached) else None
+        ranges = _missing_ranges(start, end, span, last)
+
+        lo, hi = span if span else (None, None)
+        frames = []
+        for gap_start, gap_end in ranges:
+            print(f"📥 Downloading {ticker} {gap_start} → {gap_end}")
+            frame = _download(ticker, gap_start, gap_end)
+            if frame.empty:
+                print(f"⚠️ No data for {ticker} {gap_start} → {gap_end}")
+                continue
+            frames.append(frame)
+            gap_end = min(gap_end, today)
+            lo = gap_start if lo is None else min(lo, gap_start)
+            hi = gap_end if hi is None else max(hi, gap_end)
+        if not frames:
+            continue
+
+        if cached is not None:
+            frames.insert(0, cached)
+        frame = pd.concat(frames)
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        frame.to_parquet(path)
+        coverage[ticker] = [lo, hi]
+        _write_coverage(coverage, cache_dir)
+
+
+def load_prices(tickers, start, end, fields=("close",), cache_dir=CACHE_DIR, download=True):
+    """{field: DataFrame (date x ticker)} for [start, end) from the local cache.
+
+    Tickers without cached prices are reported and left out of the frames.
+    """
+    if download:
+        ensure_cached(tickers, start, end, cache_dir)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    columns = {field: {} for field in fields}
+    loaded = []
+    for ticker in tickers:
+        path = _cache_path(ticker, cache_dir)
+        if not path.exists():
+            print(f"⚠️ No cached prices for {ticker} in {cache_dir}, skipping")
+            continue
+        frame = pd.read_parquet(path, columns=list(fields))
+        frame = frame[(frame.index >= start) & (frame.index < end)]
+        for field in fields:
+            columns[field][ticker] = frame[field]
+        loaded.append(ticker)
+    return {field: pd.DataFrame(series).reindex(columns=loaded) for field, series in columns.items()}
@@ -0,0 +1,160 @@
+"""
+Compiled path-dependent kernels.
+
+Numba is optional: without it the kernels run as plain Python over the
+same preallocated arrays, and prange falls back to range.
+
+Usage:
+    from core.backtest.kernels import zscore_rebalance, zscore_sweep
+    cash, shares_a, shares_b, value = zscore_rebalance(pa, pb, z, 1.0, 1e7)
+    final, drawdown, trades = zscore_sweep(pa, pb, np.arange(5, 121), np.linspace(0.25, 3, 56), 1e7)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # plain NumPy loops when numba is not installed
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def rolling_zscore_1d(x, window, out):
+    """Trailing z-score of `x` (sample std) into `out`; NaN until the window fills"""
+    n = len(x)
+    out[:] = np.nan
+    if n < window or window < 2:
+        return out
+    # Centre on the first value so the running sum of squares keeps its precision
+    base = x[0]
+    s = 0.0
+    ss = 0.0
+    for i in range(n):
+        v = x[i] - base
+        s += v
+        ss += v * v
+        if i >= window:
+            old = x[i - window] - base
+            s -= old
+            ss -= old * old
+        if i >= window - 1:
+            mean = s / window
+            var = (ss - window * mean * mean) / (window - 1)
+            if var > 0.0:
+                out[i] = (v - mean) / np.sqrt(var)
+    return out
+
+
+@njit(cache=True)
+def _simulate(price_a, price_b, z, threshold, initial_capital, record, cash, shares_a, shares_b, value):
+    """Dual-class switch: hold all-A or all-B in whole shares, flip when |z| > threshold.
+
+    Writes per-bar paths when `record` is set; always returns
+    (final value, max drawdown, number of rebalances).
+    """
+    n = len(z)
+    start = -1
+    for i in range(n):
+        if np.isfinite(z[i]):
+            start = i
+            break
+    if start < 0:
+        return initial_capital, 0.0, 0
+
+    if z[start] > 0:
+        held_a = 0.0
+        held_b = np.floor(initial_capital / price_b[start])
+        cash_t = initial_capital - held_b * price_b[start]
+    else:
+        held_b = 0.0
+        held_a = np.floor(initial_capital / price_a[start])
+        cash_t = initial_capital - held_a * price_a[start]
+
+    peak = initial_capital
+    max_drawdown = 0.0
+    n_trades = 0
+    total = initial_capital
+    for i in range(start, n):
+        zi = z[i]
+        if (zi > threshold and held_a > 0) or (zi < -threshold and held_b > 0):
+            total = held_a * price_a[i] + held_b * price_b[i] + cash_t
+            if zi > 0:
+                held_a = 0.0
+                held_b = np.floor(total / price_b[i])
+                cash_t = total - held_b * price_b[i]
+            else:
+                held_b = 0.0
+                held_a = np.floor(total / price_a[i])
+                cash_t = total - held_a * price_a[i]
+            n_trades += 1
+
+        total = held_a * price_a[i] + held_b * price_b[i] + cash_t
+        if total > peak:
+            peak = total
+        drawdown = total / peak - 1.0
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+        if record:
+            cash[i] = cash_t
+            shares_a[i] = held_a
+            shares_b[i] = held_b
+            value[i] = total
+    return total, max_drawdown, n_trades
+
+
+def zscore_rebalance(price_a, price_b, z, threshold, initial_capital):
+    """Per-bar (cash, shares_a, shares_b, value) of the dual-class strategy.
+
+    Inputs are aligned 1-D arrays without gaps (the script's dropna()
+    rows); bars before the first finite z-score are NaN in the output.
+    """
+    price_a = np.ascontiguousarray(price_a, dtype=np.float64)
+    price_b = np.ascontiguousarray(price_b, dtype=np.float64)
+    z = np.ascontiguousarray(z, dtype=np.float64)
+    cash, shares_a, shares_b, value = (np.full(len(z), np.nan) for _ in range(4))
+    _simulate(price_a, price_b, z, float(threshold), float(initial_capital), True,
+              cash, shares_a, shares_b, value)
+    return cash, shares_a, shares_b, value
+
+
+@njit(parallel=True, cache=True)
+def _sweep(price_a, price_b, windows, thresholds, initial_capital, final, drawdown, trades):
+    n_bars = len(price_a)
+    ratio = price_a / price_b
+    zs = np.empty((len(windows), n_bars))
+    for w in prange(len(windows)):
+        rolling_zscore_1d(ratio, windows[w], zs[w])
+
+    unused = np.empty(0)
+    n_thresholds = len(thresholds)
+    for k in prange(len(windows) * n_thresholds):
+        w = k // n_thresholds
+        h = k % n_thresholds
+        result = _simulate(price_a, price_b, zs[w], thresholds[h], initial_capital, False,
+                           unused, unused, unused, unused)
+        final[w, h] = result[0]
+        drawdown[w, h] = result[1]
+        trades[w, h] = result[2]
+
+
+def zscore_sweep(price_a, price_b, windows, thresholds, initial_capital):
+    """Evaluate every (window, threshold) combination in parallel.
+
+    Returns (final value, max drawdown, rebalance count), each shaped
+    (len(windows), len(thresholds)).
+    """
+    price_a = np.ascontiguousarray(price_a, dtype=np.float64)
+    price_b = np.ascontiguousarray(price_b, dtype=np.float64)
+    windows = np.ascontiguousarray(windows, dtype=np.int64)
+    thresholds = np.ascontiguousarray(thresholds, dtype=np.float64)
+    shape = (len(windows), len(thresholds))
+    final = np.empty(shape)
+    drawdown = np.empty(shape)
+    trades = np.empty(shape, dtype=np.int64)
+    _sweep(price_a, price_b, windows, thresholds, float(initial_capital), final, drawdown, trades)
+    return final, drawdown, trades
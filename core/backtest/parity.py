@@ -0,0 +1,87 @@
+"""
+Parity check between the event-driven and vectorized backtest modes.
+
+Runs every registered strategy over seeded synthetic random walks in both
+modes and asserts that cash, holdings, value and trade counts agree on
+every bar, including runs where orders are rejected for lack of cash or
+shares.
+
+The cases run as tests in core/backtest/tests/test_parity.py.
+
+Usage:
+    python -m pytest core/backtest/tests
+    python -m core.backtest.parity
+"""
+
+import numpy as np
+import pandas as pd
+
+from .engine import MarketData, run_backtest
+from .registry import STRATEGIES, load_strategy
+
+RTOL = 1e-9
+
+
+def synthetic_market(n_bars=750, n_assets=4, seed=0, start="2015-01-01"):
+    """Geometric random-walk OHLCV with a few missing quotes"""
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0.0002, 0.02, size=(n_bars, n_assets))
+    close = 100 * np.exp(np.cumsum(log_returns, axis=0)) * rng.uniform(0.5, 20, size=n_assets)
+    spread = np.abs(rng.normal(0, 0.01, size=close.shape)) * close
+    fields = {
+        "close": close,
+        "adj_close": close,
+        "high": close + spread,
+        "low": close - spread,
+        "volume": rng.integers(1_000, 100_000, size=close.shape).astype(np.float64),
+    }
+    gaps = rng.random(close.shape) < 0.01
+    gaps[0] = False
+    for name in fields:
+        fields[name] = np.where(gaps, np.nan, fields[name])
+    index = pd.bdate_range(start, periods=n_bars)
+    tickers = [f"SYN{i}" for i in range(n_assets)]
+    return MarketData(index, tickers, fields)
+
+
+def check_parity(strategy, data, rtol=RTOL):
+    """Assert event and vectorized runs of `strategy` agree on every bar; returns the bars compared"""
+    event = run_backtest(strategy, data, mode="event")
+    vector = run_backtest(strategy, data, mode="vectorized")
+
+    for name in ("cash", "holdings", "value"):
+        np.testing.assert_allclose(getattr(vector, name), getattr(event, name), rtol=rtol,
+                                   atol=1e-6, err_msg=f"{strategy!r}: {name} differs between modes")
+    assert vector.n_trades == event.n_trades, f"{strategy!r}: trade counts differ"
+    return len(data)
+
+
+def parity_cases():
+    """(strategy, data) combinations covering every registered strategy"""
+    cases = []
+    for seed in range(3):
+        basket = synthetic_market(n_assets=4, seed=seed)
+        pair = synthetic_market(n_assets=2, seed=100 + seed)
+        for name in STRATEGIES:
+            strategy_cls = load_strategy(name)
+            data = pair if strategy_cls.universe == "pair" else basket
+            for cash in (strategy_cls.defaults["initial_cash"], 1e9):
+                cases.append((strategy_cls(initial_cash=cash), data))
+    return cases
+
+
+def main():
+    failures = 0
+    for strategy, data in parity_cases():
+        try:
+            upto = check_parity(strategy, data)
+            print(f"✅ {strategy!r}: modes agree on {upto}/{len(data)} bars")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {e}")
+    if failures:
+        raise SystemExit(f"{failures} parity check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
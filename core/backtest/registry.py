@@ -0,0 +1,26 @@
+"""
+Registry of backtestable strategies.
+
+Kept free of numpy/pandas imports so `strategy list` can enumerate what is
+available without loading the engine.
+"""
+
+# name -> ("module:Class", description)
+STRATEGIES = {
+    "threshold-rebalance": ("core.backtest.strategies:ThresholdRebalance",
+                            "Buy daily drops / sell rises beyond a threshold (hft_60minutes)"),
+    "vwap-deviation": ("core.backtest.strategies:VwapDeviation",
+                       "Fixed lots when close deviates from rolling VWAP (algorithms_vwap3)"),
+    "zscore-dual-class": ("core.backtest.strategies:ZScoreDualClass",
+                          "Switch between share classes on rolling z-score (relative_value_zscore-yoy)"),
+}
+
+
+def load_strategy(name):
+    """Strategy class registered under `name`"""
+    import importlib
+
+    if name not in STRATEGIES:
+        raise KeyError(f"Unknown strategy {name!r}; available: {', '.join(sorted(STRATEGIES))}")
+    module_name, attr = STRATEGIES[name][0].split(":", 1)
+    return getattr(importlib.import_module(module_name), attr)
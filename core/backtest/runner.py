@@ -0,0 +1,123 @@
+"""
+Run a registered strategy over a ticker universe and parameter grid.
+
+Prices are cached up front in the parent process, then every (universe,
+parameter set) job runs in a worker pool reading from that cache, and one
+row of metrics per job is written to Parquet.
+
+Usage:
+    python -m core.backtest.runner zscore-dual-class --tickers BRK-A BRK-B \
+        --start 2015-01-01 --end 2025-01-01 --param window=10,20,60 --workers 4
+"""
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from .data import CACHE_DIR, ensure_cached, load_prices
+from .engine import MarketData, run_backtest
+from .registry import load_strategy
+
+OUTPUT_DIR = Path(__file__).resolve().parents[2] / "data" / "backtests"
+
+
+def _parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parameter_grid(items):
+    """["window=10,20", "threshold=1"] -> cartesian list of parameter dicts"""
+    axes = {}
+    for item in items or ():
+        key, _, values = item.partition("=")
+        if not values:
+            raise ValueError(f"Expected key=value[,value...], got {item!r}")
+        axes[key.strip()] = [_parse_value(v.strip()) for v in values.split(",")]
+    keys = sorted(axes)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(axes[k] for k in keys))]
+
+
+def universes(strategy_cls, tickers):
+    """Split the ticker list into the universes the strategy trades"""
+    tickers = list(tickers)
+    if strategy_cls.universe == "single":
+        return [(t,) for t in tickers]
+    if strategy_cls.universe == "pair":
+        if len(tickers) % 2:
+            raise ValueError(f"{strategy_cls.name} trades pairs; got an odd number of tickers")
+        return [tuple(tickers[i:i + 2]) for i in range(0, len(tickers), 2)]
+    return [tuple(tickers)]
+
+
+def _run_job(job):
+    """Worker entry point: one strategy run over one universe with one parameter set"""
+    name, tickers, start, end, params, mode, cache_dir = job
+    strategy_cls = load_strategy(name)
+    strategy = strategy_cls(**params)
+    frames = load_prices(tickers, start, end, strategy.fields, cache_dir=cache_dir, download=False)
+    result = run_backtest(strategy, MarketData.from_frames(frames, tickers), mode=mode)
+    row = {"strategy": name, "tickers": ",".join(tickers), "start": str(start), "end": str(end), "mode": mode}
+    row.update({f"param_{k}": v for k, v in strategy.params.items()})
+    row.update(result.metrics())
+    return row
+
+
+def run(name, tickers=None, start="2023-01-01", end=None, grid=None, workers=None,
+        output=None, cache_dir=CACHE_DIR, mode="event"):
+    """Backtest `name` over every universe x parameter set; returns the metrics frame"""
+    strategy_cls = load_strategy(name)
+    tickers = list(tickers or strategy_cls.default_universe)
+    end = end or datetime.today().strftime("%Y-%m-%d")
+    grid = grid or [{}]
+
+    ensure_cached(tickers, start, end, cache_dir)
+    jobs = [(name, universe, start, end, params, mode, cache_dir)
+            for universe in universes(strategy_cls, tickers) for params in grid]
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    print(f"📊 {name}: {len(jobs)} runs on {workers} worker(s)")
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_run_job, jobs))
+    else:
+        rows = [_run_job(job) for job in jobs]
+
+    metrics = pd.DataFrame(rows)
+    if output is None:
+        output = OUTPUT_DIR / f"{name}_{datetime.now():%Y%m%d_%H%M%S}.parquet"
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    metrics.to_parquet(output, index=False)
+    print(f"✅ Metrics written to {output}")
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a registered strategy")
+    parser.add_argument("strategy")
+    parser.add_argument("--tickers", nargs="+")
+    parser.add_argument("--start", default="2023-01-01")
+    parser.add_argument("--end")
+    parser.add_argument("--param", action="append", default=[], help="key=value[,value...]")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output")
+    parser.add_argument("--mode", choices=["event", "vectorized"], default="event")
+    args = parser.parse_args()
+
+    metrics = run(args.strategy, args.tickers, args.start, args.end, parameter_grid(args.param),
+                  args.workers, args.output, mode=args.mode)
+    print(metrics.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
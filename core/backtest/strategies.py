@@ -0,0 +1,133 @@
+"""
+Strategies ported from the standalone scripts onto the backtest engine.
+
+    ThresholdRebalance  core/strategies/hft_60minutes.py
+    VwapDeviation       core/algorithms_vwap3.py
+    ZScoreDualClass     core/strategies/relative_value_zscore-yoy.py
+
+Each one only computes its signal matrix with array ops; fills, cash and
+inventory constraints are handled by the engine's execution models.
+"""
+
+import numpy as np
+
+from ..pairs.analytics import rolling_zscores
+from .engine import Strategy
+
+SP500_SUBSET = (
+    "AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "JPM", "V", "WMT",
+    "PG", "KO", "DIS", "NFLX", "CSCO", "INTC", "AMD", "QCOM", "ORCL", "IBM",
+)
+
+
+def ffill(values):
+    """Forward-fill NaNs down the rows of a 1-D or 2-D array"""
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = values[rows, np.arange(values.shape[1])]
+    return filled[:, 0] if flat else filled
+
+
+def rolling_sum(values, window):
+    """Trailing `window` sum down the rows (NaN until the window is full)"""
+    csum = np.cumsum(values, axis=0)
+    out = np.full(values.shape, np.nan)
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    return out
+
+
+class ThresholdRebalance(Strategy):
+    """Buy after a daily drop and sell after a rise of at least `threshold`.
+
+    The traded notional is |return| * `notional_scale` dollars, as in
+    simulate_portfolio() of hft_60minutes.py.
+    """
+
+    name = "threshold-rebalance"
+    fields = ("close",)
+    universe = "basket"
+    execution = "orders"
+    defaults = {"threshold": 0.02, "notional_scale": 100.0, "initial_cash": 10_000.0}
+    default_universe = SP500_SUBSET
+
+    def signals(self, data):
+        prices = data["close"]
+        orders = np.zeros(prices.shape)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change = prices[1:] / prices[:-1] - 1
+            size = np.abs(change) * self.params["notional_scale"] / prices[1:]
+        trade = np.abs(change) >= self.params["threshold"]
+        orders[1:] = np.where(trade, -np.sign(change) * size, 0.0)
+        return np.nan_to_num(orders)
+
+
+class VwapDeviation(Strategy):
+    """Trade fixed lots when the close deviates from a rolling VWAP.
+
+    Buys `shares` when the close is `threshold` below the `window`-day VWAP
+    of the typical price and sells them when it is `threshold` above.
+    """
+
+    name = "vwap-deviation"
+    fields = ("high", "low", "close", "volume")
+    universe = "basket"
+    execution = "orders"
+    defaults = {"window": 5, "threshold": 0.005, "shares": 10, "initial_cash": 10_000.0}
+    default_universe = ("AAPL", "MSFT", "AMZN", "GOOGL", "NVDA")
+
+    def signals(self, data):
+        close = data["close"]
+        volume = np.nan_to_num(data["volume"])
+        typical = np.nan_to_num((data["high"] + data["low"] + close) / 3)
+        window = int(self.params["window"])
+        if len(close) < window:
+            return np.zeros(close.shape)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = rolling_sum(typical * volume, window) / rolling_sum(volume, window)
+        threshold = self.params["threshold"]
+        shares = float(self.params["shares"])
+        orders = np.where(close < vwap * (1 - threshold), shares,
+                          np.where(close > vwap * (1 + threshold), -shares, 0.0))
+        return np.nan_to_num(orders)
+
+
+class ZScoreDualClass(Strategy):
+    """Hold whichever share class is cheap on the rolling z-score of A/B.
+
+    When z > threshold the book switches into B, when z < -threshold into
+    A; the first position follows the sign of the first z-score, as in
+    simulate_strategy() of relative_value_zscore-yoy.py.
+    """
+
+    name = "zscore-dual-class"
+    fields = ("adj_close",)
+    price_field = "adj_close"
+    universe = "pair"
+    execution = "targets"
+    defaults = {"window": 20, "threshold": 1.0, "initial_cash": 1e7}
+    default_universe = ("BRK-A", "BRK-B")
+
+    def signals(self, data):
+        prices = data["adj_close"]
+        # NaN wherever either leg is missing; windows count bars where both quote
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = prices[:, 0] / prices[:, 1]
+        z = rolling_zscores(ratio, [self.params["window"]])[2][0, :, 0]
+        return dual_class_targets(z, self.params["threshold"])
+
+
+def dual_class_targets(z, threshold):
+    """Target weights [A, B] (NaN rows before the first valid z-score)"""
+    side = np.where(z > threshold, 1.0, np.where(z < -threshold, 0.0, np.nan))
+    valid = np.flatnonzero(np.isfinite(z))
+    if len(valid):
+        first = valid[0]
+        if np.isnan(side[first]):
+            side[first] = 1.0 if z[first] > 0 else 0.0
+    side = ffill(side)
+    return np.column_stack([1.0 - side, side])
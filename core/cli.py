@@ -2,231 +2,178 @@
 """
 BuyPolar Capital CLI - Streamlined Version
 Essential command-line interface for the quantitative finance research hub.
+
+Subcommands live in core/commands/ and are only imported when invoked, so
+`status` and `strategy list` never pay for pandas/torch/matplotlib. Extra
+commands can be plugged in through the "buypolar.commands" entry-point
+group.
+
+Pass --profile-import (or set BUYPOLAR_PROFILE_IMPORT=1) to see where
+import time goes. The profiler is installed before click is imported, so
+the report covers click, this module and the invoked command; imports made
+by the interpreter itself before core.cli runs (site, encodings) are only
+visible with `python -X importtime`.
 """
 
-import click
+import atexit
+import builtins
 import os
 import sys
-import subprocess
+import time
 from pathlib import Path
-from datetime import datetime
-import webbrowser
+
+_STARTED = time.perf_counter()
+
+
+def _absolute_name(name, globals, level):
+    """Absolute module name of an import statement (resolves `from .x import y`)"""
+    if level == 0:
+        return name
+    package = (globals or {}).get("__package__") or ""
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    return f"{base}.{name}" if name else base
+
+
+class ImportProfiler:
+    """Record inclusive and self time of every module loaded while installed"""
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._original = None
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = _absolute_name(name, globals, level)
+        if module_name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        return self.timed(module_name, self._original, name, globals, locals, fromlist, level)
+
+    def timed(self, name, func, *args):
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            # Only statements that actually loaded a module are reported
+            if name in sys.modules:
+                self.records.append((name, elapsed, elapsed - children, len(self._stack)))
+
+    def report(self, limit=25):
+        self.uninstall()
+        top_level = sum(elapsed for _, elapsed, _, depth in self.records if depth == 0)
+        lines = ["", "⏱️  Import profile (slowest first)", f"{'cumulative ms':>14} {'self ms':>9}  module"]
+        for name, elapsed, own, depth in sorted(self.records, key=lambda r: -r[1])[:limit]:
+            lines.append(f"{elapsed * 1e3:14.1f} {own * 1e3:9.1f}  {'  ' * depth}{name}")
+        lines.append(f"Total import time: {top_level * 1e3:.1f} ms "
+                     f"(since core.cli started: {(time.perf_counter() - _STARTED) * 1e3:.1f} ms)")
+        print("\n".join(lines), file=sys.stderr)
+
+
+_profiler = None
+if "--profile-import" in sys.argv[1:] or os.environ.get("BUYPOLAR_PROFILE_IMPORT"):
+    _profiler = ImportProfiler()
+    _profiler.install()
+    atexit.register(_profiler.report)
+
+import click  # noqa: E402  (after the profiler, so its import cost is measured)
 
 # Add the core directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-@click.group()
-@click.version_option(version="2.0.0")
-def main():
-    """
-    BuyPolar Capital - Interactive Quantitative Finance Hub
-    
-    Essential CLI for trading algorithms, market analysis, and educational resources.
-    """
-    pass
+ENTRY_POINT_GROUP = "buypolar.commands"
 
-@main.group()
-def dashboard():
-    """Dashboard and market data commands."""
-    pass
+# command name -> "module:attribute", imported on first use
+COMMAND_REGISTRY = {
+    "dashboard": "core.commands.dashboard:dashboard",
+    "strategy": "core.commands.strategy:strategy",
+    "education": "core.commands.education:education",
+    "status": "core.commands.info:status",
+    "website": "core.commands.info:website",
+    "github": "core.commands.info:github",
+    "tools": "core.commands.tools:tools",
+}
 
-@dashboard.command()
-@click.option('--port', '-p', default=8501, help='Port to run the dashboard on')
-def serve(port):
-    """Serve the interactive dashboard locally."""
-    try:
-        import streamlit as st
-        
-        dashboard_path = Path(__file__).parent.parent / "dashboards" / "market_overview"
-        app_file = dashboard_path / "app.py"
-        
-        if not app_file.exists():
-            click.echo("❌ Dashboard app.py not found!")
-            click.echo(f"Expected location: {app_file}")
-            return
-            
-        click.echo(f"🚀 Starting interactive dashboard on port {port}...")
-        click.echo(f"📊 Dashboard will be available at: http://localhost:{port}")
-        
-        # Run streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(app_file), 
-            "--server.port", str(port)
-        ])
-        
-    except ImportError:
-        click.echo("❌ Streamlit not installed. Install with: pip install streamlit")
-    except Exception as e:
-        click.echo(f"❌ Error starting dashboard: {e}")
 
-@dashboard.command()
-def update():
-    """Update market data for dashboards."""
-    try:
-        click.echo("🔄 Updating market data...")
-        
-        # Simple data update - can be enhanced later
-        data_dir = Path(__file__).parent.parent / "data" / "processed"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create sample data file
-        sample_data = {
-            "timestamp": datetime.now().isoformat(),
-            "spy": {"price": 450.25, "change": 0.85},
-            "btc": {"price": 65000, "change": -2.34},
-            "gold": {"price": 1950, "change": 0.67},
-            "tlt": {"price": 95.50, "change": -0.12}
-        }
-        
-        import json
-        with open(data_dir / "market_data.json", "w") as f:
-            json.dump(sample_data, f, indent=2)
-            
-        click.echo("✅ Market data updated successfully!")
-        
-    except Exception as e:
-        click.echo(f"❌ Error updating data: {e}")
-
-@main.group()
-def strategy():
-    """Trading strategy commands."""
-    pass
+def _resolve(target):
+    """Import "module:attribute" and return the attribute"""
+    import importlib
 
-@strategy.command()
-def list():
-    """List available trading strategies."""
-    strategies = {
-        "HFT": ["Market Making", "Statistical Arbitrage", "Momentum Trading"],
-        "Mean Reversion": ["Pairs Trading", "Bollinger Bands", "RSI Divergence"],
-        "Momentum": ["Trend Following", "Breakout Trading", "Moving Average Crossover"],
-        "Arbitrage": ["Statistical Arbitrage", "Pairs Trading", "Risk Arbitrage"],
-        "ML": ["Neural Networks", "Random Forest", "Reinforcement Learning"]
-    }
-    
-    click.echo("📈 Available Trading Strategies:")
-    click.echo("=" * 50)
-    
-    for category, strategy_list in strategies.items():
-        click.echo(f"\n{category}:")
-        for strategy in strategy_list:
-            click.echo(f"  • {strategy}")
-
-@strategy.command()
-@click.argument('strategy_name')
-def backtest(strategy_name):
-    """Run backtest for a trading strategy."""
-    click.echo(f"📊 Running backtest for strategy: {strategy_name}")
-    click.echo("This feature is under development...")
-    click.echo("Check the GitHub repository for implementation details.")
-
-@main.group()
-def education():
-    """Educational content commands."""
-    pass
+    module_name, attr = target.split(":", 1)
+    if _profiler is not None:
+        module = _profiler.timed(module_name, importlib.import_module, module_name)
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, attr)
 
-@education.command()
-def quiz():
-    """Take an interactive finance quiz."""
-    click.echo("🎯 Interactive Finance Quiz")
-    click.echo("=" * 30)
-    
-    questions = [
-        ("What is the Sharpe ratio used to measure?", "Risk-adjusted return"),
-        ("What does VaR stand for in risk management?", "Value at Risk"),
-        ("What is the primary purpose of portfolio diversification?", "Reduce overall portfolio risk")
-    ]
-    
-    score = 0
-    for i, (question, answer) in enumerate(questions, 1):
-        click.echo(f"\nQ{i}: {question}")
-        user_answer = click.prompt("Your answer", type=str)
-        
-        if user_answer.lower() in answer.lower() or answer.lower() in user_answer.lower():
-            click.echo("✅ Correct!")
-            score += 1
-        else:
-            click.echo(f"❌ Incorrect. The answer was: {answer}")
-    
-    click.echo(f"\n🎉 Final Score: {score}/{len(questions)}")
-
-@education.command()
-def calculator():
-    """Open the financial calculator."""
-    click.echo("🧮 Opening financial calculator...")
-    click.echo("Visit the interactive website for the calculator tool.")
-
-@main.command()
-def status():
-    """Show system status."""
-    click.echo("🏥 BuyPolar Capital System Status")
-    click.echo("=" * 50)
-    
-    # Check if key directories exist
-    base_path = Path(__file__).parent.parent
-    directories = [
-        "core",
-        "assets",
-        "dashboards",
-        "data",
-        "docs"
-    ]
-    
-    for directory in directories:
-        dir_path = base_path / directory
-        if dir_path.exists():
-            click.echo(f"✅ {directory}")
-        else:
-            click.echo(f"❌ {directory}")
-    
-    click.echo(f"\n📅 Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-@main.command()
-def website():
-    """Open the interactive website in browser."""
-    website_url = "https://yourusername.github.io/buypolarcapital/"
-    click.echo(f"🌐 Opening interactive website: {website_url}")
-    webbrowser.open(website_url)
-
-@main.command()
-def github():
-    """Open GitHub repository in browser."""
-    repo_url = "https://github.com/yourusername/buypolarcapital"
-    click.echo(f"🐙 Opening GitHub repository: {repo_url}")
-    webbrowser.open(repo_url)
-
-@main.group()
-def tools():
-    """Utility tools."""
-    pass
 
-@tools.command()
-def format():
-    """Format code using style guidelines."""
+def _entry_points():
+    """Third-party commands registered under ENTRY_POINT_GROUP"""
     try:
-        click.echo("🎨 Formatting code...")
-        
-        # Format Python code
-        subprocess.run([sys.executable, "-m", "black", "core", "assets"])
-        subprocess.run([sys.executable, "-m", "isort", "core", "assets"])
-        
-        click.echo("✅ Code formatting completed!")
-        
-    except Exception as e:
-        click.echo(f"❌ Error formatting code: {e}")
-
-@tools.command()
-def test():
-    """Run the test suite."""
+        from importlib.metadata import entry_points
+    except ImportError:
+        return {}
     try:
-        click.echo("🧪 Running test suite...")
-        
-        subprocess.run([sys.executable, "-m", "pytest", "tests/", "-v"])
-        
-        click.echo("✅ Tests completed!")
-        
-    except Exception as e:
-        click.echo(f"❌ Error running tests: {e}")
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python < 3.10
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    return {ep.name: ep.value for ep in found}
+
+
+class LazyGroup(click.Group):
+    """click Group whose subcommands are imported only when looked up"""
+
+    def __init__(self, *args, registry=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.registry = dict(registry or {})
+        self._plugins = None
+
+    def _targets(self, include_plugins):
+        if include_plugins and self._plugins is None:
+            self._plugins = _entry_points()
+        targets = dict(self._plugins or {})
+        targets.update(self.registry)
+        return targets
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self._targets(True)))
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+        # Built-in commands resolve without scanning installed distributions
+        target = self.registry.get(cmd_name) or self._targets(True).get(cmd_name)
+        if target is None:
+            return None
+        command = _resolve(target)
+        self.add_command(command, cmd_name)
+        return command
+
+
+@click.group(cls=LazyGroup, registry=COMMAND_REGISTRY)
+@click.version_option(version="2.0.0")
+@click.option('--profile-import', is_flag=True, is_eager=True, expose_value=False,
+              help='Report import-time cost of click and the invoked command (read from sys.argv at startup).')
+def main():
+    """
+    BuyPolar Capital - Interactive Quantitative Finance Hub
+    
+    Essential CLI for trading algorithms, market analysis, and educational resources.
+    """
+    pass
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main() 
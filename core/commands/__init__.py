@@ -0,0 +1,7 @@
+"""
+Subcommands for the BuyPolar CLI.
+
+Each module here is imported only when its command is invoked (see
+COMMAND_REGISTRY in core/cli.py), so heavy dependencies must be imported
+inside command bodies, never at module level.
+"""
@@ -0,0 +1,76 @@
+"""Dashboard and market data commands."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+BASE_PATH = Path(__file__).resolve().parent.parent.parent
+
+
+@click.group()
+def dashboard():
+    """Dashboard and market data commands."""
+    pass
+
+@dashboard.command()
+@click.option('--port', '-p', default=8501, help='Port to run the dashboard on')
+def serve(port):
+    """Serve the interactive dashboard locally."""
+    import subprocess
+
+    try:
+        import streamlit as st
+        
+        dashboard_path = BASE_PATH / "dashboards" / "market_overview"
+        app_file = dashboard_path / "app.py"
+        
+        if not app_file.exists():
+            click.echo("❌ Dashboard app.py not found!")
+            click.echo(f"Expected location: {app_file}")
+            return
+            
+        click.echo(f"🚀 Starting interactive dashboard on port {port}...")
+        click.echo(f"📊 Dashboard will be available at: http://localhost:{port}")
+        
+        # Run streamlit
+        subprocess.run([
+            sys.executable, "-m", "streamlit", "run", 
+            str(app_file), 
+            "--server.port", str(port)
+        ])
+        
+    except ImportError:
+        click.echo("❌ Streamlit not installed. Install with: pip install streamlit")
+    except Exception as e:
+        click.echo(f"❌ Error starting dashboard: {e}")
+
+@dashboard.command()
+def update():
+    """Update market data for dashboards."""
+    import json
+
+    try:
+        click.echo("🔄 Updating market data...")
+        
+        # Simple data update - can be enhanced later
+        data_dir = BASE_PATH / "data" / "processed"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Create sample data file
+        sample_data = {
+            "timestamp": datetime.now().isoformat(),
+            "spy": {"price": 450.25, "change": 0.85},
+            "btc": {"price": 65000, "change": -2.34},
+            "gold": {"price": 1950, "change": 0.67},
+            "tlt": {"price": 95.50, "change": -0.12}
+        }
+        
+        with open(data_dir / "market_data.json", "w") as f:
+            json.dump(sample_data, f, indent=2)
+            
+        click.echo("✅ Market data updated successfully!")
+        
+    except Exception as e:
+        click.echo(f"❌ Error updating data: {e}")
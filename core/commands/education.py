@@ -0,0 +1,40 @@
+"""Educational content commands."""
+
+import click
+
+
+@click.group()
+def education():
+    """Educational content commands."""
+    pass
+
+@education.command()
+def quiz():
+    """Take an interactive finance quiz."""
+    click.echo("🎯 Interactive Finance Quiz")
+    click.echo("=" * 30)
+    
+    questions = [
+        ("What is the Sharpe ratio used to measure?", "Risk-adjusted return"),
+        ("What does VaR stand for in risk management?", "Value at Risk"),
+        ("What is the primary purpose of portfolio diversification?", "Reduce overall portfolio risk")
+    ]
+    
+    score = 0
+    for i, (question, answer) in enumerate(questions, 1):
+        click.echo(f"\nQ{i}: {question}")
+        user_answer = click.prompt("Your answer", type=str)
+        
+        if user_answer.lower() in answer.lower() or answer.lower() in user_answer.lower():
+            click.echo("✅ Correct!")
+            score += 1
+        else:
+            click.echo(f"❌ Incorrect. The answer was: {answer}")
+    
+    click.echo(f"\n🎉 Final Score: {score}/{len(questions)}")
+
+@education.command()
+def calculator():
+    """Open the financial calculator."""
+    click.echo("🧮 Opening financial calculator...")
+    click.echo("Visit the interactive website for the calculator tool.")
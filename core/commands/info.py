@@ -0,0 +1,51 @@
+"""System status and link commands."""
+
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+BASE_PATH = Path(__file__).resolve().parent.parent.parent
+
+
+@click.command()
+def status():
+    """Show system status."""
+    click.echo("🏥 BuyPolar Capital System Status")
+    click.echo("=" * 50)
+    
+    # Check if key directories exist
+    directories = [
+        "core",
+        "assets",
+        "dashboards",
+        "data",
+        "docs"
+    ]
+    
+    for directory in directories:
+        dir_path = BASE_PATH / directory
+        if dir_path.exists():
+            click.echo(f"✅ {directory}")
+        else:
+            click.echo(f"❌ {directory}")
+    
+    click.echo(f"\n📅 Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+@click.command()
+def website():
+    """Open the interactive website in browser."""
+    import webbrowser
+
+    website_url = "https://yourusername.github.io/buypolarcapital/"
+    click.echo(f"🌐 Opening interactive website: {website_url}")
+    webbrowser.open(website_url)
+
+@click.command()
+def github():
+    """Open GitHub repository in browser."""
+    import webbrowser
+
+    repo_url = "https://github.com/yourusername/buypolarcapital"
+    click.echo(f"🐙 Opening GitHub repository: {repo_url}")
+    webbrowser.open(repo_url)
@@ -0,0 +1,63 @@
+"""Trading strategy commands."""
+
+import click
+
+
+@click.group()
+def strategy():
+    """Trading strategy commands."""
+    pass
+
+@strategy.command(name="list")
+def list_strategies():
+    """List available trading strategies."""
+    from core.backtest.registry import STRATEGIES
+
+    strategies = {
+        "HFT": ["Market Making", "Statistical Arbitrage", "Momentum Trading"],
+        "Mean Reversion": ["Pairs Trading", "Bollinger Bands", "RSI Divergence"],
+        "Momentum": ["Trend Following", "Breakout Trading", "Moving Average Crossover"],
+        "Arbitrage": ["Statistical Arbitrage", "Pairs Trading", "Risk Arbitrage"],
+        "ML": ["Neural Networks", "Random Forest", "Reinforcement Learning"]
+    }
+    
+    click.echo("📈 Available Trading Strategies:")
+    click.echo("=" * 50)
+    
+    for category, strategy_list in strategies.items():
+        click.echo(f"\n{category}:")
+        for strategy in strategy_list:
+            click.echo(f"  • {strategy}")
+
+    click.echo("\nBacktestable (buypolar strategy backtest NAME):")
+    for name, (_, description) in STRATEGIES.items():
+        click.echo(f"  • {name:<22} {description}")
+
+@strategy.command()
+@click.argument('strategy_name')
+@click.option('--tickers', '-t', multiple=True, help='Ticker universe (repeat or comma-separate); defaults to the strategy\'s own')
+@click.option('--start', default='2023-01-01', help='First date of the backtest')
+@click.option('--end', default=None, help='End date (exclusive), defaults to today')
+@click.option('--param', '-p', multiple=True, help='Parameter sweep, e.g. -p window=10,20,60')
+@click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: one per run, up to CPU count)')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default=None, help='Parquet file for the metrics')
+@click.option('--mode', type=click.Choice(['event', 'vectorized']), default='event', help='Event-driven (exact constraints) or vectorized (fast sweeps)')
+def backtest(strategy_name, tickers, start, end, param, workers, output, mode):
+    """Run backtest for a trading strategy."""
+    from core.backtest.registry import STRATEGIES
+
+    if strategy_name not in STRATEGIES:
+        click.echo(f"❌ Unknown strategy: {strategy_name}")
+        click.echo(f"Available: {', '.join(sorted(STRATEGIES))}")
+        return
+
+    from core.backtest.runner import parameter_grid, run
+
+    universe = [t.strip() for item in tickers for t in item.split(',') if t.strip()]
+    click.echo(f"📊 Running backtest for strategy: {strategy_name}")
+    try:
+        metrics = run(strategy_name, universe or None, start, end, parameter_grid(param), workers, output, mode=mode)
+    except Exception as e:
+        click.echo(f"❌ Backtest failed: {e}")
+        return
+    click.echo(metrics.to_string(index=False))
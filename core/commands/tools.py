@@ -0,0 +1,43 @@
+"""Utility tools."""
+
+import sys
+
+import click
+
+
+@click.group()
+def tools():
+    """Utility tools."""
+    pass
+
+@tools.command()
+def format():
+    """Format code using style guidelines."""
+    import subprocess
+
+    try:
+        click.echo("🎨 Formatting code...")
+        
+        # Format Python code
+        subprocess.run([sys.executable, "-m", "black", "core", "assets"])
+        subprocess.run([sys.executable, "-m", "isort", "core", "assets"])
+        
+        click.echo("✅ Code formatting completed!")
+        
+    except Exception as e:
+        click.echo(f"❌ Error formatting code: {e}")
+
+@tools.command()
+def test():
+    """Run the test suite."""
+    import subprocess
+
+    try:
+        click.echo("🧪 Running test suite...")
+        
+        subprocess.run([sys.executable, "-m", "pytest", "tests/", "-v"])
+        
+        click.echo("✅ Tests completed!")
+        
+    except Exception as e:
+        click.echo(f"❌ Error running tests: {e}")
@@ -0,0 +1,265 @@
+"""
+Multi-resolution OHLCV bar builder for tick data.
+
+build_bars() makes one pass over sorted tick arrays for the finest requested
+resolution and derives every coarser one from the bars below it, producing
+open/high/low/close/volume/vwap/count for e.g. 100ms, 1s, 5s, 1min and 5min
+at once. StreamingBarBuilder applies the same kernel to appended chunks of
+ticks, and BarCache stores the results as Arrow files next to the tick store
+partitions so report scripts read pre-aggregated bars instead of resampling
+raw ticks. Bars of legacy capped parquet downloads are cached the same way,
+beside the parquet file.
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from .tick_store import NS_PER_DAY, STORE_ROOT, TickStore, _read_ipc
+
+DEFAULT_RESOLUTIONS = ("100ms", "1s", "5s", "1min", "5min")
+
+BAR_FIELDS = ["ts", "open", "high", "low", "close", "volume", "notional", "count"]
+
+BAR_SCHEMA = pa.schema([
+    ("ts", pa.int64()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.float64()),
+    ("notional", pa.float64()),
+    ("count", pa.int64()),
+])
+
+_UNIT_NS = {"ms": 1_000_000, "s": 1_000_000_000, "min": 60_000_000_000, "m": 60_000_000_000,
+            "h": 3_600_000_000_000}
+
+
+def resolution_ns(resolution):
+    """Parse '100ms', '0.01s', '5s', '1min', '5m', '1h' into nanoseconds"""
+    if isinstance(resolution, (int, np.integer)):
+        return int(resolution)
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*(ms|s|min|m|h)\s*", str(resolution))
+    if not match:
+        raise ValueError(f"Unsupported bar resolution: {resolution!r}")
+    step = round(float(match.group(1)) * _UNIT_NS[match.group(2)])
+    if step <= 0:
+        raise ValueError(f"Bar resolution must be positive: {resolution!r}")
+    return step
+
+
+def _aggregate(bucket, open_, high, low, close, volume, notional, count):
+    """Reduce consecutive runs of equal `bucket` values into one bar each"""
+    if len(bucket) == 0:
+        return {name: np.empty(0, dtype=np.int64 if name in ("ts", "count") else np.float64)
+                for name in BAR_FIELDS}
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends = np.concatenate((starts[1:], [len(bucket)]))
+    return {
+        "ts": bucket[starts],
+        "open": open_[starts],
+        "high": np.maximum.reduceat(high, starts),
+        "low": np.minimum.reduceat(low, starts),
+        "close": close[ends - 1],
+        "volume": np.add.reduceat(volume, starts),
+        "notional": np.add.reduceat(notional, starts),
+        "count": np.add.reduceat(count, starts),
+    }
+
+
+def bars_from_ticks(ts, price, qty, step_ns):
+    """Bars at a single resolution straight from sorted tick arrays"""
+    ts = np.asarray(ts, dtype=np.int64)
+    price = np.asarray(price, dtype=np.float64)
+    qty = np.asarray(qty, dtype=np.float64)
+    bucket = ts - ts % step_ns
+    return _aggregate(bucket, price, price, price, price, qty, price * qty,
+                      np.ones(len(ts), dtype=np.int64))
+
+
+def bars_from_bars(bars, step_ns):
+    """Roll finer bars up into a coarser resolution that is a multiple of theirs"""
+    bucket = bars["ts"] - bars["ts"] % step_ns
+    return _aggregate(bucket, bars["open"], bars["high"], bars["low"], bars["close"],
+                      bars["volume"], bars["notional"], bars["count"])
+
+
+def build_bars(ts, price, qty, resolutions=DEFAULT_RESOLUTIONS):
+    """Build bars for every resolution from one pass over the ticks.
+
+    Ticks must be sorted by `ts` (int64 ns). Returns {resolution: bars},
+    where bars is a dict of arrays keyed by BAR_FIELDS. Use vwap() for the
+    volume-weighted price.
+    """
+    steps = sorted((resolution_ns(r), r) for r in resolutions)
+    out = {}
+    finer = None
+    for step, resolution in steps:
+        if finer is not None and step % finer[0] == 0:
+            out[resolution] = bars_from_bars(finer[1], step)
+        else:
+            out[resolution] = bars_from_ticks(ts, price, qty, step)
+        finer = (step, out[resolution])
+    return out
+
+
+def vwap(bars):
+    """Volume-weighted average price per bar (NaN for zero-volume bars)"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(bars["volume"] > 0, bars["notional"] / bars["volume"], np.nan)
+
+
+def bars_frame(bars):
+    """DataFrame with a UTC DatetimeIndex named T and OHLCV + vwap + count columns"""
+    import pandas as pd
+
+    index = pd.to_datetime(bars["ts"], unit="ns", utc=True)
+    frame = pd.DataFrame({name: bars[name] for name in BAR_FIELDS if name not in ("ts", "notional")},
+                         index=index)
+    frame["vwap"] = vwap(bars)
+    return frame.rename_axis("T")
+
+
+def _concat_bars(parts):
+    return {name: np.concatenate([p[name] for p in parts]) for name in BAR_FIELDS}
+
+
+class StreamingBarBuilder:
+    """Keep bars up to date as new ticks are appended.
+
+    update() takes the next chunk of (sorted) ticks and returns the bars
+    that were completed by it for each resolution. The still-open bar of
+    every resolution is carried over and merged with the next chunk.
+    """
+
+    def __init__(self, resolutions=DEFAULT_RESOLUTIONS):
+        self.resolutions = list(resolutions)
+        self.steps = {r: resolution_ns(r) for r in self.resolutions}
+        self.partial = {r: None for r in self.resolutions}
+        self.completed = {r: [] for r in self.resolutions}
+
+    def update(self, ts, price, qty):
+        new_bars = build_bars(ts, price, qty, self.resolutions)
+        closed = {}
+        for resolution, bars in new_bars.items():
+            if len(bars["ts"]) == 0:
+                closed[resolution] = bars
+                continue
+            partial = self.partial[resolution]
+            if partial is not None:
+                step = self.steps[resolution]
+                bars = bars_from_bars(_concat_bars([partial, bars]), step)
+
+            # Everything but the last bar is final; the last may still grow
+            done = {name: values[:-1] for name, values in bars.items()}
+            self.partial[resolution] = {name: values[-1:] for name, values in bars.items()}
+            self.completed[resolution].append(done)
+            closed[resolution] = done
+        return closed
+
+    def bars(self, resolution, include_partial=True):
+        """All bars seen so far at `resolution`"""
+        parts = list(self.completed[resolution])
+        if include_partial and self.partial[resolution] is not None:
+            parts.append(self.partial[resolution])
+        if not parts:
+            return bars_from_ticks(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), self.steps[resolution])
+        return _concat_bars(parts)
+
+
+def _bars_filename(resolution):
+    return f"bars_{str(resolution).replace('.', 'p')}.arrow"
+
+
+def _write_bars(path, bars):
+    table = pa.Table.from_arrays([pa.array(bars[name], type=BAR_SCHEMA.field(name).type) for name in BAR_FIELDS],
+                                 schema=BAR_SCHEMA)
+    tmp_path = path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, BAR_SCHEMA) as writer:
+            writer.write_table(table)
+    tmp_path.replace(path)
+
+
+class BarCache:
+    """Pre-aggregated bars stored beside each tick store day partition.
+
+    Cached files are bars_<resolution>.arrow in the partition directory and
+    are rebuilt whenever any tick file of that day is newer than them.
+    """
+
+    def __init__(self, store, resolutions=DEFAULT_RESOLUTIONS):
+        self.store = store if isinstance(store, TickStore) else TickStore(store)
+        self.resolutions = tuple(resolutions)
+
+    def path(self, symbol, date, resolution):
+        return self.store.partition_dir(symbol, date) / _bars_filename(resolution)
+
+    def _is_fresh(self, symbol, date, resolution):
+        cached = self.path(symbol, date, resolution)
+        if not cached.exists():
+            return False
+        tick_files = self.store._files(symbol, date)
+        return all(f.stat().st_mtime <= cached.stat().st_mtime for f in tick_files)
+
+    def build(self, symbol, date, resolutions=None):
+        """(Re)build and cache every resolution for one day from its ticks"""
+        resolutions = tuple(resolutions or self.resolutions)
+        start = np.datetime64(date, "D").astype("datetime64[ns]").astype(np.int64)
+        ticks = self.store.read(symbol, start, start + NS_PER_DAY, columns=["ts", "price", "qty"])
+        all_bars = build_bars(ticks["ts"], ticks["price"], ticks["qty"], resolutions)
+        for resolution, bars in all_bars.items():
+            _write_bars(self.path(symbol, date, resolution), bars)
+        return all_bars
+
+    def get(self, symbol, date, resolution):
+        """Bars for one day, building the cache on first use or when stale"""
+        if resolution not in self.resolutions:
+            self.resolutions = self.resolutions + (resolution,)
+        if not self._is_fresh(symbol, date, resolution):
+            return self.build(symbol, date, self.resolutions)[resolution]
+        return _read_ipc(self.path(symbol, date, resolution), BAR_FIELDS)
+
+    def get_frame(self, symbol, date, resolution):
+        return bars_frame(self.get(symbol, date, resolution))
+
+
+def _legacy_bars_path(parquet_file, resolution):
+    source = Path(parquet_file)
+    return source.with_name(f"{source.stem}.{_bars_filename(resolution)}")
+
+
+def load_bars(symbol, date, resolution, store_root=STORE_ROOT, parquet_file=None):
+    """Bars as a DataFrame, from the bar cache or (fallback) a legacy tick parquet file.
+
+    Bars built from a legacy file are cached beside it for every default
+    resolution and reused until the parquet file changes.
+    """
+    store = TickStore(store_root)
+    if date in store.dates(symbol):
+        return BarCache(store).get_frame(symbol, date, resolution)
+
+    if parquet_file is None or not Path(parquet_file).exists():
+        raise FileNotFoundError(f"No ticks for {symbol} {date} in {store_root} or {parquet_file}")
+
+    cached = _legacy_bars_path(parquet_file, resolution)
+    if cached.exists() and cached.stat().st_mtime >= Path(parquet_file).stat().st_mtime:
+        return bars_frame(_read_ipc(cached, BAR_FIELDS))
+
+    import pandas as pd
+    from .tick_store import normalize_agg_trades
+
+    ticks = normalize_agg_trades(pd.read_parquet(parquet_file))
+    order = np.argsort(ticks["ts"], kind="stable")
+    resolutions = tuple(dict.fromkeys(DEFAULT_RESOLUTIONS + (resolution,)))
+    all_bars = build_bars(ticks["ts"][order], ticks["price"][order], ticks["qty"][order], resolutions)
+    for name, bars in all_bars.items():
+        try:
+            _write_bars(_legacy_bars_path(parquet_file, name), bars)
+        except OSError as e:
+            print(f"⚠️ Could not cache {name} bars for {parquet_file}: {e}")
+            break
+    return bars_frame(all_bars[resolution])
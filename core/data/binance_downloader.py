@@ -0,0 +1,309 @@
+"""
+Resumable, rate-limit-aware async downloader for Binance aggTrades.
+
+Each UTC day is split into time shards (Binance only accepts startTime/
+endTime windows under one hour) that are fetched concurrently over one
+pooled aiohttp session. Requests draw from a weight-based token bucket that
+is re-synced from the X-MBX-USED-WEIGHT-1M header, every page is spilled to
+the TickStore as soon as it arrives, and per-shard progress is checkpointed
+so an interrupted day resumes from the last stored trade id.
+
+Usage:
+    python -m core.data.binance_downloader BTCUSDT ETHUSDT --date 2024-03-01
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .tick_store import STORE_ROOT, TickStore
+
+BASE_URL = "https://api.binance.com"
+AGG_TRADES_PATH = "/api/v3/aggTrades"
+
+# Binance spot: 6000 request weight per rolling minute per IP
+WEIGHT_LIMIT_PER_MINUTE = 6000
+AGG_TRADES_WEIGHT = 2
+PAGE_LIMIT = 1000
+MS_PER_DAY = 86_400_000
+
+
+class BinanceRateLimitError(Exception):
+    """Raised when the API keeps rejecting requests after all retries"""
+
+
+class BinanceUnavailableError(Exception):
+    """Raised when requests keep failing with 5xx or connection errors after all retries"""
+
+
+def _network_errors():
+    """Exceptions retried as transient connection failures (aiohttp's only when installed)"""
+    errors = (asyncio.TimeoutError, OSError)
+    try:
+        import aiohttp
+    except ImportError:
+        return errors
+    return errors + (aiohttp.ClientError,)
+
+
+class TokenBucket:
+    """Async token bucket where tokens are Binance request weight"""
+
+    def __init__(self, capacity=WEIGHT_LIMIT_PER_MINUTE, period=60.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight=1):
+        """Wait until `weight` tokens are available and take them"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+    def sync_used_weight(self, used):
+        """Align the bucket with the server-reported weight used this minute"""
+        self._refill()
+        self.tokens = min(self.tokens, max(0.0, self.capacity - used))
+
+    def pause(self, seconds):
+        """Drain the bucket so no request is sent for roughly `seconds`"""
+        self._refill()
+        self.tokens = -seconds * self.rate
+
+
+class Checkpoint:
+    """Per (symbol, date) JSON file recording shard progress"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.state = {"shards": {}, "complete": False}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    @property
+    def complete(self):
+        return self.state.get("complete", False)
+
+    def shard(self, index):
+        return self.state["shards"].setdefault(str(index), {"last_id": None, "done": False})
+
+    def update(self, index, last_id=None, done=None):
+        shard = self.shard(index)
+        if last_id is not None:
+            shard["last_id"] = last_id
+        if done is not None:
+            shard["done"] = done
+        self.save()
+
+    def mark_complete(self):
+        self.state["complete"] = True
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+def day_bounds_ms(date):
+    """UTC [start, end) of `date` (YYYY-MM-DD) in epoch milliseconds"""
+    start = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    start_ms = int(start.timestamp() * 1000)
+    return start_ms, start_ms + MS_PER_DAY
+
+
+def time_shards(start_ms, end_ms, n_shards):
+    """Split [start_ms, end_ms) into `n_shards` contiguous windows"""
+    step = -(-(end_ms - start_ms) // n_shards)
+    return [(lo, min(lo + step, end_ms)) for lo in range(start_ms, end_ms, step)]
+
+
+class AsyncTradeDownloader:
+    """Download full aggTrade tapes into a TickStore.
+
+    `base_url` and `session` can be overridden so tests can point the
+    downloader at a local fake server.
+    """
+
+    def __init__(self, store, base_url=BASE_URL, session=None, max_concurrency=8,
+                 shards_per_day=24, weight_limit=WEIGHT_LIMIT_PER_MINUTE,
+                 request_weight=AGG_TRADES_WEIGHT, max_retries=5, checkpoint_dir=None):
+        self.store = store if isinstance(store, TickStore) else TickStore(store)
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.shards_per_day = max(shards_per_day, 24)
+        self.request_weight = request_weight
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(weight_limit)
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else self.store.root / "_checkpoints"
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+        self._network_errors = _network_errors()
+
+    async def __aenter__(self):
+        if self._session is None:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def checkpoint_path(self, symbol, date):
+        return self.checkpoint_dir / f"{symbol.upper()}_{date}.json"
+
+    async def _get_json(self, params):
+        """GET one aggTrades page, retrying rate limits, 5xx and connection errors.
+
+        Backoff sleeps happen after the connection slot is released, so one
+        failing request does not hold a slot other shards could use.
+        """
+        url = f"{self.base_url}{AGG_TRADES_PATH}"
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire(self.request_weight)
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url, params=params) as response:
+                        used = response.headers.get("X-MBX-USED-WEIGHT-1M")
+                        if used is not None:
+                            self.bucket.sync_used_weight(int(used))
+                        if response.status == 200:
+                            return await response.json()
+                        status, retry_after = response.status, response.headers.get("Retry-After")
+                        body = await response.text()
+            except self._network_errors as e:
+                last_error = e
+                print(f"⚠ Request failed ({type(e).__name__}: {e}), retrying")
+                await asyncio.sleep(min(2 ** attempt, 30))
+                continue
+
+            if status in (418, 429):
+                last_error = None
+                retry_after = float(retry_after or 2 ** attempt)
+                print(f"⚠ Rate limited ({status}), backing off {retry_after:.0f}s")
+                self.bucket.pause(retry_after)
+                continue
+            if status >= 500:
+                last_error = RuntimeError(f"Binance error {status}: {body}")
+                await asyncio.sleep(min(2 ** attempt, 30))
+                continue
+            raise RuntimeError(f"Binance error {status}: {body}")
+
+        if last_error is not None:
+            raise BinanceUnavailableError(f"Giving up after {self.max_retries} retries: {params}") from last_error
+        raise BinanceRateLimitError(f"Giving up after {self.max_retries} retries: {params}")
+
+    async def _fetch_shard(self, symbol, index, shard_start, shard_end, checkpoint):
+        """Page one time shard into the store, checkpointing after every page"""
+        state = checkpoint.shard(index)
+        if state["done"]:
+            return 0
+
+        written = 0
+        last_id = state["last_id"]
+        while True:
+            params = {"symbol": symbol.upper(), "limit": PAGE_LIMIT}
+            if last_id is None:
+                params["startTime"] = shard_start
+                params["endTime"] = shard_end - 1
+            else:
+                params["fromId"] = last_id + 1
+
+            page = await self._get_json(params)
+            in_shard = [t for t in page if t["T"] < shard_end]
+            if in_shard:
+                written += self.store.append(symbol, in_shard)
+                last_id = in_shard[-1]["a"]
+
+            # A short page means the window (or the live tape) is exhausted;
+            # a trade past shard_end means the next shard takes over
+            done = not page or len(in_shard) < len(page) or len(page) < PAGE_LIMIT
+            checkpoint.update(index, last_id=last_id, done=done)
+            if done:
+                return written
+
+    async def download_day(self, symbol, date):
+        """Fetch every aggTrade of `symbol` on `date` (UTC); resumes from checkpoint"""
+        checkpoint = Checkpoint(self.checkpoint_path(symbol, date))
+        if checkpoint.complete:
+            print(f"⏩ {symbol} {date} already complete")
+            return 0
+
+        start_ms, end_ms = day_bounds_ms(date)
+        shards = time_shards(start_ms, end_ms, self.shards_per_day)
+        print(f"📦 {symbol} {date}: {len(shards)} shards")
+
+        counts = await asyncio.gather(*(
+            self._fetch_shard(symbol, i, lo, hi, checkpoint) for i, (lo, hi) in enumerate(shards)
+        ))
+        total = sum(counts)
+
+        self.store.compact(symbol, date)
+        checkpoint.mark_complete()
+        print(f"✅ {symbol} {date}: {total} new trades")
+        return total
+
+    async def download(self, symbols, dates):
+        """Download every (symbol, date) combination concurrently"""
+        results = await asyncio.gather(*(
+            self.download_day(symbol, date) for symbol in symbols for date in dates
+        ), return_exceptions=True)
+        for (symbol, date), result in zip(((s, d) for s in symbols for d in dates), results):
+            if isinstance(result, Exception):
+                print(f"❌ Failed to download {symbol} {date}: {result}")
+        return results
+
+
+async def download_trades(symbols, dates, store_root=STORE_ROOT, **kwargs):
+    async with AsyncTradeDownloader(store_root, **kwargs) as downloader:
+        return await downloader.download(symbols, dates)
+
+
+def date_range(start, end=None):
+    """Inclusive list of YYYY-MM-DD strings between start and end"""
+    first = datetime.strptime(start, "%Y-%m-%d")
+    last = datetime.strptime(end, "%Y-%m-%d") if end else first
+    return [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((last - first).days + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download Binance aggTrades into the tick store")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--date", required=True, help="First UTC date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Last UTC date, inclusive")
+    parser.add_argument("--store", default=STORE_ROOT)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(download_trades(args.symbols, date_range(args.date, args.end_date),
+                                store_root=args.store, max_concurrency=args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Trading-calendar service with cached session tables.
+
+Session open/close times are precomputed once per exchange as sorted int64
+UTC-nanosecond arrays and cached on disk, so filtering timestamps to
+regular hours is a searchsorted instead of repeated between_time calls, and
+DST shifts and holidays come for free.
+
+pandas_market_calendars supplies holidays and early closes when installed;
+otherwise sessions fall back to weekdays at the exchange's local hours
+(still DST-correct, but without holidays).
+
+Usage:
+    from core.data.calendars import session_mask, minute_grid, sessions
+    mask = session_mask("NYSE", df.index)
+    grid = minute_grid("XETR", "2025-01-01", "2025-02-01")
+"""
+
+from datetime import date as _date
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "calendars"
+
+DEFAULT_START = "2000-01-01"
+DEFAULT_END = "2030-12-31"
+
+NS_PER_MINUTE = 60_000_000_000
+
+# Regular hours used when pandas_market_calendars is unavailable: (tz, open, close)
+EXCHANGE_HOURS = {
+    "NYSE": ("America/New_York", "09:30", "16:00"),
+    "XETR": ("Europe/Berlin", "09:00", "17:30"),
+    "LSE": ("Europe/London", "08:00", "16:30"),
+    "SIX": ("Europe/Zurich", "09:00", "17:30"),
+    "OSE": ("Europe/Oslo", "09:00", "16:20"),
+    "XSTO": ("Europe/Stockholm", "09:00", "17:30"),
+    "XCSE": ("Europe/Copenhagen", "09:00", "17:00"),
+    "XAMS": ("Europe/Amsterdam", "09:00", "17:30"),
+    "XMAD": ("Europe/Madrid", "09:00", "17:30"),
+    "XLIS": ("Europe/Lisbon", "08:00", "16:30"),
+    "HKEX": ("Asia/Hong_Kong", "09:30", "16:00"),
+    "JPX": ("Asia/Tokyo", "09:00", "15:00"),
+    "ASX": ("Australia/Sydney", "10:00", "16:00"),
+}
+
+ALIASES = {
+    "XNYS": "NYSE", "NASDAQ": "NYSE", "US": "NYSE",
+    "XETRA": "XETR", "FWB": "XETR",
+    "XLON": "LSE", "LONDON": "LSE",
+    "XSWX": "SIX", "SWX": "SIX",
+    "XOSL": "OSE", "OSLO": "OSE",
+}
+
+# Yahoo ticker suffix -> exchange
+SUFFIX_EXCHANGE = {
+    "": "NYSE", "OL": "OSE", "DE": "XETR", "F": "XETR", "L": "LSE", "SW": "SIX",
+    "ST": "XSTO", "CO": "XCSE", "AS": "XAMS", "MC": "XMAD", "LS": "XLIS",
+    "HK": "HKEX", "T": "JPX", "AX": "ASX",
+}
+
+
+def canonical_exchange(exchange):
+    name = str(exchange).upper()
+    return ALIASES.get(name, name)
+
+
+def exchange_for_ticker(ticker):
+    """Exchange code for a Yahoo-style ticker (e.g. 'EQNR.OL' -> 'OSE')"""
+    suffix = ticker.rsplit(".", 1)[1].upper() if "." in ticker else ""
+    return SUFFIX_EXCHANGE.get(suffix, "NYSE")
+
+
+def _to_ns(values):
+    """Timestamps (scalar or array-like, naive treated as UTC) to int64 ns"""
+    if isinstance(values, (int, np.integer)):
+        return np.int64(values)
+    if np.isscalar(values) or isinstance(values, (str, pd.Timestamp, _date)):
+        ts = pd.Timestamp(values)
+        ts = ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+        return np.int64(ts.value)
+    if isinstance(values, np.ndarray) and values.dtype == np.int64:
+        return values
+    index = pd.DatetimeIndex(values)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return index.as_unit("ns").asi8
+
+
+def _sessions_from_mcal(exchange, start, end):
+    import pandas_market_calendars as mcal
+
+    schedule = mcal.get_calendar(exchange).schedule(start_date=start, end_date=end)
+    opens = pd.DatetimeIndex(schedule["market_open"]).tz_convert("UTC").as_unit("ns").asi8
+    closes = pd.DatetimeIndex(schedule["market_close"]).tz_convert("UTC").as_unit("ns").asi8
+    return opens, closes
+
+
+def _sessions_from_hours(exchange, start, end):
+    tz, open_, close = EXCHANGE_HOURS[exchange]
+    days = pd.bdate_range(start, end)
+    local_days = days.tz_localize(tz)
+    opens = (local_days + pd.Timedelta(f"{open_}:00")).tz_convert("UTC").as_unit("ns").asi8
+    closes = (local_days + pd.Timedelta(f"{close}:00")).tz_convert("UTC").as_unit("ns").asi8
+    return opens, closes
+
+
+class SessionTable:
+    """Sorted per-day session open/close times for one exchange (UTC ns).
+
+    Sessions are dated in the exchange's local time zone, so e.g. an ASX
+    session opening at 23:00 UTC belongs to the next calendar day.
+    """
+
+    def __init__(self, exchange, opens, closes):
+        self.exchange = exchange
+        self.tz = EXCHANGE_HOURS[exchange][0] if exchange in EXCHANGE_HOURS else "UTC"
+        self.opens = np.asarray(opens, dtype=np.int64)
+        self.closes = np.asarray(closes, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.opens)
+
+    def _locate(self, ts_ns):
+        """Index of the latest session opening at or before each timestamp"""
+        return np.searchsorted(self.opens, ts_ns, side="right") - 1
+
+    def mask(self, ts):
+        """True where `ts` falls inside a session [open, close)"""
+        ts_ns = _to_ns(ts)
+        idx = self._locate(ts_ns)
+        valid = idx >= 0
+        inside = np.zeros(np.shape(ts_ns), dtype=bool)
+        inside[valid] = np.asarray(ts_ns)[valid] < self.closes[idx[valid]]
+        return inside
+
+    def _range(self, start, end):
+        lo = 0 if start is None else np.searchsorted(self.closes, _to_ns(start), side="right")
+        hi = len(self.opens) if end is None else np.searchsorted(self.opens, _to_ns(end), side="left")
+        return lo, hi
+
+    def valid_days(self, start=None, end=None):
+        """Local session dates (as UTC midnight Timestamps) of the sessions overlapping [start, end)"""
+        lo, hi = self._range(start, end)
+        local = pd.to_datetime(self.opens[lo:hi], unit="ns", utc=True).tz_convert(self.tz)
+        return local.tz_localize(None).normalize().tz_localize("UTC")
+
+    def session(self, day):
+        """(open, close) UTC Timestamps of the session opening on local date `day`, or None"""
+        day = pd.Timestamp(pd.Timestamp(day).date())
+        day_start = _to_ns(day.tz_localize(self.tz))
+        day_end = _to_ns((day + pd.Timedelta(days=1)).tz_localize(self.tz))
+        idx = np.searchsorted(self.opens, day_start, side="left")
+        if idx >= len(self.opens) or self.opens[idx] >= day_end:
+            return None
+        return (pd.Timestamp(self.opens[idx], unit="ns", tz="UTC"),
+                pd.Timestamp(self.closes[idx], unit="ns", tz="UTC"))
+
+    def is_trading_day(self, day):
+        return self.session(day) is not None
+
+    def last_session(self, before=None):
+        """(open, close) of the most recent session opening at or before `before` (default: now)"""
+        ts_ns = _to_ns(pd.Timestamp.now(tz="UTC") if before is None else before)
+        idx = self._locate(ts_ns)
+        if idx < 0:
+            return None
+        return (pd.Timestamp(self.opens[idx], unit="ns", tz="UTC"),
+                pd.Timestamp(self.closes[idx], unit="ns", tz="UTC"))
+
+    def minute_grid(self, start=None, end=None, step_ns=NS_PER_MINUTE):
+        """int64 UTC ns timestamps of every `step_ns` bar start inside sessions in [start, end)"""
+        lo, hi = self._range(start, end)
+        opens, closes = self.opens[lo:hi], self.closes[lo:hi]
+        counts = np.maximum((closes - opens) // step_ns, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        session_starts = np.repeat(opens, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        grid = session_starts + offsets * step_ns
+        if start is not None:
+            grid = grid[grid >= _to_ns(start)]
+        if end is not None:
+            grid = grid[grid < _to_ns(end)]
+        return grid
+
+
+def _cache_path(exchange, source, start, end):
+    return CACHE_DIR / f"{exchange}_{source}_{start}_{end}.npz"
+
+
+def _load_cached(exchange, source, start, end):
+    path = _cache_path(exchange, source, start, end)
+    if not path.exists():
+        return None
+    cached = np.load(path)
+    return SessionTable(exchange, cached["opens"], cached["closes"])
+
+
+def _save_cached(exchange, source, start, end, opens, closes):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.savez(_cache_path(exchange, source, start, end), opens=opens, closes=closes)
+    except OSError as e:
+        print(f"⚠️ Could not cache {exchange} sessions: {e}")
+
+
+@lru_cache(maxsize=None)
+def sessions(exchange, start=DEFAULT_START, end=DEFAULT_END):
+    """Session table for `exchange`, loaded from (or written to) the on-disk cache.
+
+    Tables are cached per source, so a weekday-hours fallback built while
+    pandas_market_calendars was missing is not reused once it is installed.
+    """
+    exchange = canonical_exchange(exchange)
+    table = _load_cached(exchange, "mcal", start, end)
+    if table is not None:
+        return table
+
+    try:
+        opens, closes = _sessions_from_mcal(exchange, start, end)
+    except Exception:
+        if exchange not in EXCHANGE_HOURS:
+            raise ValueError(f"Unknown exchange: {exchange}")
+        table = _load_cached(exchange, "hours", start, end)
+        if table is not None:
+            return table
+        opens, closes = _sessions_from_hours(exchange, start, end)
+        _save_cached(exchange, "hours", start, end, opens, closes)
+        return SessionTable(exchange, opens, closes)
+
+    _save_cached(exchange, "mcal", start, end, opens, closes)
+    return SessionTable(exchange, opens, closes)
+
+
+def session_mask(exchange, ts):
+    """Vectorized in-session mask for timestamps (naive values are treated as UTC)"""
+    return sessions(exchange).mask(ts)
+
+
+def minute_grid(exchange, start, end, freq="1min"):
+    """DatetimeIndex (UTC) of in-session bar starts between start and end"""
+    step_ns = pd.Timedelta(freq).value
+    grid = sessions(exchange).minute_grid(start, end, step_ns)
+    return pd.to_datetime(grid, unit="ns", utc=True)
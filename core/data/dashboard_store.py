@@ -0,0 +1,166 @@
+"""
+Incremental bar store behind the Streamlit dashboard.
+
+Bars are kept per (interval, ticker) in data/cache/dashboard/{interval}/
+{ticker}.parquet together with their SMA/EMA columns. A refresh downloads
+only what is newer than the last stored bar (one batched yf.download for
+all requested tickers), re-fetching the last bar in case it was still
+forming. It then extends the indicators from the first changed row, so
+existing rows are never recomputed.
+
+The indicators match ta.trend.sma_indicator / ema_indicator (rolling mean
+with a full window; adjust=False EMA seeded at the first close, NaN until
+a full window).
+
+Usage:
+    from core.data.dashboard_store import DashboardStore
+    store = DashboardStore()
+    store.refresh(["AAPL", "MSFT"], "1m")
+    bars = store.view("AAPL", "1m", "1d")
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .minute_lake import BAR_COLUMNS, normalize_minute_frame
+
+STORE_ROOT = Path(__file__).resolve().parents[2] / "data" / "cache" / "dashboard"
+
+INDICATOR_WINDOW = 20
+INDICATOR_COLUMNS = ["sma_20", "ema_20"]
+
+# How far back the first download of a ticker goes (yfinance limits intraday history)
+INITIAL_LOOKBACK = {"1m": timedelta(days=7), "30m": timedelta(days=59), "1d": None, "1wk": None}
+INTERVAL_STEP = {"1m": timedelta(minutes=1), "30m": timedelta(minutes=30), "1d": timedelta(days=1),
+                 "1wk": timedelta(weeks=1)}
+PERIODS = {"1d": timedelta(days=1), "1wk": timedelta(days=7), "1mo": timedelta(days=31),
+           "1y": timedelta(days=366), "max": None}
+
+
+def extend_indicators(frame, start, window=INDICATOR_WINDOW):
+    """Fill sma/ema for rows >= `start` in place, reusing the stored values before it"""
+    close = frame["close"].to_numpy(dtype=np.float64)
+    n = len(close)
+    sma = frame["sma_20"].to_numpy(dtype=np.float64, copy=True) if "sma_20" in frame else np.full(n, np.nan)
+    ema = frame["ema_20"].to_numpy(dtype=np.float64, copy=True) if "ema_20" in frame else np.full(n, np.nan)
+    if start >= n:
+        return frame
+
+    # SMA: rolling sums over the window ending at each changed row
+    lo = max(0, start - window + 1)
+    csum = np.concatenate(([0.0], np.cumsum(close[lo:])))
+    ends = np.arange(start, n) - lo + 1
+    full = ends >= window
+    sma[start:] = np.nan
+    sma[start:][full] = (csum[ends[full]] - csum[ends[full] - window]) / window
+
+    # EMA: the recursion continues from the last stored value once the window is full
+    alpha = 2.0 / (window + 1)
+    if start >= window:
+        value, first = ema[start - 1], start
+    else:
+        value, first = close[0], 1
+        ema[0] = value
+    for i in range(first, n):
+        value = alpha * close[i] + (1 - alpha) * value
+        ema[i] = value
+    ema[:window - 1] = np.nan
+
+    frame["sma_20"] = sma
+    frame["ema_20"] = ema
+    return frame
+
+
+class DashboardStore:
+    """Parquet-backed bars + indicators per (interval, ticker), refreshed incrementally"""
+
+    def __init__(self, root=STORE_ROOT):
+        self.root = Path(root)
+
+    def path(self, ticker, interval):
+        return self.root / interval / f"{ticker.upper()}.parquet"
+
+    def read(self, ticker, interval):
+        path = self.path(ticker, interval)
+        if not path.exists():
+            return pd.DataFrame(columns=BAR_COLUMNS + INDICATOR_COLUMNS)
+        return pd.read_parquet(path)
+
+    def _write(self, ticker, interval, frame):
+        path = self.path(ticker, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _download(self, tickers, interval, start):
+        import yfinance as yf
+
+        kwargs = {"interval": interval, "auto_adjust": False, "progress": False, "group_by": "column"}
+        if start is None:
+            return yf.download(tickers, period="max", **kwargs)
+        # The range must stay within the interval's per-request limit (7 days for 1m)
+        end = datetime.now(timezone.utc)
+        lookback = INITIAL_LOOKBACK.get(interval)
+        if lookback is not None:
+            start = max(start, end - lookback)
+        return yf.download(tickers, start=start, end=end, **kwargs)
+
+    def _fetch_start(self, frame, interval, now):
+        """Download start for one ticker: from its last stored bar, or the initial lookback"""
+        lookback = INITIAL_LOOKBACK.get(interval)
+        earliest = now - lookback if lookback else None
+        if frame.empty:
+            return earliest
+        last = pd.Timestamp(int(frame["ts"].iloc[-1]), unit="ns", tz="UTC").to_pydatetime()
+        return last if earliest is None else max(last, earliest)
+
+    def refresh(self, tickers, interval):
+        """Append new bars for `tickers` with one batched download; returns {ticker: new bars}"""
+        tickers = [t.upper() for t in tickers]
+        now = datetime.now(timezone.utc)
+        stored = {t: self.read(t, interval) for t in tickers}
+        starts = [self._fetch_start(stored[t], interval, now) for t in tickers]
+        # One request for all tickers, from the earliest start any of them needs
+        start = None if any(s is None for s in starts) else min(starts)
+        if start is not None and now - start < INTERVAL_STEP.get(interval, timedelta(0)):
+            return {t: 0 for t in tickers}
+
+        download = self._download(tickers, interval, start)
+        added = {}
+        for ticker in tickers:
+            new = normalize_minute_frame(download, ticker)
+            existing = stored[ticker]
+            if new.empty:
+                added[ticker] = 0
+                continue
+            if existing.empty:
+                merged, first_changed = new, 0
+            else:
+                # Bars from the first downloaded timestamp onwards replace the stored ones (latest wins)
+                keep = existing[existing["ts"] < new["ts"].iloc[0]]
+                merged = pd.concat([keep, new], ignore_index=True)
+                first_changed = len(keep)
+            merged = merged.drop_duplicates("ts", keep="last").sort_values("ts", kind="stable")
+            merged = extend_indicators(merged.reset_index(drop=True), first_changed)
+            self._write(ticker, interval, merged)
+            added[ticker] = len(merged) - len(existing)
+        return added
+
+    def view(self, ticker, interval, period=None):
+        """Display frame for the last `period` of stored bars (Datetime in US/Eastern, title-case columns)"""
+        frame = self.read(ticker, interval)
+        if frame.empty:
+            return pd.DataFrame()
+        delta = PERIODS.get(period)
+        if delta is not None:
+            cutoff = int(frame["ts"].iloc[-1]) - int(delta.total_seconds() * 1e9)
+            frame = frame[frame["ts"] > cutoff]
+        out = frame.rename(columns={c: c.title() for c in BAR_COLUMNS if c != "ts"})
+        out = out.rename(columns={"sma_20": "SMA_20", "ema_20": "EMA_20"})
+        out.insert(0, "Datetime", pd.to_datetime(out.pop("ts"), unit="ns", utc=True).dt.tz_convert("US/Eastern"))
+        return out.reset_index(drop=True)
@@ -0,0 +1,169 @@
+"""
+Minute-bar Parquet lake.
+
+yfinance minute downloads only reach back 7 days, so each run is merged into
+a persistent lake instead of overwriting the previous file. Bars are stored
+with a flat, typed schema (UTC int64 ns timestamps, float64 prices, int64
+volume) in Hive-style partitions:
+
+    {root}/ticker={TICKER}/month=YYYY-MM/data.parquet
+
+New bars are de-duplicated against what is already stored (latest download
+wins), and the partition layout lets pyarrow.dataset prune by ticker and
+month before touching any file. Only committed data.parquet files are
+read, so a .tmp left by an interrupted write is never picked up.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+LAKE_ROOT = Path("data/lake/minute")
+
+BAR_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+SCHEMA = pa.schema([
+    ("ts", pa.int64()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.int64()),
+])
+
+PARTITION_FILE = "data.parquet"
+
+
+def normalize_minute_frame(df, ticker=None):
+    """Flatten a yfinance minute download into the lake schema.
+
+    Handles the (Price, Ticker) MultiIndex columns yf.download returns, a
+    'Ticker' index level, tz-naive or tz-aware indexes and upper/lowercase
+    column names. Returns a DataFrame with BAR_COLUMNS, sorted by ts.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame({name: pd.Series(dtype=SCHEMA.field(name).type.to_pandas_dtype())
+                             for name in BAR_COLUMNS})
+
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        if ticker is not None and ticker in df.columns.get_level_values(-1):
+            df = df.xs(ticker, axis=1, level=-1)
+        else:
+            df.columns = df.columns.get_level_values(0)
+    if "Ticker" in (df.index.names or []):
+        df = df.reset_index(level="Ticker", drop=True)
+
+    df.columns = [str(c).lower().replace(" ", "_") for c in df.columns]
+    if "close" not in df.columns and "adj_close" in df.columns:
+        df["close"] = df["adj_close"]
+
+    index = pd.DatetimeIndex(df.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+
+    out = pd.DataFrame({
+        "ts": index.as_unit("ns").asi8.astype(np.int64),
+        "open": df["open"].to_numpy(dtype=np.float64),
+        "high": df["high"].to_numpy(dtype=np.float64),
+        "low": df["low"].to_numpy(dtype=np.float64),
+        "close": df["close"].to_numpy(dtype=np.float64),
+        "volume": np.nan_to_num(df["volume"].to_numpy(dtype=np.float64)).astype(np.int64),
+    })
+    out = out.dropna(subset=["close"])
+    return out.sort_values("ts", kind="stable").reset_index(drop=True)
+
+
+def utc_ns(value):
+    """Timestamp-like (naive treated as UTC) to int64 ns since epoch"""
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+    return ts.value
+
+
+def month_key(ts_ns):
+    """YYYY-MM partition value for each UTC ns timestamp"""
+    return np.asarray(ts_ns, dtype="datetime64[ns]").astype("datetime64[M]").astype(str)
+
+
+class MinuteLake:
+    """Append-and-deduplicate store of 1-minute bars partitioned by ticker/month"""
+
+    def __init__(self, root=LAKE_ROOT):
+        self.root = Path(root)
+
+    def partition_path(self, ticker, month):
+        return self.root / f"ticker={ticker}" / f"month={month}" / PARTITION_FILE
+
+    def tickers(self):
+        if not self.root.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in self.root.iterdir() if p.name.startswith("ticker="))
+
+    def months(self, ticker):
+        ticker_dir = self.root / f"ticker={ticker}"
+        if not ticker_dir.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in ticker_dir.iterdir() if p.name.startswith("month="))
+
+    def append(self, ticker, df):
+        """Merge a download into the lake; returns the number of new bars stored"""
+        bars = normalize_minute_frame(df, ticker)
+        if bars.empty:
+            return 0
+
+        added = 0
+        months = month_key(bars["ts"].to_numpy())
+        for month in np.unique(months):
+            new = bars[months == month]
+            path = self.partition_path(ticker, month)
+            if path.exists():
+                existing = pq.read_table(path).to_pandas()
+                before = len(existing)
+                # Latest download wins for bars that were revised
+                merged = pd.concat([existing, new], ignore_index=True)
+                merged = merged.drop_duplicates("ts", keep="last")
+                added += len(merged) - before
+            else:
+                merged = new
+                added += len(new)
+
+            merged = merged.sort_values("ts", kind="stable")
+            self._write(path, merged)
+        return added
+
+    def _write(self, path, frame):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame[BAR_COLUMNS], schema=SCHEMA, preserve_index=False)
+        tmp_path = path.with_suffix(".tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+
+    def read(self, ticker, start=None, end=None, columns=None):
+        """DataFrame of one ticker's bars in [start, end), indexed by UTC timestamp"""
+        import pyarrow.dataset as ds
+
+        # Month pruning on the partition names; each month holds a single committed file
+        first = month_key(utc_ns(start)) if start is not None else None
+        last = month_key(utc_ns(end) - 1) if end is not None else None
+        files = [str(self.partition_path(ticker, month)) for month in self.months(ticker)
+                 if (first is None or month >= first) and (last is None or month <= last)]
+        files = [f for f in files if os.path.exists(f)]
+        if not files:
+            return pd.DataFrame(columns=[c for c in (columns or BAR_COLUMNS) if c != "ts"])
+
+        dataset = ds.dataset(files, format="parquet", schema=SCHEMA)
+        expr = None
+        if start is not None:
+            expr = ds.field("ts") >= utc_ns(start)
+        if end is not None:
+            end_expr = ds.field("ts") < utc_ns(end)
+            expr = end_expr if expr is None else expr & end_expr
+
+        wanted = ["ts"] + [c for c in (columns or BAR_COLUMNS) if c != "ts"]
+        frame = dataset.to_table(columns=wanted, filter=expr).to_pandas()
+        frame.index = pd.to_datetime(frame.pop("ts"), unit="ns", utc=True)
+        return frame.sort_index().rename_axis("ts")
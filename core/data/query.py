@@ -0,0 +1,138 @@
+"""
+Predicate-pushdown queries over the minute-bar lake and the exec dataset.
+
+Both datasets are opened with pyarrow.dataset, so ticker/month partition
+pruning, timestamp and column filters and column projection all happen in
+the file scan. Only committed Parquet files are listed, so a .tmp left by
+an interrupted write is never scanned. Callers only materialize the rows and columns they ask for,
+and scan_bars() streams record batches for datasets larger than RAM.
+
+Usage:
+    from core.data.query import bars, exec_samples
+    df = bars(["AAPL", "TSLA"], "2025-04-01", "2025-04-05", columns=["close", "volume"])
+    sim = exec_samples({"ticker": ["AAPL"], "duration": (30, 60)})
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .calendars import exchange_for_ticker, sessions
+from .minute_lake import LAKE_ROOT, PARTITION_FILE, SCHEMA as BAR_SCHEMA, utc_ns
+
+EXEC_PATH = Path("data/simulated/exec_dataset.parquet")
+
+PARTITION_SCHEMA = pa.schema([("ticker", pa.string()), ("month", pa.string())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+DATASET_SCHEMA = pa.unify_schemas([BAR_SCHEMA, PARTITION_SCHEMA])
+
+
+def bars_dataset(root=LAKE_ROOT):
+    """The minute lake as a pyarrow Dataset with ticker/month partition fields"""
+    root = Path(root)
+    files = sorted(str(p) for p in root.glob(f"ticker=*/month=*/{PARTITION_FILE}")) if root.exists() else []
+    return ds.dataset(files, schema=DATASET_SCHEMA, format="parquet", partitioning=PARTITIONING,
+                      partition_base_dir=str(root))
+
+
+def _month(value):
+    return pd.Timestamp(utc_ns(value), unit="ns", tz="UTC").strftime("%Y-%m")
+
+
+def bars_filter(tickers=None, start=None, end=None):
+    """Build the scan expression: partition pruning on ticker/month plus a ts range"""
+    expr = None
+
+    def _and(other):
+        return other if expr is None else expr & other
+
+    if tickers is not None:
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        expr = _and(ds.field("ticker").isin(tickers))
+    if start is not None:
+        expr = _and((ds.field("month") >= _month(start)) & (ds.field("ts") >= utc_ns(start)))
+    if end is not None:
+        expr = _and((ds.field("month") <= _month(end)) & (ds.field("ts") < utc_ns(end)))
+    return expr
+
+
+def _projection(columns):
+    columns = [c for c in (columns or BAR_SCHEMA.names) if c not in ("ts", "ticker")]
+    return ["ticker", "ts"] + columns
+
+
+def scan_bars(tickers=None, start=None, end=None, columns=None, root=LAKE_ROOT, batch_size=1 << 17):
+    """Yield pyarrow RecordBatches of matching bars without materializing the result"""
+    scanner = bars_dataset(root).scanner(columns=_projection(columns),
+                                         filter=bars_filter(tickers, start, end),
+                                         batch_size=batch_size)
+    yield from scanner.to_batches()
+
+
+def regular_session_mask(frame):
+    """Boolean mask of rows inside each ticker's exchange session (holiday/DST aware)"""
+    mask = np.zeros(len(frame), dtype=bool)
+    ts_ns = pd.DatetimeIndex(frame["ts"]).as_unit("ns").asi8
+    tickers = frame["ticker"].to_numpy()
+    for ticker in pd.unique(tickers):
+        rows = tickers == ticker
+        mask[rows] = sessions(exchange_for_ticker(ticker)).mask(ts_ns[rows])
+    return mask
+
+
+def bars(tickers=None, start=None, end=None, columns=None, session="regular", root=LAKE_ROOT):
+    """Minute bars for `tickers` in [start, end) as a long DataFrame.
+
+    Only the requested columns (plus ticker and ts) are read, and only from
+    partitions that can contain matching rows. `session="regular"` keeps
+    bars inside each exchange's regular hours; pass None for all bars.
+    """
+    table = bars_dataset(root).to_table(columns=_projection(columns),
+                                        filter=bars_filter(tickers, start, end))
+    frame = table.to_pandas()
+    frame["ts"] = pd.to_datetime(frame["ts"], unit="ns", utc=True)
+    if session == "regular" and not frame.empty:
+        frame = frame[regular_session_mask(frame)]
+    elif session not in (None, "all", "regular"):
+        raise ValueError(f"Unknown session: {session!r}")
+    return frame.sort_values(["ticker", "ts"], kind="stable").set_index("ts")
+
+
+def _filter_expression(filters):
+    """{column: value | [values] | (lo, hi)} -> pyarrow expression (AND of all)"""
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    expr = None
+    for column, value in filters.items():
+        field = ds.field(column)
+        if isinstance(value, tuple) and len(value) == 2:
+            lo, hi = value
+            clause = None
+            if lo is not None:
+                clause = field >= lo
+            if hi is not None:
+                clause = field <= hi if clause is None else clause & (field <= hi)
+        elif isinstance(value, (list, set, frozenset)):
+            clause = field.isin(list(value))
+        else:
+            clause = field == value
+        if clause is not None:
+            expr = clause if expr is None else expr & clause
+    return expr
+
+
+def exec_samples(filters=None, columns=None, path=EXEC_PATH):
+    """Rows of the simulated execution dataset matching `filters`.
+
+    `filters` maps columns to a scalar (equality), a list (membership) or a
+    (lo, hi) tuple (inclusive range, None for open ends); a pyarrow
+    expression is also accepted. Filters and projection run in the scan.
+    """
+    path = Path(path)
+    # A directory dataset is read from its .parquet files only
+    source = sorted(str(p) for p in path.rglob("*.parquet")) if path.is_dir() else str(path)
+    dataset = ds.dataset(source, format="parquet")
+    return dataset.to_table(columns=columns, filter=_filter_expression(filters)).to_pandas()
@@ -0,0 +1,274 @@
+"""
+Columnar tick store for Binance aggTrades.
+
+Trades are normalized once into typed columns and written as uncompressed
+Arrow IPC files partitioned by symbol and UTC date:
+
+    {root}/{SYMBOL}/date=YYYY-MM-DD/part-<first agg id>.arrow   (appended pages)
+    {root}/{SYMBOL}/date=YYYY-MM-DD/data.arrow                  (after compact())
+
+Readers memory-map the files and get NumPy views straight onto the mapped
+buffers, so loading a compacted full-day tape costs little more than the
+page faults for the columns actually touched.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+NS_PER_MS = 1_000_000
+NS_PER_DAY = 86_400 * 1_000_000_000
+
+COLUMNS = ["agg_id", "ts", "price", "qty", "first_id", "last_id", "is_buyer_maker"]
+
+# is_buyer_maker is kept as uint8 on disk: Arrow booleans are bit-packed and
+# cannot be viewed zero-copy, while a uint8 buffer views directly as np.bool_
+SCHEMA = pa.schema([
+    ("agg_id", pa.int64()),
+    ("ts", pa.int64()),
+    ("price", pa.float64()),
+    ("qty", pa.float64()),
+    ("first_id", pa.int64()),
+    ("last_id", pa.int64()),
+    ("is_buyer_maker", pa.uint8()),
+])
+
+COMPACT_FILE = "data.arrow"
+
+# Default store location shared by the downloaders and bar readers
+STORE_ROOT = "data/ticks"
+
+
+def normalize_agg_trades(trades):
+    """Convert raw aggTrades into a dict of typed NumPy columns.
+
+    Accepts the JSON list returned by /api/v3/aggTrades, or a DataFrame with
+    either the raw Binance columns (a, p, q, f, l, T, m) or the store's own
+    column names. Legacy parquet files with a datetime "T" column also work.
+    """
+    if isinstance(trades, list):
+        if not trades:
+            return {name: np.empty(0, dtype=SCHEMA.field(name).type.to_pandas_dtype()) for name in COLUMNS}
+        return {
+            "agg_id": np.fromiter((t["a"] for t in trades), dtype=np.int64, count=len(trades)),
+            "ts": np.fromiter((t["T"] for t in trades), dtype=np.int64, count=len(trades)) * NS_PER_MS,
+            "price": np.array([t["p"] for t in trades], dtype=np.float64),
+            "qty": np.array([t["q"] for t in trades], dtype=np.float64),
+            "first_id": np.fromiter((t["f"] for t in trades), dtype=np.int64, count=len(trades)),
+            "last_id": np.fromiter((t["l"] for t in trades), dtype=np.int64, count=len(trades)),
+            "is_buyer_maker": np.fromiter((t["m"] for t in trades), dtype=np.uint8, count=len(trades)),
+        }
+
+    if all(name in trades for name in COLUMNS):
+        return {name: np.asarray(trades[name], dtype=SCHEMA.field(name).type.to_pandas_dtype()) for name in COLUMNS}
+
+    ts = np.asarray(trades["T"])
+    if np.issubdtype(ts.dtype, np.datetime64):
+        ts = ts.astype("datetime64[ns]").astype(np.int64)
+    else:
+        ts = ts.astype(np.int64) * NS_PER_MS
+    return {
+        "agg_id": np.asarray(trades["a"], dtype=np.int64),
+        "ts": ts,
+        "price": np.asarray(trades["p"], dtype=np.float64),
+        "qty": np.asarray(trades["q"], dtype=np.float64),
+        "first_id": np.asarray(trades["f"], dtype=np.int64),
+        "last_id": np.asarray(trades["l"], dtype=np.int64),
+        "is_buyer_maker": np.asarray(trades["m"], dtype=np.uint8),
+    }
+
+
+def _to_ns(value):
+    """Accept int ns, datetime-like or date string and return int64 ns since epoch"""
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    if hasattr(value, "value") and hasattr(value, "tz"):
+        # pandas Timestamp (tz-aware or naive UTC)
+        return int(value.value)
+    return int(np.datetime64(value, "ns").astype(np.int64))
+
+
+def _date_str(day_index):
+    return str(np.datetime64(int(day_index), "D"))
+
+
+def _write_ipc(path, columns):
+    table = pa.Table.from_arrays([pa.array(columns[name], type=SCHEMA.field(name).type) for name in COLUMNS],
+                                 schema=SCHEMA)
+    tmp_path = path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, SCHEMA) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_ipc(path, columns):
+    """Memory-map one IPC file and return zero-copy NumPy views of `columns`"""
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    out = {}
+    for name in columns:
+        chunked = table.column(name)
+        if chunked.num_chunks == 0:
+            # Files written from an empty table have no record batches
+            values = np.empty(0, dtype=chunked.type.to_pandas_dtype())
+        else:
+            array = chunked.chunk(0) if chunked.num_chunks == 1 else pa.concat_arrays(chunked.chunks)
+            values = array.to_numpy(zero_copy_only=True)
+        out[name] = values.view(np.bool_) if name == "is_buyer_maker" else values
+    return out
+
+
+class TickStore:
+    """Per-symbol, date-partitioned Arrow IPC store of aggregated trades"""
+
+    def __init__(self, root=STORE_ROOT):
+        self.root = Path(root)
+
+    def partition_dir(self, symbol, date):
+        return self.root / symbol.upper() / f"date={date}"
+
+    def dates(self, symbol):
+        """Sorted list of dates (YYYY-MM-DD) stored for `symbol`"""
+        symbol_dir = self.root / symbol.upper()
+        if not symbol_dir.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in symbol_dir.iterdir() if p.name.startswith("date="))
+
+    def append(self, symbol, trades):
+        """Normalize `trades` and write them as new part files, split by UTC date.
+
+        Part files are named after the first aggregate trade id they contain,
+        so re-appending the same page overwrites it instead of duplicating it.
+        Returns the number of trades written.
+        """
+        columns = normalize_agg_trades(trades)
+        n = len(columns["agg_id"])
+        if n == 0:
+            return 0
+
+        days = columns["ts"] // NS_PER_DAY
+        for day in np.unique(days):
+            mask = days == day
+            part = {name: values[mask] for name, values in columns.items()}
+            out_dir = self.partition_dir(symbol, _date_str(day))
+            out_dir.mkdir(parents=True, exist_ok=True)
+            _write_ipc(out_dir / f"part-{int(part['agg_id'][0]):020d}.arrow", part)
+        return n
+
+    def _files(self, symbol, date):
+        part_dir = self.partition_dir(symbol, date)
+        if not part_dir.exists():
+            return []
+        files = sorted(part_dir.glob("part-*.arrow"))
+        compacted = part_dir / COMPACT_FILE
+        if compacted.exists():
+            files.insert(0, compacted)
+        return files
+
+    def compact(self, symbol, date):
+        """Merge a day's part files into one sorted, de-duplicated data.arrow.
+
+        A compacted day is a single contiguous file, which is what makes
+        reads zero-copy; call this once a day has been fully downloaded.
+        """
+        files = self._files(symbol, date)
+        if not files or files == [self.partition_dir(symbol, date) / COMPACT_FILE]:
+            return 0
+
+        pieces = [_read_ipc(path, COLUMNS) for path in files]
+        merged = {name: np.concatenate([piece[name] for piece in pieces]) for name in COLUMNS}
+        merged["is_buyer_maker"] = merged["is_buyer_maker"].view(np.uint8)
+
+        agg_ids, first_idx = np.unique(merged["agg_id"], return_index=True)
+        merged = {name: values[first_idx] for name, values in merged.items()}
+
+        part_dir = self.partition_dir(symbol, date)
+        _write_ipc(part_dir / COMPACT_FILE, merged)
+        for path in files:
+            if path.name != COMPACT_FILE:
+                path.unlink()
+        return len(agg_ids)
+
+    def last_agg_id(self, symbol, date):
+        """Highest aggregate trade id stored for `symbol` on `date`, or None"""
+        last = None
+        for path in self._files(symbol, date):
+            ids = _read_ipc(path, ["agg_id"])["agg_id"]
+            if len(ids):
+                last = int(ids.max()) if last is None else max(last, int(ids.max()))
+        return last
+
+    def read(self, symbol, start=None, end=None, columns=None):
+        """Return {column: ndarray} for trades with start <= ts < end.
+
+        `start`/`end` may be int ns or anything np.datetime64 accepts. When
+        the range falls within one compacted day the arrays are read-only
+        views on the memory-mapped file; otherwise they are concatenated.
+        Days with several files (uncompacted parts, or parts left beside
+        data.arrow by an interrupted compact) are de-duplicated on agg_id.
+        """
+        columns = list(columns or COLUMNS)
+        if "ts" not in columns:
+            columns.append("ts")
+        needed = columns if "agg_id" in columns else columns + ["agg_id"]
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+
+        dates = self.dates(symbol)
+        if start_ns is not None:
+            dates = [d for d in dates if d >= _date_str(start_ns // NS_PER_DAY)]
+        if end_ns is not None:
+            dates = [d for d in dates if d <= _date_str((end_ns - 1) // NS_PER_DAY)]
+
+        pieces = []
+        for date in dates:
+            files = self._files(symbol, date)
+            if len(files) > 1:
+                parts = [_read_ipc(path, needed) for path in files]
+                day = {name: np.concatenate([p[name] for p in parts]) for name in needed}
+                # First copy wins, as in compact() (data.arrow is listed first)
+                _, first_idx = np.unique(day["agg_id"], return_index=True)
+                order = first_idx[np.argsort(day["ts"][first_idx], kind="stable")]
+                day = {name: day[name][order] for name in columns}
+            elif files:
+                day = _read_ipc(files[0], columns)
+            else:
+                continue
+
+            ts = day["ts"]
+            lo = 0 if start_ns is None else np.searchsorted(ts, start_ns, side="left")
+            hi = len(ts) if end_ns is None else np.searchsorted(ts, end_ns, side="left")
+            pieces.append({name: values[lo:hi] for name, values in day.items()})
+
+        if not pieces:
+            return {name: np.empty(0, dtype=SCHEMA.field(name).type.to_pandas_dtype()) for name in columns}
+        if len(pieces) == 1:
+            return pieces[0]
+        return {name: np.concatenate([p[name] for p in pieces]) for name in columns}
+
+    def read_frame(self, symbol, start=None, end=None, columns=None):
+        """Same as read() but as a DataFrame indexed by UTC timestamp"""
+        import pandas as pd
+
+        data = self.read(symbol, start, end, columns)
+        index = pd.to_datetime(data.pop("ts"), unit="ns", utc=True)
+        return pd.DataFrame(data, index=index).rename_axis("T")
+
+    def import_parquet(self, symbol, path, compact=True):
+        """Load a legacy python_binance_data parquet file into the store"""
+        import pandas as pd
+
+        written = self.append(symbol, pd.read_parquet(path))
+        if compact:
+            for date in self.dates(symbol):
+                self.compact(symbol, date)
+        return written
+
+    def drop(self, symbol, date=None):
+        """Delete one day (or every day) stored for `symbol`"""
+        target = self.partition_dir(symbol, date) if date else self.root / symbol.upper()
+        if target.exists():
+            shutil.rmtree(target)
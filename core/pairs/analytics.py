@@ -0,0 +1,125 @@
+"""
+Batched pair analytics.
+
+All pairs are stacked into (time, pair) matrices so the ratio, log-ratio
+and rolling mean/std/z-score for every window come out of one set of
+cumulative sums instead of a df.copy() and .rolling() per pair and window.
+
+Rolling windows count each pair's own valid observations (as dropna()
+followed by .rolling() would): the NaNs of every column are moved to the
+bottom, the windows are taken over the compacted rows, and the results are
+scattered back to their original dates.
+
+Usage:
+    from core.pairs.analytics import PairPanel
+    panel = PairPanel.from_closes(closes, [("VOW.DE", "VOW3.DE"), ("BRK-A", "BRK-B")])
+    mean, std, z = panel.rolling_zscores([10, 20, 60])     # each (window, time, pair)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _compact(x):
+    """Move each column's NaNs to the bottom; returns (compacted, order)"""
+    order = np.argsort(np.isnan(x), axis=0, kind="stable")
+    return np.take_along_axis(x, order, axis=0), order
+
+
+def rolling_zscores(x, windows, ddof=1):
+    """Rolling mean, std and z-score of every column of `x` for every window.
+
+    `x` is (time, pair); the result is three (window, time, pair) arrays,
+    NaN wherever a column has fewer than `window` valid observations so far
+    or is missing on that date.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    windows = [int(w) for w in windows]
+    n_bars, n_pairs = x.shape
+    shape = (len(windows), n_bars, n_pairs)
+    mean, std, z = np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+    if n_bars == 0 or n_pairs == 0:
+        return mean, std, z
+
+    compact, order = _compact(x)
+    n_valid = np.count_nonzero(~np.isnan(compact), axis=0)
+    # Centre each column on its first value so the sum of squares keeps its precision
+    centred = np.nan_to_num(compact - compact[:1])
+    csum = np.zeros((n_bars + 1, n_pairs))
+    csq = np.zeros((n_bars + 1, n_pairs))
+    np.cumsum(centred, axis=0, out=csum[1:])
+    np.cumsum(centred * centred, axis=0, out=csq[1:])
+    row = np.arange(n_bars)[:, None]
+
+    for k, window in enumerate(windows):
+        if window > n_bars or window <= ddof:
+            continue
+        s = np.full((n_bars, n_pairs), np.nan)
+        sq = np.full((n_bars, n_pairs), np.nan)
+        s[window - 1:] = csum[window:] - csum[:-window]
+        sq[window - 1:] = csq[window:] - csq[:-window]
+        s[row >= n_valid] = np.nan
+
+        m = s / window
+        var = np.maximum(sq - window * m * m, 0.0) / (window - ddof)
+        sd = np.sqrt(var)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zz = np.where(sd > 0, (centred - m) / sd, np.nan)
+
+        base = compact[:1]
+        np.put_along_axis(mean[k], order, m + base, axis=0)
+        np.put_along_axis(std[k], order, sd, axis=0)
+        np.put_along_axis(z[k], order, zz, axis=0)
+    return mean, std, z
+
+
+class PairPanel:
+    """Aligned A/B price matrices for many pairs on one date index"""
+
+    def __init__(self, index, pairs, price_a, price_b, names=None):
+        self.index = pd.DatetimeIndex(index)
+        self.pairs = [tuple(p) for p in pairs]
+        self.names = list(names) if names is not None else [f"{a}/{b}" for a, b in self.pairs]
+        self.price_a = np.asarray(price_a, dtype=np.float64)
+        self.price_b = np.asarray(price_b, dtype=np.float64)
+        # A pair only has a ratio on dates where both legs trade
+        both = ~(np.isnan(self.price_a) | np.isnan(self.price_b))
+        self.price_a = np.where(both, self.price_a, np.nan)
+        self.price_b = np.where(both, self.price_b, np.nan)
+
+    @classmethod
+    def from_closes(cls, closes, pairs, names=None):
+        """Build from a wide (date x ticker) close frame and a list of (A, B) tickers"""
+        pairs = [tuple(p) for p in pairs]
+        columns_a = [a for a, _ in pairs]
+        columns_b = [b for _, b in pairs]
+        closes = closes.sort_index()
+        price_a = closes.reindex(columns=columns_a).to_numpy(dtype=np.float64)
+        price_b = closes.reindex(columns=columns_b).to_numpy(dtype=np.float64)
+        return cls(closes.index, pairs, price_a, price_b, names)
+
+    def __len__(self):
+        return len(self.pairs)
+
+    @property
+    def ratio(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.price_a / self.price_b
+
+    @property
+    def log_ratio(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.log(self.price_a) - np.log(self.price_b)
+
+    def rolling_zscores(self, windows, log=True):
+        """(mean, std, z) of the (log-)ratio, each shaped (window, time, pair)"""
+        return rolling_zscores(self.log_ratio if log else self.ratio, windows)
+
+    def frame(self, pair):
+        """One pair's price_a/price_b/ratio DataFrame on the dates both legs trade"""
+        j = pair if isinstance(pair, int) else self.pairs.index(tuple(pair))
+        frame = pd.DataFrame({"price_a": self.price_a[:, j], "price_b": self.price_b[:, j],
+                              "ratio": self.ratio[:, j]}, index=self.index)
+        return frame.dropna()
@@ -0,0 +1,285 @@
+"""
+Pair-screening engine for dual-class and cross-listed universes.
+
+For every candidate pair and lookback window it estimates the hedge ratio
+(OLS of log A on log B), runs an Engle-Granger cointegration test (ADF on
+the residual spread) and measures the half-life of mean reversion, then
+ranks the pairs. Pairs are screened in chunks across worker processes, and
+results are cached per (pair, window) keyed on the price files' mtime and
+size, so a re-screen only recomputes pairs whose data changed.
+
+Prices come from local Parquet/CSV files, one per ticker (the backtest
+cache in data/cache/daily by default).
+
+Usage:
+    python -m core.pairs.screening core/pairs/universes/dual_listed.csv --windows 252 756 0
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+PRICE_DIR = ROOT / "data" / "cache" / "daily"
+CACHE_PATH = ROOT / "data" / "cache" / "screening" / "pair_stats.parquet"
+DEFAULT_UNIVERSE = Path(__file__).resolve().parent / "universes" / "dual_listed.csv"
+
+DEFAULT_WINDOWS = (252, 756, 0)  # 0 = full history
+PRICE_COLUMNS = ("adj_close", "close", "Adj Close", "Close")
+ADF_LAGS = 1
+MIN_OBS = 60
+
+# MacKinnon (2010) critical values for a two-variable Engle-Granger test with constant
+EG_CRITICAL = {"1%": -3.90, "5%": -3.34, "10%": -3.04}
+
+STAT_COLUMNS = ["n_obs", "hedge_ratio", "intercept", "adf_stat", "p_value",
+                "half_life", "spread_std", "spread_z", "correlation"]
+
+
+def load_universe(path=DEFAULT_UNIVERSE):
+    """Candidate pairs from a CSV/Parquet/JSON file with ticker_a and ticker_b columns"""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        universe = pd.read_parquet(path)
+    elif path.suffix == ".json":
+        universe = pd.read_json(path)
+    else:
+        universe = pd.read_csv(path, comment="#")
+    missing = {"ticker_a", "ticker_b"} - set(universe.columns)
+    if missing:
+        raise ValueError(f"{path} is missing columns {sorted(missing)}")
+    universe = universe[universe["ticker_a"] != universe["ticker_b"]]
+    return universe.drop_duplicates(["ticker_a", "ticker_b"]).reset_index(drop=True)
+
+
+def _price_file(ticker, price_dir):
+    for suffix in (".parquet", ".csv"):
+        path = Path(price_dir) / f"{ticker}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def file_fingerprint(ticker, price_dir=PRICE_DIR):
+    """mtime/size token that changes whenever a ticker's price file is rewritten"""
+    path = _price_file(ticker, price_dir)
+    if path is None:
+        return None
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_close(ticker, price_dir=PRICE_DIR):
+    """Close-price Series for one ticker from its local file"""
+    path = _price_file(ticker, price_dir)
+    if path is None:
+        raise FileNotFoundError(f"No price file for {ticker} in {price_dir}")
+    if path.suffix == ".parquet":
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, index_col=0, parse_dates=True)
+    column = next((c for c in PRICE_COLUMNS if c in frame.columns), None)
+    if column is None:
+        raise ValueError(f"{path} has none of the price columns {PRICE_COLUMNS}")
+    series = frame[column].astype("float64")
+    series.index = pd.DatetimeIndex(series.index)
+    return series[series > 0].sort_index()
+
+
+def _ols(y, x):
+    """Slope, intercept and residuals of y = a + b*x"""
+    x_mean, y_mean = x.mean(), y.mean()
+    dx = x - x_mean
+    slope = (dx @ (y - y_mean)) / (dx @ dx)
+    intercept = y_mean - slope * x_mean
+    return slope, intercept, y - intercept - slope * x
+
+
+def adf_stat(series, lags=ADF_LAGS):
+    """Augmented Dickey-Fuller t-statistic of gamma in
+    d(s_t) = c + gamma * s_(t-1) + sum(phi_i * d(s_(t-i))) + e_t"""
+    diff = np.diff(series)
+    n = len(diff) - lags
+    if n <= lags + 3:
+        return np.nan
+    columns = [np.ones(n), series[lags:-1]]
+    columns += [diff[lags - i:-i] for i in range(1, lags + 1)]
+    X = np.column_stack(columns)
+    y = diff[lags:]
+    coef, _, rank, _ = np.linalg.lstsq(X, y, rcond=None)
+    if rank < X.shape[1]:
+        return np.nan
+    resid = y - X @ coef
+    sigma2 = resid @ resid / (n - X.shape[1])
+    cov = sigma2 * np.linalg.inv(X.T @ X)
+    return coef[1] / np.sqrt(cov[1, 1])
+
+
+def eg_pvalue(stat):
+    """Engle-Granger p-value via statsmodels' MacKinnon tables when installed"""
+    try:
+        from statsmodels.tsa.adfvalues import mackinnonp
+    except ImportError:
+        return np.nan
+    return float(mackinnonp(stat, regression="c", N=2)) if np.isfinite(stat) else np.nan
+
+
+def half_life(spread):
+    """Half-life (bars) of mean reversion from d(s_t) = a + lambda * s_(t-1)"""
+    slope, _, _ = _ols(np.diff(spread), spread[:-1])
+    return -np.log(2) / slope if slope < 0 else np.inf
+
+
+def pair_stats(close_a, close_b, window=0):
+    """Hedge ratio, Engle-Granger ADF, half-life and current spread z for one pair"""
+    joined = pd.concat([close_a, close_b], axis=1, join="inner").dropna()
+    if window:
+        joined = joined.iloc[-window:]
+    n_obs = len(joined)
+    if n_obs < MIN_OBS:
+        return dict.fromkeys(STAT_COLUMNS, np.nan) | {"n_obs": n_obs}
+
+    log_a = np.log(joined.iloc[:, 0].to_numpy())
+    log_b = np.log(joined.iloc[:, 1].to_numpy())
+    beta, alpha, spread = _ols(log_a, log_b)
+    stat = adf_stat(spread)
+    std = spread.std(ddof=1)
+    return {
+        "n_obs": n_obs,
+        "hedge_ratio": beta,
+        "intercept": alpha,
+        "adf_stat": stat,
+        "p_value": eg_pvalue(stat),
+        "half_life": half_life(spread),
+        "spread_std": std,
+        "spread_z": spread[-1] / std if std > 0 else np.nan,
+        "correlation": np.corrcoef(np.diff(log_a), np.diff(log_b))[0, 1],
+    }
+
+
+def _screen_chunk(job):
+    """Worker entry point: stats for a chunk of (pair, window, fingerprint) tasks"""
+    tasks, price_dir = job
+    closes = {}
+    rows = []
+    for ticker_a, ticker_b, window, fingerprint in tasks:
+        row = {"ticker_a": ticker_a, "ticker_b": ticker_b, "window": window, "fingerprint": fingerprint}
+        try:
+            for ticker in (ticker_a, ticker_b):
+                if ticker not in closes:
+                    closes[ticker] = load_close(ticker, price_dir)
+            row.update(pair_stats(closes[ticker_a], closes[ticker_b], window))
+        except (FileNotFoundError, ValueError, np.linalg.LinAlgError) as e:
+            row.update(dict.fromkeys(STAT_COLUMNS, np.nan))
+            row["error"] = str(e)
+        rows.append(row)
+    return rows
+
+
+def _load_cache(path):
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=["ticker_a", "ticker_b", "window", "fingerprint"])
+    return pd.read_parquet(path)
+
+
+def _save_cache(frame, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def rank_pairs(results, max_half_life=126):
+    """Sort by cointegration strength among pairs that revert within `max_half_life` bars"""
+    ranked = results.copy()
+    ranked["cointegrated_5pct"] = ranked["adf_stat"] < EG_CRITICAL["5%"]
+    reverting = ranked["half_life"].between(1, max_half_life)
+    ranked["score"] = np.where(reverting, -ranked["adf_stat"], np.nan)
+    ranked = ranked.sort_values(["score", "adf_stat"], ascending=[False, True], na_position="last")
+    ranked["rank"] = np.arange(1, len(ranked) + 1)
+    return ranked.reset_index(drop=True)
+
+
+def screen(universe=DEFAULT_UNIVERSE, windows=DEFAULT_WINDOWS, price_dir=PRICE_DIR, cache_path=CACHE_PATH,
+           workers=None, chunk_size=64, max_half_life=126):
+    """Screen every pair x window, reusing cached stats for unchanged price files"""
+    pairs = universe if isinstance(universe, pd.DataFrame) else load_universe(universe)
+    windows = [int(w) for w in windows]
+
+    fingerprints = {}
+    for ticker in pd.unique(pairs[["ticker_a", "ticker_b"]].to_numpy().ravel()):
+        fingerprints[ticker] = file_fingerprint(ticker, price_dir)
+
+    cache = _load_cache(cache_path)
+    key_columns = ["ticker_a", "ticker_b", "window", "fingerprint"]
+    cached_keys = set(map(tuple, cache[key_columns].itertuples(index=False, name=None)))
+
+    wanted, todo = [], []
+    for ticker_a, ticker_b in pairs[["ticker_a", "ticker_b"]].itertuples(index=False, name=None):
+        fa, fb = fingerprints[ticker_a], fingerprints[ticker_b]
+        fingerprint = f"{fa}|{fb}" if fa and fb else "missing"
+        for window in windows:
+            key = (ticker_a, ticker_b, window, fingerprint)
+            wanted.append(key)
+            if key not in cached_keys:
+                todo.append(key)
+
+    print(f"🔎 {len(wanted)} pair-windows, {len(wanted) - len(todo)} cached, {len(todo)} to compute")
+    if todo:
+        # todo is pair-major, so a pair's windows share a chunk and its prices are read once
+        chunks = [(todo[i:i + chunk_size], price_dir) for i in range(0, len(todo), chunk_size)]
+        workers = workers or min(len(chunks), os.cpu_count() or 1)
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rows = [row for chunk in pool.map(_screen_chunk, chunks) for row in chunk]
+        else:
+            rows = [row for chunk in chunks for row in _screen_chunk(chunk)]
+
+        fresh = pd.DataFrame(rows)
+        # Drop stale entries for recomputed (pair, window) combinations
+        stale = cache.set_index(["ticker_a", "ticker_b", "window"]).index.isin(
+            fresh.set_index(["ticker_a", "ticker_b", "window"]).index)
+        cache = pd.concat([cache[~stale], fresh], ignore_index=True)
+        _save_cache(cache, cache_path)
+
+    wanted = pd.DataFrame(wanted, columns=key_columns)
+    results = wanted.merge(cache, on=key_columns, how="left")
+    extra = [c for c in pairs.columns if c not in ("ticker_a", "ticker_b")]
+    if extra:
+        results = results.merge(pairs, on=["ticker_a", "ticker_b"], how="left")
+    return rank_pairs(results.drop(columns="fingerprint"), max_half_life)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen and rank candidate pairs")
+    parser.add_argument("universe", nargs="?", default=str(DEFAULT_UNIVERSE))
+    parser.add_argument("--windows", type=int, nargs="+", default=list(DEFAULT_WINDOWS),
+                        help="Lookbacks in bars (0 = full history)")
+    parser.add_argument("--prices", default=str(PRICE_DIR), help="Directory of <ticker>.parquet/.csv files")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-half-life", type=float, default=126)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--output", help="Write the full ranking to this Parquet/CSV file")
+    args = parser.parse_args()
+
+    ranked = screen(args.universe, args.windows, args.prices, workers=args.workers,
+                    max_half_life=args.max_half_life)
+    if args.output:
+        if args.output.endswith(".csv"):
+            ranked.to_csv(args.output, index=False)
+        else:
+            ranked.to_parquet(args.output, index=False)
+        print(f"✅ Ranking written to {args.output}")
+    columns = [c for c in ["rank", "name", "ticker_a", "ticker_b", "window", "n_obs", "hedge_ratio",
+                           "adf_stat", "p_value", "half_life", "spread_z"] if c in ranked.columns]
+    print(ranked[columns].head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,48 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
-import ta
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.data.dashboard_store import DashboardStore
+
+# Bars are refreshed from yfinance at most this often per (tickers, interval)
+REFRESH_SECONDS = 60
 
 # ---
 
-def fetch_stock_data(ticker, period, interval):
+@st.cache_resource
+def get_store():
+    return DashboardStore()
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def refresh_bars(tickers, interval):
+    """Append only new bars for all tickers in one batched download"""
     try:
-        end_date = datetime.now()
-        if period == "1wk":
-            start_date = end_date - timedelta(days=7)
-            data = yf.download(ticker, start=start_date, end=end_date, interval=interval)
-        elif period == "1d" and interval == "1m":
-            start_date = end_date - timedelta(days=7)  # 1m data only available for 7 days
-            data = yf.download(ticker, start=start_date, end=end_date, interval=interval)
-        else:
-            data = yf.download(ticker, period=period, interval=interval)
-        return data
+        return get_store().refresh(list(tickers), interval)
     except Exception as e:
-        st.error(f"Error fetching data for {ticker}: {str(e)}")
-        return pd.DataFrame()
-
-def process_data(data):
-    if not data.empty:
-        if data.index.tzinfo is None:
-            data.index = data.index.tz_localize('UTC')
-        else:
-            data.index = data.index.tz_convert('US/Eastern')
-        data.reset_index(inplace=True)
-        if 'Date' in data.columns:
-            data.rename(columns={'Date': 'Datetime'}, inplace=True)
-    return data
+        st.error(f"Error refreshing {', '.join(tickers)}: {str(e)}")
+        return {}
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def load_bars(ticker, period, interval):
+    """Stored bars with SMA_20/EMA_20 for the last `period`, refreshed incrementally"""
+    refresh_bars((ticker.upper(),), interval)
+    return get_store().view(ticker, interval, period)
+
+@st.cache_data(ttl=REFRESH_SECONDS, show_spinner=False)
+def load_quotes(symbols, interval="1m"):
+    """(last close, first open) of the latest day's bars per symbol, after one shared refresh"""
+    refresh_bars(tuple(symbols), interval)
+    quotes = {}
+    for symbol in symbols:
+        data = get_store().view(symbol, interval, "1d")
+        if not data.empty:
+            quotes[symbol] = (data['Close'].iloc[-1], data['Open'].iloc[0])
+    return quotes
 
 def calculate_metrics(data):
     if not data.empty and 'Close' in data.columns:
@@ -47,15 +56,6 @@ def calculate_metrics(data):
         return last_close, prev_close, change, pct_change, high, low, volume
     return 0, 0, 0, 0, 0, 0, 0
 
-def add_technical_indicators(data):
-    if not data.empty and len(data) >= 20 and 'Close' in data.columns:
-        data['SMA_20'] = ta.trend.sma_indicator(data['Close'], window=20)
-        data['EMA_20'] = ta.trend.ema_indicator(data['Close'], window=20)
-    else:
-        data['SMA_20'] = pd.NA
-        data['EMA_20'] = pd.NA
-    return data
-
 # ---
 
 st.set_page_config(layout="wide")
@@ -78,13 +78,10 @@ interval_mapping = {
 # ---
 
 if st.sidebar.button('Update'):
-    data = fetch_stock_data(ticker, time_period, interval_mapping[time_period])
+    data = load_bars(ticker, time_period, interval_mapping[time_period])
     if data.empty:
         st.error(f"No data found for ticker {ticker}. Please check the ticker symbol or try again.")
     else:
-        data = process_data(data)
-        data = add_technical_indicators(data)
-
         last_close, prev_close, change, pct_change, high, low, volume = calculate_metrics(data)
 
         st.metric(label=f'{ticker} Last Price', value=f'{last_close:.2f} USD', delta=f'{change:.2f} ({pct_change:.2f}%)')
@@ -125,11 +122,10 @@ if st.sidebar.button('Update'):
 # Sidebar real-time summary
 st.sidebar.header('Real-Time Stock Prices')
 stock_symbols = ['AAPL', 'GOOGL', 'AMZN', 'MSFT']
+quotes = load_quotes(tuple(stock_symbols))
 for symbol in stock_symbols:
-    real_time_data = fetch_stock_data(symbol, '1d', '1m')
-    if not real_time_data.empty and 'Close' in real_time_data.columns and 'Open' in real_time_data.columns:
-        last_price = real_time_data['Close'].iloc[-1]
-        open_price = real_time_data['Open'].iloc[0]
+    if symbol in quotes:
+        last_price, open_price = quotes[symbol]
         change = last_price - open_price
         pct_change = (change / open_price) * 100 if open_price != 0 else 0
         st.sidebar.metric(f"{symbol}", f"{last_price:.2f}", f"{change:.2f} ({pct_change:.2f}%)")
@@ -7,35 +7,40 @@ assert callable(str)
 
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 
-def plot_crosspair_absolute(name, eu_label, us_label, data_path, output_path):
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.data.calendars import sessions
+
+def plot_crosspair_absolute(name, eu_label, us_label, data_path, output_path,
+                            eu_exchange, us_exchange="NYSE"):
     df = pd.read_csv(data_path, index_col=0, parse_dates=True)
     df.index = df.index.tz_localize("UTC") if df.index.tzinfo is None else df.index.tz_convert("UTC")
 
-    MARKET_HOURS = {
-        "eu": {"start": "07:00", "end": "15:25"},
-        "us": {"start": "14:30", "end": "21:00"}
-    }
+    # Exchange session tables (UTC, DST and holiday aware)
+    eu_sessions = sessions(eu_exchange)
+    us_sessions = sessions(us_exchange)
+    in_eu = eu_sessions.mask(df.index)
+    in_us = us_sessions.mask(df.index)
 
     with PdfPages(output_path) as pdf:
         for date in sorted(set(df.index.date)):
-            day = df[df.index.date == date]
+            on_day = df.index.date == date
+            day = df[on_day]
             if day.empty:
                 continue
 
             date_str = str(date)
             time_range = pd.date_range(start=f"{date} 00:00", end=f"{date} 23:55", freq="5min", tz="UTC")
 
-            eu_abs = day.between_time(MARKET_HOURS["eu"]["start"], MARKET_HOURS["eu"]["end"])["eu"].reindex(time_range, method="ffill")
-            us_abs = day.between_time(MARKET_HOURS["us"]["start"], MARKET_HOURS["us"]["end"])["us"].reindex(time_range, method="ffill")
+            eu_abs = day[in_eu[on_day]]["eu"].reindex(time_range, method="ffill")
+            us_abs = day[in_us[on_day]]["us"].reindex(time_range, method="ffill")
 
-            eu_open = pd.Timestamp(f"{date} {MARKET_HOURS['eu']['start']}", tz="UTC")
-            eu_close = pd.Timestamp(f"{date} {MARKET_HOURS['eu']['end']}", tz="UTC")
-            us_open = pd.Timestamp(f"{date} {MARKET_HOURS['us']['start']}", tz="UTC")
-            us_close = pd.Timestamp(f"{date} {MARKET_HOURS['us']['end']}", tz="UTC")
+            eu_session = eu_sessions.session(date)
+            us_session = us_sessions.session(date)
 
             fig, ax = plt.subplots(figsize=(12, 4))
 
@@ -44,8 +49,10 @@ def plot_crosspair_absolute(name, eu_label, us_label, data_path, output_path):
             ax.set_title(f"Absolute Prices — {date_str}")
             ax.set_ylabel("Price")
             ax.legend()
-            ax.axvspan(eu_open, eu_close, color="gray", alpha=0.1)
-            ax.axvspan(us_open, us_close, color="blue", alpha=0.05)
+            if eu_session:
+                ax.axvspan(*eu_session, color="gray", alpha=0.1)
+            if us_session:
+                ax.axvspan(*us_session, color="blue", alpha=0.05)
             ax.set_xlabel("Time (UTC)")
 
             fig.autofmt_xdate()
@@ -1,9 +1,14 @@
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 
-def plot_crosspair_leapfrog(name, data_path, output_path, eu_label, us_label):
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.data.calendars import session_mask
+
+def plot_crosspair_leapfrog(name, data_path, output_path, eu_label, us_label,
+                            eu_exchange, us_exchange="NYSE"):
     df = pd.read_csv(data_path, index_col=0, parse_dates=True)
 
     if df.empty or df.shape[1] != 2:
@@ -20,15 +25,17 @@ def plot_crosspair_leapfrog(name, data_path, output_path, eu_label, us_label):
     df["eu_norm"] = df.groupby(df.index.date)["eu"].transform(normalize_day)
     df["us_norm"] = df.groupby(df.index.date)["us"].transform(normalize_day)
 
-    MARKET_HOURS = {
-        "eu": {"start": "07:00", "end": "15:25"},
-        "us": {"start": "14:30", "end": "21:00"}
-    }
+    # Session masks from the exchange calendars (DST and holidays included)
+    in_eu = session_mask(eu_exchange, df.index)
+    in_us = session_mask(us_exchange, df.index)
 
     with PdfPages(output_path) as pdf:
         for date in sorted(set(df.index.date)):
             try:
-                day = df[df.index.date == date]
+                on_day = df.index.date == date
+                day = df[on_day]
+                eu_day = day[in_eu[on_day]]
+                us_day = day[in_us[on_day]]
                 if day.empty:
                     continue
 
@@ -40,12 +47,12 @@ def plot_crosspair_leapfrog(name, data_path, output_path, eu_label, us_label):
                 )
 
                 # Absolute prices
-                eu_abs = day.between_time(MARKET_HOURS["eu"]["start"], MARKET_HOURS["eu"]["end"])["eu"].reindex(full_range, method="ffill")
-                us_abs = day.between_time(MARKET_HOURS["us"]["start"], MARKET_HOURS["us"]["end"])["us"].reindex(full_range, method="ffill")
+                eu_abs = eu_day["eu"].reindex(full_range, method="ffill")
+                us_abs = us_day["us"].reindex(full_range, method="ffill")
 
                 # Normalized
-                eu_norm = day.between_time(MARKET_HOURS["eu"]["start"], MARKET_HOURS["eu"]["end"])["eu_norm"].reindex(full_range, method="ffill")
-                us_norm = day.between_time(MARKET_HOURS["us"]["start"], MARKET_HOURS["us"]["end"])["us_norm"].reindex(full_range, method="ffill")
+                eu_norm = eu_day["eu_norm"].reindex(full_range, method="ffill")
+                us_norm = us_day["us_norm"].reindex(full_range, method="ffill")
 
                 fig, axes = plt.subplots(nrows=2, ncols=1, figsize=(15, 10), sharex=True)
 
@@ -83,5 +90,6 @@ def plot_crosspair_leapfrog(name, data_path, output_path, eu_label, us_label):
 #         data_path=os.path.join(BASE_DIR, "data", "schibsted_vs_aapl_intraday.csv"),
 #         output_path=os.path.join(BASE_DIR, "plots", "schibsted_vs_aapl_leapfrog.pdf"),
 #         eu_label="Schibsted (SCHA.OL)",
-#         us_label="Apple (AAPL)"
+#         us_label="Apple (AAPL)",
+#         eu_exchange="OSE"
 #     )
\ No newline at end of file
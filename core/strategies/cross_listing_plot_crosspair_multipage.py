@@ -3,6 +3,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.data.calendars import sessions
 
 def generate_plots():
     try:
@@ -39,11 +43,13 @@ def generate_plots():
         df["eu_norm"] = df.groupby(df.index.date)["eu"].transform(normalize_day)
         df["us_norm"] = df.groupby(df.index.date)["us"].transform(normalize_day)
 
-        # Market hours (UTC)
+        # Exchange session tables (UTC, DST and holiday aware)
         MARKET_HOURS = {
-            "eu": {"start": "07:00", "end": "15:25", "label": "Schibsted (SCHA.OL)"},
-            "us": {"start": "14:30", "end": "21:00", "label": "Apple (AAPL)"}
+            "eu": {"sessions": sessions("OSE"), "label": "Schibsted (SCHA.OL)"},
+            "us": {"sessions": sessions("NYSE"), "label": "Apple (AAPL)"}
         }
+        in_eu = MARKET_HOURS["eu"]["sessions"].mask(df.index)
+        in_us = MARKET_HOURS["us"]["sessions"].mask(df.index)
 
         # Generate PDF
         with PdfPages(PLOT_PATH) as pdf:
@@ -52,7 +58,8 @@ def generate_plots():
             
             for date in unique_dates:
                 try:
-                    day = df[df.index.date == date]
+                    on_day = df.index.date == date
+                    day = df[on_day]
                     if day.empty or day["eu_norm"].isna().all() or day["us_norm"].isna().all():
                         print(f"Skipping {date}: No valid data")
                         continue
@@ -66,14 +73,8 @@ def generate_plots():
                     )
                     
                     # Filter market hours and reindex
-                    eu = day.between_time(
-                        MARKET_HOURS["eu"]["start"],
-                        MARKET_HOURS["eu"]["end"]
-                    )["eu_norm"].reindex(full_range, method="ffill")
-                    us = day.between_time(
-                        MARKET_HOURS["us"]["start"],
-                        MARKET_HOURS["us"]["end"]
-                    )["us_norm"].reindex(full_range, method="ffill")
+                    eu = day[in_eu[on_day]]["eu_norm"].reindex(full_range, method="ffill")
+                    us = day[in_us[on_day]]["us_norm"].reindex(full_range, method="ffill")
 
                     # Plot
                     plt.figure(figsize=(15, 7))
@@ -97,16 +98,12 @@ def generate_plots():
                     plt.grid(True, linestyle="--", alpha=0.4, which="both")
                     
                     # Add vertical spans for market hours
-                    plt.axvspan(
-                        pd.Timestamp(f"{date} {MARKET_HOURS['eu']['start']} UTC"),
-                        pd.Timestamp(f"{date} {MARKET_HOURS['eu']['end']} UTC"),
-                        color="green", alpha=0.1, label="EU Market Hours"
-                    )
-                    plt.axvspan(
-                        pd.Timestamp(f"{date} {MARKET_HOURS['us']['start']} UTC"),
-                        pd.Timestamp(f"{date} {MARKET_HOURS['us']['end']} UTC"),
-                        color="red", alpha=0.1, label="US Market Hours"
-                    )
+                    eu_session = MARKET_HOURS["eu"]["sessions"].session(date)
+                    us_session = MARKET_HOURS["us"]["sessions"].session(date)
+                    if eu_session:
+                        plt.axvspan(*eu_session, color="green", alpha=0.1, label="EU Market Hours")
+                    if us_session:
+                        plt.axvspan(*us_session, color="red", alpha=0.1, label="US Market Hours")
 
                     plt.legend(loc="best", fontsize=10)
                     plt.tight_layout()
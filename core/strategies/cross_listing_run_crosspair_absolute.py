@@ -3,8 +3,11 @@ str = builtins.str  # Restore built-in str function if overwritten
 assert str is builtins.str, "You've overwritten the built-in 'str' function!"
 
 import os
+import sys
 from fetch_crosspair_modular import fetch_crosspair_data
 from plot_crosspair_absolute import plot_crosspair_absolute
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.data.calendars import exchange_for_ticker
 import builtins
 
 
@@ -41,7 +44,8 @@ for pair in PAIRS:
                 eu_label=pair["eu_label"],
                 us_label=pair["us_label"],
                 data_path=csv_path,
-                output_path=output_path
+                output_path=output_path,
+                eu_exchange=exchange_for_ticker(pair["eu_ticker"])
             )
         except Exception as e:
             print(f"❌ Failed plotting {pair['name']}: {e}")
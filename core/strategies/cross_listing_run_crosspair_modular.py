@@ -1,7 +1,10 @@
 # run_crosspair_modular.py
 import os
+import sys
 from fetch_crosspair_modular import fetch_crosspair_data
 from plot_crosspair_modular import plot_crosspair_leapfrog
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.data.calendars import exchange_for_ticker
 
 PAIRS = [
     {"name": "schibsted_vs_aapl", "eu_ticker": "SCHA.OL", "us_ticker": "AAPL", "eu_label": "Schibsted", "us_label": "Apple"},
@@ -33,7 +36,8 @@ for pair in PAIRS:
                 data_path=data_path,
                 output_path=output_path,
                 eu_label=pair["eu_label"],
-                us_label=pair["us_label"]
+                us_label=pair["us_label"],
+                eu_exchange=exchange_for_ticker(pair["eu_ticker"])
             )
         else:
             print(f"⚠️ Skipping {pair['name']} due to download error.")
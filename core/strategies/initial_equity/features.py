@@ -0,0 +1,69 @@
+"""
+Rolling 60-day features for the OSEBX classifier.
+
+All four features of models/xgboost_osebx_model.json come out of one pass
+over (date, ticker) close and volume matrices, using cumulative sums for
+every rolling window instead of a groupby/rolling per ticker:
+
+    return_60d          close_t / close_{t-60} - 1 (last traded closes)
+    volatility_60d      std (ddof=1) of daily returns on traded days in the window
+    turnover_60d        mean daily traded value (close * volume) over the window
+    trading_days_ratio  share of the window's sessions with volume > 0
+
+A ticker gets features from its 61st session onwards (the first full
+window after its first close); before that the rows are NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ...backtest.strategies import ffill, rolling_sum
+
+FEATURES = ["return_60d", "volatility_60d", "turnover_60d", "trading_days_ratio"]
+WINDOW = 60
+
+
+def feature_arrays(close, volume, window=WINDOW):
+    """{feature: (time, ticker) array} from close and volume matrices of the same shape"""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    n_bars, n_tickers = close.shape
+    out = {name: np.full((n_bars, n_tickers), np.nan) for name in FEATURES}
+    if n_bars <= window:
+        return out
+
+    traded = ~np.isnan(close) & (np.nan_to_num(volume) > 0)
+    filled = ffill(close)
+    previous = np.vstack([np.full((1, n_tickers), np.nan), filled[:-1]])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        daily = np.where(traded & ~np.isnan(previous), filled / previous - 1, np.nan)
+    has_return = ~np.isnan(daily)
+    r = np.nan_to_num(daily)
+
+    n = rolling_sum(has_return.astype(np.float64), window)
+    s = rolling_sum(r, window)
+    sq = rolling_sum(r * r, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = np.where(n > 1, np.maximum(sq - s * s / n, 0.0) / (n - 1), np.nan)
+        out["return_60d"][window:] = filled[window:] / filled[:-window] - 1
+    out["volatility_60d"] = np.sqrt(var)
+    out["turnover_60d"] = rolling_sum(np.where(traded, filled * np.nan_to_num(volume), 0.0), window) / window
+    out["trading_days_ratio"] = rolling_sum(traded.astype(np.float64), window) / window
+
+    # Only tickers that were listed for the whole window (a close `window` sessions back)
+    listed = np.zeros((n_bars, n_tickers), dtype=bool)
+    listed[window:] = ~np.isnan(filled[:-window])
+    for name in FEATURES:
+        out[name][~listed] = np.nan
+    return out
+
+
+def build_features(close, volume, window=WINDOW, dropna=True):
+    """Long (date, ticker) feature frame from wide (date x ticker) close and volume frames"""
+    close = close.sort_index()
+    volume = volume.reindex(index=close.index, columns=close.columns)
+    arrays = feature_arrays(close.to_numpy(), volume.to_numpy(), window)
+
+    index = pd.MultiIndex.from_product([close.index, close.columns], names=["date", "ticker"])
+    features = pd.DataFrame({name: arrays[name].ravel() for name in FEATURES}, index=index)
+    return features.dropna(subset=["return_60d"]) if dropna else features
@@ -0,0 +1,122 @@
+"""
+Batch scoring of the Oslo universe with the stored OSEBX XGBoost model.
+
+Prices and volumes for every ticker in the universe file come from the
+local daily cache (core.backtest.data), the four 60-day features are built
+for the whole (date, ticker) panel in one vectorized pass, and the booster
+(loaded once per process, nthread = all cores) predicts every row in a
+single inplace_predict call, with a DMatrix fallback for older xgboost.
+
+Usage:
+    python -m core.strategies.initial_equity.scoring --start 2024-01-01
+    python -m core.strategies.initial_equity.scoring --latest --top 15 --output data/signals/osebx_scores.parquet
+"""
+
+import argparse
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ...backtest.data import load_prices
+from .features import FEATURES, WINDOW, build_features
+
+HERE = Path(__file__).resolve().parent
+MODEL_PATH = HERE / "models" / "xgboost_osebx_model.json"
+DEFAULT_UNIVERSE = HERE / "ose_universe.csv"
+DEFAULT_OUTPUT = Path(__file__).resolve().parents[3] / "data" / "signals" / "osebx_scores.parquet"
+
+# Calendar days loaded before --start so the first scored date has a full window
+WARMUP_DAYS = int(WINDOW * 1.6) + 10
+
+
+def load_universe(path=DEFAULT_UNIVERSE):
+    """Tickers (Yahoo symbols) from a CSV with a ticker column"""
+    universe = pd.read_csv(path, comment="#")
+    return universe["ticker"].dropna().drop_duplicates().tolist()
+
+
+@lru_cache(maxsize=None)
+def load_booster(path=MODEL_PATH, nthread=0):
+    """The stored booster, loaded once per process (nthread=0 uses every core)"""
+    import xgboost as xgb
+
+    booster = xgb.Booster(model_file=str(path))
+    booster.set_param({"nthread": nthread or os.cpu_count() or 1})
+    names = booster.feature_names
+    if names is not None and list(names) != FEATURES:
+        raise ValueError(f"Model features {names} do not match {FEATURES}")
+    return booster
+
+
+def predict(features, booster=None):
+    """Positive-class probability for every row of a feature frame"""
+    booster = booster or load_booster()
+    X = np.ascontiguousarray(features[FEATURES].to_numpy(dtype=np.float32))
+    if len(X) == 0:
+        return np.empty(0, dtype=np.float32)
+    try:
+        return booster.inplace_predict(X, validate_features=False)
+    except (AttributeError, TypeError):
+        import xgboost as xgb
+
+        return booster.predict(xgb.DMatrix(X, feature_names=FEATURES, nthread=-1))
+
+
+def score_panel(close, volume, threshold=0.5, booster=None):
+    """Features, probability, per-date rank and 0/1 signal for every (date, ticker)"""
+    features = build_features(close, volume)
+    scores = features.copy()
+    scores["probability"] = predict(features, booster)
+    scores["rank"] = scores.groupby(level="date")["probability"].rank(ascending=False, method="first")
+    scores["signal"] = (scores["probability"] >= threshold).astype(np.int8)
+    return scores
+
+
+def score_universe(tickers, start, end=None, threshold=0.5):
+    """Daily scores for `tickers` from `start` to `end` (default: today)"""
+    end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+    start = pd.Timestamp(start)
+    prices = load_prices(tickers, start - pd.Timedelta(days=WARMUP_DAYS), end, fields=("close", "volume"))
+    close = prices["close"].dropna(how="all")
+    scores = score_panel(close, prices["volume"], threshold)
+    return scores[scores.index.get_level_values("date") >= start]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score the Oslo universe with the OSEBX XGBoost model")
+    parser.add_argument("--universe", default=str(DEFAULT_UNIVERSE))
+    parser.add_argument("--start", default=str((pd.Timestamp.today() - pd.Timedelta(days=30)).date()))
+    parser.add_argument("--end")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--latest", action="store_true", help="Only print the most recent date")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Parquet (or .csv) file for all scores")
+    args = parser.parse_args()
+
+    tickers = load_universe(args.universe)
+    scores = score_universe(tickers, args.start, args.end, args.threshold)
+    if scores.empty:
+        print("⚠️ No rows with a full 60-day window; try an earlier --start")
+        return
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix == ".csv":
+        scores.reset_index().to_csv(output, index=False)
+    else:
+        scores.reset_index().to_parquet(output, index=False)
+    n_dates = scores.index.get_level_values("date").nunique()
+    print(f"✅ {len(scores)} scores for {len(tickers)} tickers over {n_dates} dates written to {output}")
+
+    if args.latest:
+        last = scores.index.get_level_values("date").max()
+        scores = scores.xs(last, level="date")
+        print(f"\n📊 {last.date()}")
+    print(scores.sort_values("probability", ascending=False).head(args.top).to_string())
+
+
+if __name__ == "__main__":
+    main()
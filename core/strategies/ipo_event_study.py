@@ -5,13 +5,14 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 import os
-from PyPDF2 import PdfMerger
-from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
 import sys
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.utils.report_builder import ReportBuilder
+
 # Check for required dependencies
-required_packages = ['yfinance', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'scipy', 'PyPDF2']
+required_packages = ['yfinance', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'scipy']
 missing_packages = []
 for pkg in required_packages:
     try:
@@ -47,7 +48,7 @@ ipos = [
 benchmark_ticker = "^GSPC"
 event_window_days = 21  # Number of trading days post-IPO
 estimation_window_days = 60
-pdf_paths = []
+final_pdf_path = "plots/ipo_event_study_advanced.pdf"
 all_car_data = []
 all_ar_data = []
 
@@ -68,6 +69,13 @@ def create_cover_page():
     plt.axis('off')
     return fig
 
+# Pages stream straight into the final report; the cover goes first
+report = ReportBuilder(final_pdf_path).open()
+try:
+    report.add_figure(create_cover_page())
+except Exception as e:
+    print(f"Error creating cover page: {str(e)}")
+
 # Main analysis loop
 for ticker, ipo_date in ipos:
     try:
@@ -122,13 +130,9 @@ for ticker, ipo_date in ipos:
         csv_path = f"data/ipo_returns_{ticker}.csv"
         event_returns.to_csv(csv_path, index=False)
 
-        # Store for comparative analysis
-        all_car_data.append(event_returns[['EventDay', 'CAR']].set_index('EventDay').rename(columns={'CAR': ticker}))
-        all_ar_data.append(event_returns[['EventDay', 'Abnormal']].set_index('EventDay').rename(columns={'Abnormal': ticker}))
-
         # Create PDF for this ticker
         pdf_path = f"plots/ipo_analysis_{ticker}.pdf"
-        with PdfPages(pdf_path) as pdf:
+        with report.section(pdf_path):
             # Plot 1: CAR and AR
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
             ax1.plot(event_returns['EventDay'], event_returns['CAR'], marker='o', label='CAR')
@@ -147,8 +151,7 @@ for ticker, ipo_date in ipos:
             ax2.set_ylabel('AR')
             ax2.grid(True)
             plt.tight_layout()
-            pdf.savefig()
-            plt.close()
+            report.add_figure()
 
             # Plot 2: Volume and Volatility
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
@@ -163,8 +166,7 @@ for ticker, ipo_date in ipos:
             ax2.set_ylabel('Annualized Volatility')
             ax2.grid(True)
             plt.tight_layout()
-            pdf.savefig()
-            plt.close()
+            report.add_figure()
 
             # Plot 3: Beta Evolution
             plt.figure(figsize=(10, 4))
@@ -177,10 +179,11 @@ for ticker, ipo_date in ipos:
             plt.grid(True)
             plt.legend()
             plt.tight_layout()
-            pdf.savefig()
-            plt.close()
+            report.add_figure()
 
-        pdf_paths.append(pdf_path)
+        # Store for comparative analysis only once the ticker's pages are in
+        all_car_data.append(event_returns[['EventDay', 'CAR']].set_index('EventDay').rename(columns={'CAR': ticker}))
+        all_ar_data.append(event_returns[['EventDay', 'Abnormal']].set_index('EventDay').rename(columns={'Abnormal': ticker}))
         print(f"Successfully processed {ticker}")
 
     except Exception as e:
@@ -196,7 +199,7 @@ if all_car_data and all_ar_data:
 
     # Create comparative PDF
     comp_pdf_path = "plots/ipo_comparative_analysis.pdf"
-    with PdfPages(comp_pdf_path) as pdf:
+    with report.section(comp_pdf_path):
         # Plot 1: All CARs
         plt.figure(figsize=(12, 6))
         for ticker in all_car_df.columns:
@@ -209,8 +212,7 @@ if all_car_data and all_ar_data:
         plt.grid(True)
         plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         plt.tight_layout()
-        pdf.savefig()
-        plt.close()
+        report.add_figure()
 
         # Plot 2: AR Heatmap
         plt.figure(figsize=(12, 8))
@@ -219,44 +221,9 @@ if all_car_data and all_ar_data:
         plt.xlabel('Trading Days since IPO')
         plt.ylabel('Company')
         plt.tight_layout()
-        pdf.savefig()
-        plt.close()
+        report.add_figure()
 
-    pdf_paths.append(comp_pdf_path)
     print("Generated comparative analysis PDF")
 
-# Create final merged PDF with cover page
-final_pdf_path = "plots/ipo_event_study_advanced.pdf"
-merger = PdfMerger()
-
-# Add cover page
-cover_pdf = "plots/cover_page.pdf"
-try:
-    with PdfPages(cover_pdf) as pdf:
-        pdf.savefig(create_cover_page())
-        plt.close()
-    merger.append(cover_pdf)
-except Exception as e:
-    print(f"Error creating cover page: {str(e)}")
-
-# Add all individual and comparative PDFs
-for path in pdf_paths:
-    try:
-        merger.append(path)
-    except Exception as e:
-        print(f"Error merging {path}: {str(e)}")
-
-try:
-    merger.write(final_pdf_path)
-    print(f"Advanced IPO event study PDF saved as: {final_pdf_path}")
-except Exception as e:
-    print(f"Error saving final PDF: {str(e)}")
-finally:
-    merger.close()
-
-# Clean up temporary cover page
-if os.path.exists(cover_pdf):
-    try:
-        os.remove(cover_pdf)
-    except Exception as e:
-        print(f"Error removing temporary cover page: {str(e)}")
+report.close()
+print(f"Advanced IPO event study PDF saved as: {final_pdf_path}")
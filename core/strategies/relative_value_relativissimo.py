@@ -8,7 +8,6 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
-from PyPDF2 import PdfMerger
 
 # === Setup project root and centralized plots dir ===
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
@@ -23,6 +22,14 @@ print(f"Adding to sys.path: {os.path.join(PROJECT_ROOT, 'src')}")
 
 # === Add src/ to path ===
 sys.path.append(os.path.join(PROJECT_ROOT, "src"))
+sys.path.insert(0, PROJECT_ROOT)
+from core.utils.report_builder import ReportBuilder
+from core.pairs.analytics import PairPanel
+
+# PNG copies of each pair are opt-in; the merged PDF is the primary output
+EXPORT_PNG = "--png" in sys.argv
+RASTER_DPI = 200
+Z_WINDOWS = [20, 60, 250]
 
 # Debug: Print sys.path before import
 print(f"sys.path: {sys.path}")
@@ -43,12 +50,12 @@ def format_ratio(x, pos):
     return f"{x:.2f}"
 
 # === Adapted stats text for ratio ===
-def get_ratio_stats_text(df, column="ratio"):
+def get_ratio_stats_text(df, column="ratio", zscores=None):
     values = pd.to_numeric(df[column], errors="coerce").dropna()
     if len(values) == 0:
         return "No valid ratio data."
 
-    return (
+    text = (
         f"BuyPolar Metrics\n\n"
         f"Max:        {values.max():.2f}\n"
         f"Min:        {values.min():.2f}\n"
@@ -56,10 +63,13 @@ def get_ratio_stats_text(df, column="ratio"):
         f"Volatility: {values.std():.2f}\n"
         f"Days:       {len(values)}"
     )
+    for window, z in (zscores or {}).items():
+        text += f"\nZ ({window}d):    {z:+.2f}"
+    return text
 
 # === Plot function for dually listed stocks ===
 def plot_dual_stocks(df, title="Stock Prices and Ratio", ticker_a="", ticker_b="", source="Yahoo Finance",
-                     save_pdf=True, filename=None, export_png=True):
+                     save_pdf=True, filename=None, export_png=True, report=None, zscores=None):
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True, gridspec_kw={'height_ratios': [2, 1]})
 
     # Top chart: Stock prices
@@ -92,7 +102,7 @@ def plot_dual_stocks(df, title="Stock Prices and Ratio", ticker_a="", ticker_b="
              fontsize=9, style="italic", color="#333333")
 
     # Metrics box (for ratio) on bottom chart
-    stats_text = get_ratio_stats_text(df, column="ratio")
+    stats_text = get_ratio_stats_text(df, column="ratio", zscores=zscores)
     props = dict(boxstyle="round,pad=0.4", facecolor="white", edgecolor="#cccccc", alpha=0.9)
     ax2.text(0.02, 0.98, stats_text, transform=ax2.transAxes,
              fontsize=9, fontfamily="monospace", verticalalignment='top', bbox=props)
@@ -102,6 +112,12 @@ def plot_dual_stocks(df, title="Stock Prices and Ratio", ticker_a="", ticker_b="
     # Export
     if filename is None:
         filename = "dual_stock_plot.pdf"
+
+    if report is not None:
+        # Stream the page into the shared report instead of a temp PDF
+        report.add_figure(fig, png_name=filename.replace(".pdf", ".png"), export_png=export_png)
+        return
+
     pdf_path = os.path.join(PLOTS_DIR, filename)
 
     if save_pdf:
@@ -153,7 +169,7 @@ stocks = [
 
 start_date = '1990-01-01'
 end_date = '2025-01-01'
-pdf_files = []
+output_pdf = os.path.join(PLOTS_DIR, 'dually_listed_stocks_merged.pdf')
 
 # === Style Setup ===
 set_bpc_style()
@@ -174,42 +190,43 @@ except Exception as e:
     print(f"❌ Failed to download ticker data: {e}")
     sys.exit(1)
 
-# === Main Loop ===
+# === Stack every pair into one panel ===
+pairs, names = [], []
 for stock in stocks:
-    name = stock['name']
-    ticker_a = stock['ticker_a']
-    ticker_b = stock['ticker_b']
-    print(f"📈 Processing {name} ({ticker_a} vs {ticker_b})...")
-
+    ticker_a, ticker_b = stock['ticker_a'], stock['ticker_b']
     # Skip if tickers are identical (e.g., Japan Post)
     if ticker_a == ticker_b:
-        print(f"⚠️ Tickers are identical ({ticker_a} vs {ticker_b}). Skipping...")
+        print(f"⚠️ Tickers are identical ({ticker_a} vs {ticker_b}). Skipping {stock['name']}...")
         continue
-
-    # Extract closing prices for both tickers
-    try:
-        if ticker_a in data and ticker_b in data:
-            price_a = data[ticker_a]['Close']
-            price_b = data[ticker_b]['Close']
-        else:
-            print(f"⚠️ Data not available for {ticker_a} or {ticker_b}. Skipping...")
-            continue
-    except KeyError as e:
-        print(f"⚠️ Error accessing data for {ticker_a} or {ticker_b}: {e}. Skipping...")
+    if ticker_a not in data or ticker_b not in data:
+        print(f"⚠️ Data not available for {ticker_a} or {ticker_b}. Skipping {stock['name']}...")
         continue
+    pairs.append((ticker_a, ticker_b))
+    names.append(stock['name'])
 
-    # Prepare DataFrame
-    df = pd.DataFrame()
-    df['price_a'] = price_a
-    df['price_b'] = price_b
-    df = df.dropna()
+closes = pd.DataFrame({ticker: data[ticker]['Close'] for ticker in {t for pair in pairs for t in pair}})
+panel = PairPanel.from_closes(closes, pairs, names)
 
+# Log-ratio z-scores for every pair and window in one pass: (window, time, pair)
+_, _, z_all = panel.rolling_zscores(Z_WINDOWS)
+
+# === Main Loop ===
+report = ReportBuilder(output_pdf, png_dir=PLOTS_DIR, raster_dpi=RASTER_DPI, bbox_inches="tight").open()
+for j, ((ticker_a, ticker_b), name) in enumerate(zip(panel.pairs, panel.names)):
+    print(f"📈 Processing {name} ({ticker_a} vs {ticker_b})...")
+
+    df = panel.frame(j)
     if df.empty:
         print(f"⚠️ No overlapping data for {ticker_a} and {ticker_b}. Skipping...")
         continue
 
-    # Compute A/B ratio
-    df['ratio'] = df['price_a'] / df['price_b']
+    # Latest z-score per window
+    latest = {}
+    for k, window in enumerate(Z_WINDOWS):
+        z = z_all[k, :, j]
+        z = z[~np.isnan(z)]
+        if len(z):
+            latest[window] = z[-1]
 
     # Plot and save
     filename = f"{ticker_a.replace('.', '_')}_vs_{ticker_b.replace('.', '_')}_relative.pdf"
@@ -218,22 +235,18 @@ for stock in stocks:
         title=f"Dually Listed Stocks: {name}",
         ticker_a=ticker_a,
         ticker_b=ticker_b,
-        filename=filename
+        filename=filename,
+        export_png=EXPORT_PNG,
+        report=report,
+        zscores=latest
     )
-    pdf_files.append(os.path.join(PLOTS_DIR, filename))
-
-# === Merge PDFs ===
-if pdf_files:
-    merger = PdfMerger()
-    for pdf in pdf_files:
-        merger.append(pdf)
-    output_pdf = os.path.join(PLOTS_DIR, 'dually_listed_stocks_merged.pdf')
-    merger.write(output_pdf)
-    merger.close()
-    print(f"\n✅ Merged PDF saved to: {output_pdf}")
 
-    # Optional cleanup
-    for pdf in pdf_files:
-        os.remove(pdf)
+# === Finalize merged PDF ===
+report.close()
+if report.page_count:
+    print(f"\n✅ Merged PDF saved to: {output_pdf}")
 else:
-    print("⚠️ No plots generated.")
\ No newline at end of file
+    # PdfPages only creates the file once a page is saved
+    if os.path.exists(output_pdf):
+        os.remove(output_pdf)
+    print("⚠️ No plots generated.")
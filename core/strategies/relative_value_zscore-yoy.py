@@ -6,6 +6,12 @@ import seaborn as sns
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
 from pathlib import Path
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from core.backtest.kernels import zscore_rebalance, zscore_sweep
+from core.pairs.analytics import rolling_zscores
 
 # ---------------- USER INPUT ----------------
 tickerA = "BRK-A"
@@ -18,6 +24,9 @@ rolling_windows = [10, 20, 30, 60]
 initial_capital = 1e7
 threshold = 1
 output_file = f"plots/dual_arbitrage_facet_{tickerA_safe}_{tickerB_safe}.pdf"
+sweep_start = "2005-01-01"
+sweep_windows = np.arange(5, 121)
+sweep_thresholds = np.round(np.arange(0.25, 3.01, 0.05), 2)
 # --------------------------------------------
 
 # Ensure output folder exists
@@ -34,39 +43,9 @@ prices = pd.concat([data_a, data_b], axis=1).dropna().reset_index()
 prices['year'] = prices['Date'].dt.year
 
 def simulate_strategy(df, colA, colB, threshold, initial_capital):
-    portfolio = pd.DataFrame({'date': df['Date'], 'cash': np.nan, 'A': np.nan, 'B': np.nan, 'value': np.nan})
-    first = df.iloc[0]
-
-    if first['z_score'] > 0:
-        shares_B = np.floor(initial_capital / first[colB])
-        shares_A = 0
-        cash = initial_capital - shares_B * first[colB]
-    else:
-        shares_A = np.floor(initial_capital / first[colA])
-        shares_B = 0
-        cash = initial_capital - shares_A * first[colA]
-
-    for i in range(len(df)):
-        row = df.iloc[i]
-        z = row['z_score']
-        rebalance = (z > threshold and shares_A > 0) or (z < -threshold and shares_B > 0)
-
-        if rebalance:
-            value = shares_A * row[colA] + shares_B * row[colB] + cash
-            cash = value
-            if z > 0:
-                shares_A = 0
-                shares_B = np.floor(cash / row[colB])
-                cash -= shares_B * row[colB]
-            else:
-                shares_B = 0
-                shares_A = np.floor(cash / row[colA])
-                cash -= shares_A * row[colA]
-
-        value = shares_A * row[colA] + shares_B * row[colB] + cash
-        portfolio.loc[i] = [row['Date'], cash, shares_A, shares_B, value]
-
-    return portfolio
+    cash, shares_A, shares_B, value = zscore_rebalance(df[colA].to_numpy(), df[colB].to_numpy(),
+                                                       df['z_score'].to_numpy(), threshold, initial_capital)
+    return pd.DataFrame({'date': df['Date'].to_numpy(), 'cash': cash, 'A': shares_A, 'B': shares_B, 'value': value})
 
 # Generate PDF
 with PdfPages(output_file) as pdf:
@@ -75,14 +54,13 @@ with PdfPages(output_file) as pdf:
         if len(df_year) < max(rolling_windows):
             continue
 
+        # Every window's z-score from one set of cumulative sums
+        ratio = (df_year[tickerA_safe] / df_year[tickerB_safe]).to_numpy()
+        _, _, z_all = rolling_zscores(ratio, rolling_windows)
+
         yearly_results = []
-        for win in rolling_windows:
-            df = df_year.copy()
-            df['ratio'] = df[tickerA_safe] / df[tickerB_safe]
-            df['roll_mean'] = df['ratio'].rolling(window=win).mean()
-            df['roll_sd'] = df['ratio'].rolling(window=win).std()
-            df['z_score'] = (df['ratio'] - df['roll_mean']) / df['roll_sd']
-            df = df.dropna()
+        for k, win in enumerate(rolling_windows):
+            df = df_year.assign(z_score=z_all[k, :, 0]).dropna()
 
             if len(df) < win:
                 continue
@@ -120,4 +98,21 @@ with PdfPages(output_file) as pdf:
         pdf.savefig(g.fig, bbox_inches='tight')
         plt.close()
 
-
+# Full-history parameter sweep: python relative_value_zscore-yoy.py --sweep
+if "--sweep" in sys.argv:
+    hist_a = yf.download(tickerA, start=sweep_start, end=end_date, auto_adjust=False)['Adj Close']
+    hist_b = yf.download(tickerB, start=sweep_start, end=end_date, auto_adjust=False)['Adj Close']
+    hist = pd.concat([hist_a, hist_b], axis=1).dropna()
+    final, drawdown, trades = zscore_sweep(hist.iloc[:, 0].to_numpy(), hist.iloc[:, 1].to_numpy(),
+                                           sweep_windows, sweep_thresholds, initial_capital)
+    sweep = pd.DataFrame({
+        'window': np.repeat(sweep_windows, len(sweep_thresholds)),
+        'threshold': np.tile(sweep_thresholds, len(sweep_windows)),
+        'final_value': final.ravel(),
+        'max_drawdown': drawdown.ravel(),
+        'rebalances': trades.ravel(),
+    })
+    sweep_file = f"plots/dual_arbitrage_sweep_{tickerA_safe}_{tickerB_safe}.csv"
+    sweep.to_csv(sweep_file, index=False)
+    print(f"Swept {len(sweep)} (window, threshold) pairs over {len(hist)} days -> {sweep_file}")
+    print(sweep.nlargest(10, 'final_value').to_string(index=False))
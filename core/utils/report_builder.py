@@ -0,0 +1,184 @@
+"""
+Streaming PDF report builder.
+
+Pages are appended to a single PdfPages stream as soon as each figure is
+drawn, so multi-section reports no longer need one temporary PDF per section
+followed by a PyPDF2 merge. PNG export is opt-in per report (or per figure)
+and heavy line plots are rasterized at a configurable DPI to keep the output
+small enough for the website.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+# Lines with more points than this are drawn as an embedded bitmap
+DEFAULT_RASTER_THRESHOLD = 5000
+DEFAULT_RASTER_DPI = 150
+DEFAULT_PNG_DPI = 300
+
+
+def rasterize_heavy_artists(fig, threshold=DEFAULT_RASTER_THRESHOLD):
+    """Mark every line with more than `threshold` points as rasterized"""
+    count = 0
+    for ax in fig.get_axes():
+        for line in ax.get_lines():
+            if len(line.get_xdata(orig=False)) > threshold:
+                line.set_rasterized(True)
+                count += 1
+        for collection in ax.collections:
+            paths = collection.get_paths()
+            n_points = sum(len(p.vertices) for p in paths)
+            if n_points > threshold:
+                collection.set_rasterized(True)
+                count += 1
+    return count
+
+
+class ReportBuilder:
+    """Append matplotlib figures to one PDF incrementally.
+
+    Usage:
+        with ReportBuilder("plots/report.pdf") as report:
+            report.add_figure(fig)
+
+    Figures are written and closed immediately, so peak memory is one figure
+    regardless of the number of pages (one section's figures inside
+    `section()`).
+    """
+
+    def __init__(self, output_path, png_dir=None, png_dpi=DEFAULT_PNG_DPI,
+                 raster_dpi=DEFAULT_RASTER_DPI, raster_threshold=DEFAULT_RASTER_THRESHOLD,
+                 metadata=None, bbox_inches=None):
+        self.output_path = Path(output_path)
+        self.png_dir = Path(png_dir) if png_dir else None
+        self.png_dpi = png_dpi
+        self.raster_dpi = raster_dpi
+        self.raster_threshold = raster_threshold
+        self.metadata = metadata or {}
+        self.bbox_inches = bbox_inches
+        self.page_count = 0
+        self._pdf = None
+        self._sections = []
+        # (figure, png_name, export_png) held back until their section completes
+        self._pending = []
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def open(self):
+        """Open the output stream (called automatically by the context manager)"""
+        if self._pdf is None:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._pdf = PdfPages(self.output_path, metadata=self.metadata)
+        return self
+
+    def close(self):
+        """Finalize the PDF; safe to call more than once"""
+        for fig, _, _ in self._pending:
+            plt.close(fig)
+        self._pending = []
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    @contextmanager
+    def section(self, path):
+        """Also copy pages added inside this block to a standalone PDF.
+
+        Used where the gallery still wants a per-item PDF next to the
+        combined report. The section is all-or-nothing: its figures are held
+        until the block completes and only then written to the combined
+        report, and the standalone PDF is replaced atomically. If the block
+        raises, its pages are dropped from both and the previous standalone
+        PDF (if any) is left untouched.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        pdf = PdfPages(tmp_path)
+        first_pending = len(self._pending)
+        self._sections.append(pdf)
+        try:
+            yield pdf
+        except BaseException:
+            self._sections.remove(pdf)
+            pdf.close()
+            tmp_path.unlink(missing_ok=True)
+            for fig, _, _ in self._pending[first_pending:]:
+                plt.close(fig)
+            del self._pending[first_pending:]
+            raise
+        self._sections.remove(pdf)
+        pdf.close()
+        os.replace(tmp_path, path)
+        if not self._sections:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        pending, self._pending = self._pending, []
+        for fig, png_name, export_png in pending:
+            self._write_page(fig, png_name, export_png, close=True)
+
+    def add_figure(self, fig=None, png_name=None, export_png=None, close=True):
+        """Render `fig` (default: current figure) as the next page.
+
+        A PNG copy is written only when `export_png` is True, or when it is
+        None and both `png_dir` and `png_name` are set. Inside `section()`
+        the page is written to the section PDF now and to the combined
+        report when the section completes (`close` is then implied).
+        """
+        if self._pdf is None:
+            self.open()
+        if fig is None:
+            fig = plt.gcf()
+
+        if self.raster_threshold:
+            rasterize_heavy_artists(fig, self.raster_threshold)
+
+        if self._sections:
+            save_kwargs = self._save_kwargs()
+            for section in self._sections:
+                section.savefig(fig, **save_kwargs)
+            self._pending.append((fig, png_name, export_png))
+            return self.page_count + len(self._pending)
+        return self._write_page(fig, png_name, export_png, close)
+
+    def _save_kwargs(self):
+        save_kwargs = {"dpi": self.raster_dpi}
+        if self.bbox_inches:
+            save_kwargs["bbox_inches"] = self.bbox_inches
+        return save_kwargs
+
+    def _write_page(self, fig, png_name, export_png, close):
+        self._pdf.savefig(fig, **self._save_kwargs())
+        self.page_count += 1
+
+        if export_png is None:
+            export_png = self.png_dir is not None and png_name is not None
+        if export_png:
+            self._save_png(fig, png_name)
+
+        if close:
+            plt.close(fig)
+        return self.page_count
+
+    def _save_png(self, fig, png_name):
+        png_dir = self.png_dir or self.output_path.parent
+        png_dir.mkdir(parents=True, exist_ok=True)
+        if png_name is None:
+            png_name = f"{self.output_path.stem}_p{self.page_count}.png"
+        png_path = png_dir / png_name
+        fig.savefig(png_path, bbox_inches="tight", dpi=self.png_dpi)
+        print(f"✅ Saved PNG to: {png_path}")
+        return png_path
+
+    def __repr__(self):
+        return f"ReportBuilder({os.fspath(self.output_path)!r}, pages={self.page_count})"
@@ -1,10 +1,30 @@
+"""
+Build the dashboard market tables.
+
+All categories are fetched with one batched yf.download over the union of
+their tickers (30 days, daily). The download is cached under data/cache for
+CACHE_MAX_AGE seconds, so re-running the build within that window does not
+touch the network. The 1D-return table and the 30-day history of every
+category are derived from the same long frame with groupby/melt, and the
+category CSVs are written concurrently.
+
+Usage:
+    python build_data_v2_1_1.py
+    python build_data_v2_1_1.py --refresh
+"""
+
+import argparse
+import hashlib
 import os
-import yfinance as yf
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
 # --- Setup paths ---
 base_dir = os.path.dirname(__file__)
 data_dir = os.path.join(base_dir, "data")
+cache_dir = os.path.join(data_dir, "cache")
 
 categories = {
     "indices": ['SPY', 'QQQ', 'DIA', 'VTI', 'EFA'],  # Replacing ^GSPC etc with ETF proxies
@@ -13,73 +33,123 @@ categories = {
     "fixed_income": ['TLT', 'IEF', 'BND', 'SHY', 'LQD']
 }
 
-os.makedirs(data_dir, exist_ok=True)
+HISTORY_PERIOD = "30d"
+CACHE_MAX_AGE = 15 * 60
+
 
 # --- Helpers ---
-def download_and_clean(tickers):
-    df = yf.download(tickers, period="7d", interval="1d", auto_adjust=False, progress=False)
-    results = []
+def all_tickers(groups=categories):
+    """Union of every category's tickers, in first-seen order"""
+    return list(dict.fromkeys(t for tickers in groups.values() for t in tickers))
+
+
+def _cache_path(tickers, period):
+    key = hashlib.sha1(f"{period}|{','.join(sorted(tickers))}".encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"prices_{key}.parquet")
+
+
+def _to_long(wide, tickers, value_name):
+    """date x ticker frame -> long (date, ticker, value) frame"""
+    wide = wide.reindex(columns=tickers).rename_axis(index="date", columns="ticker")
+    return wide.reset_index().melt(id_vars="date", var_name="ticker", value_name=value_name)
+
+
+def download_prices(tickers, period=HISTORY_PERIOD, refresh=False):
+    """Long frame (date, ticker, close, adj_close) for all tickers from one batched download"""
+    path = _cache_path(tickers, period)
+    if not refresh and os.path.exists(path) and time.time() - os.path.getmtime(path) < CACHE_MAX_AGE:
+        print(f"⏩ Using cached prices ({os.path.basename(path)})")
+        return pd.read_parquet(path)
+
+    import yfinance as yf
+
+    print(f"📥 Downloading {len(tickers)} tickers ({period})...")
+    df = yf.download(tickers, period=period, interval="1d", auto_adjust=False, progress=False)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["date", "ticker", "close", "adj_close"])
+    if not isinstance(df.columns, pd.MultiIndex):
+        df.columns = pd.MultiIndex.from_product([df.columns, tickers[:1]])
+
+    adj_field = "Adj Close" if "Adj Close" in df.columns.get_level_values(0) else "Close"
+    prices = _to_long(df["Close"], tickers, "close")
+    prices["adj_close"] = _to_long(df[adj_field], tickers, "adj_close")["adj_close"].to_numpy()
+    prices["date"] = pd.to_datetime(prices["date"]).dt.tz_localize(None)
+    prices = prices.dropna(subset=["close"]).sort_values(["ticker", "date"], kind="stable")
+    prices = prices.reset_index(drop=True)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    prices.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return prices
 
-    for ticker in tickers:
-        try:
-            closes = df['Close'][ticker] if isinstance(df.columns, pd.MultiIndex) else df['Close']
-            closes = closes.dropna()
-            if len(closes) < 2:
-                print(f"[⚠] Skipping {ticker} — not enough valid data.")
-                continue
-            today_val = closes.iloc[-1]
-            yesterday_val = closes.iloc[-2]
-            change_pct = (today_val / yesterday_val - 1) * 100
-
-            results.append({
-                "name": ticker,
-                "1D_return": f"{change_pct:.2f}%"
-            })
 
+def daily_returns(prices, tickers):
+    """name / 1D_return table from the last two valid closes of each ticker"""
+    last_two = prices[prices["ticker"].isin(tickers)].groupby("ticker").tail(2)
+    closes = last_two.groupby("ticker")["close"]
+    change_pct = (closes.last() / closes.first() - 1) * 100
+    change_pct = change_pct[closes.size() == 2].reindex(tickers)
+
+    for ticker in change_pct.index[change_pct.isna()]:
+        print(f"[⚠] Skipping {ticker} — not enough valid data.")
+    change_pct = change_pct.dropna()
+    return pd.DataFrame({"name": change_pct.index,
+                         "1D_return": [f"{value:.2f}%" for value in change_pct]})
+
+
+def price_history(prices, tickers):
+    """Long (date, ticker, price) adjusted-close history for `tickers`"""
+    history = prices.loc[prices["ticker"].isin(tickers), ["date", "ticker", "adj_close"]]
+    history = history.rename(columns={"adj_close": "price"}).dropna()
+    order = {ticker: i for i, ticker in enumerate(tickers)}
+    return history.sort_values(["ticker", "date"], kind="stable",
+                               key=lambda col: col.map(order) if col.name == "ticker" else col)
+
+
+def write_group(group, tickers, prices):
+    """Write {group}.csv (1D returns) and {group}_history.csv for one category"""
+    group_path = os.path.join(data_dir, group)
+    os.makedirs(group_path, exist_ok=True)
+
+    daily_df = daily_returns(prices, tickers)
+    if not daily_df.empty:
+        daily_path = os.path.join(group_path, f"{group}.csv")
+        daily_df.to_csv(daily_path, index=False, sep=';')
+        print(f"✅ Saved {group} to {os.path.basename(daily_path)}")
+    else:
+        print(f"[❌] No valid data found for {group} — skipping file.")
+
+    hist_df = price_history(prices, tickers)
+    if not hist_df.empty:
+        hist_df.to_csv(os.path.join(group_path, f"{group}_history.csv"), index=False)
+        print(f"✅ Saved historical {group}")
+    else:
+        print(f"[⚠] No historical data for {group}")
+
+
+def build(groups=categories, refresh=False):
+    """One download for every group, then all category CSVs written in parallel"""
+    os.makedirs(data_dir, exist_ok=True)
+    prices = download_prices(all_tickers(groups), refresh=refresh)
+
+    with ThreadPoolExecutor(max_workers=len(groups) or 1) as executor:
+        futures = {group: executor.submit(write_group, group, tickers, prices)
+                   for group, tickers in groups.items()}
+    for group, future in futures.items():
+        try:
+            future.result()
         except Exception as e:
-            print(f"[⚠] Skipping {ticker} — {e}")
-            continue
-
-    return pd.DataFrame(results)
-
-
-def download_history(tickers):
-    df = yf.download(tickers, period="30d", interval="1d", auto_adjust=True, progress=False)
-    try:
-        if isinstance(df.columns, pd.MultiIndex):
-            df = df['Close']
-    except Exception:
-        pass
-    df = df.reset_index().melt(id_vars='Date', var_name='ticker', value_name='price')
-    df = df.dropna()
-    df = df.rename(columns={"Date": "date"})
-    return df
-
-
-# --- Main Loop: Save 1D return & history ---
-for group, tickers in categories.items():
-    print(f"🔄 Downloading {group}...")
-    try:
-        daily_df = download_and_clean(tickers)
-        if not daily_df.empty:
-            group_path = os.path.join(data_dir, group)
-            os.makedirs(group_path, exist_ok=True)
-            daily_path = os.path.join(group_path, f"{group}.csv")
-            daily_df.to_csv(daily_path, index=False, sep=';')
-            print(f"✅ Saved {group} to {os.path.basename(daily_path)}")
-        else:
-            print(f"[❌] No valid data found for {group} — skipping file.")
-    except Exception as e:
-        print(f"[‼️] Unexpected error for {group}: {e}")
-
-    print(f"📈 Saving 30-day history for {group}...")
-    try:
-        hist_df = download_history(tickers)
-        if not hist_df.empty:
-            history_path = os.path.join(data_dir, group, f"{group}_history.csv")
-            hist_df.to_csv(history_path, index=False)
-            print(f"✅ Saved historical {group}")
-        else:
-            print(f"[⚠] No historical data for {group}")
-    except Exception as e:
-        print(f"[⚠] Could not download history for {group}: {e}")
+            print(f"[‼️] Unexpected error for {group}: {e}")
+    return prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the dashboard market tables")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached download")
+    args = parser.parse_args()
+    build(refresh=args.refresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
-import os
-import sys
+"""
+Morning one-pager built with reportlab from cached sections.
+
+Every section (indices, commodities, crypto, fixed income, signals) is a
+unit keyed by the sha256 of the CSVs it reads. A section's table rows and
+chart path are stored in report_outputs/cache/sections/; its chart is
+rendered into report_outputs/cache/charts/ under the same key. On each run
+only sections whose inputs changed are re-read, and their charts are
+rendered in parallel worker processes. The document is then assembled
+from the cached specs.
+
+Usage:
+    python generate_report_reportlab_1_1.py
+    python generate_report_reportlab_1_1.py --rebuild
+"""
+
+import argparse
 import datetime
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
 from reportlab.platypus import (
-    BaseDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak, Frame, PageTemplate
+    BaseDocTemplate, Frame, Image, PageBreak, PageTemplate, Paragraph, Spacer, Table, TableStyle
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-from plotting.plotting import plot_prices, set_bpc_style
 
 # --- Setup ---
 base_dir = os.path.dirname(__file__)
@@ -19,50 +37,166 @@ output_dir = os.path.join(base_dir, 'report_outputs')
 data_dir = os.path.join(base_dir, 'data')
 summary_dir = os.path.join(data_dir, 'summary')
 signals_dir = os.path.join(data_dir, 'signals')
-plot_dir = os.path.abspath(os.path.join(base_dir, '..', 'plots'))
-os.makedirs(output_dir, exist_ok=True)
+cache_dir = os.path.join(output_dir, 'cache')
+CACHE_VERSION = 1
 
-today = datetime.date.today().isoformat()
+SECTIONS = [
+    ("indices", "📊 Major Indices"),
+    ("commodities", "🛢 Commodities"),
+    ("crypto", "🪙 Crypto"),
+    ("fixed_income", "💰 Fixed Income"),
+]
 
+
+# --- Inputs ---
 def load_data(path):
     if not os.path.exists(path):
         print(f"[⚠] Skipping missing file: {path}")
         return []
     return pd.read_csv(path, sep=';').to_dict(orient='records')
 
-# Load datasets
-indices = load_data(os.path.join(data_dir, 'indices', 'indices.csv'))
-commodities = load_data(os.path.join(data_dir, 'commodities', 'commodities.csv'))
-crypto = load_data(os.path.join(data_dir, 'crypto', 'crypto.csv'))
-fixed_income = load_data(os.path.join(data_dir, 'fixed_income', 'fixed_income.csv'))
-signals = load_data(os.path.join(signals_dir, 'signals.csv'))
-
-# Load LLM summary
-summary_path = os.path.join(summary_dir, 'summary.csv')
-summary = pd.read_csv(summary_path, sep=';').iloc[0] if os.path.exists(summary_path) else {"commentary": ""}
-
-# --- Style ---
-styles = getSampleStyleSheet()
-section_style = styles['Heading2']
-body_style = ParagraphStyle(name='Body', fontSize=8, leading=10)
-content = []
-
-# --- PDF Init ---
-doc = BaseDocTemplate(
-    os.path.join(output_dir, f"morning_report_{today}.pdf"),
-    pagesize=letter,
-    leftMargin=0.5 * inch,
-    rightMargin=0.5 * inch,
-    topMargin=0.5 * inch,
-    bottomMargin=0.5 * inch,
-)
-frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
-doc.addPageTemplates([PageTemplate(id='basic', frames=frame)])
 
-# --- Helpers ---
-def make_table(data, headers):
-    table_data = [headers] + [[row.get("name", ""), row.get("1D_return", row.get("return", ""))] for row in data]
-    table = Table(table_data)
+def section_inputs(name):
+    if name == "signals":
+        return [os.path.join(signals_dir, 'signals.csv')]
+    return [os.path.join(data_dir, name, f"{name}.csv"), os.path.join(data_dir, name, f"{name}_history.csv")]
+
+
+def inputs_hash(paths):
+    """sha256 over the contents of `paths` (missing files hash as absent)"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        if not os.path.exists(path):
+            digest.update(b"\0missing")
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+# --- Charts (run in worker processes) ---
+def render_chart(job):
+    """Render one cached chart PNG; `job` is (kind, csv path, out path, title)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    kind, csv_path, out_path, title = job
+    plt.rcParams.update({"axes.grid": True, "grid.color": "#cccccc", "grid.linewidth": 0.25,
+                         "axes.edgecolor": "#cccccc", "axes.titleweight": "bold", "legend.frameon": False})
+    fig, ax = plt.subplots(figsize=(8, 2.5))
+    if kind == "trend":
+        df = pd.read_csv(csv_path, parse_dates=['date'])
+        df['price'] = pd.to_numeric(df['price'], errors='coerce')
+        prices = df.pivot_table(index='date', columns='ticker', values='price', aggfunc='last').sort_index()
+        # Rebased to 100 so tickers with different price levels share one axis
+        rebased = prices / prices.bfill().iloc[0] * 100
+        rebased.plot(ax=ax, linewidth=1.0)
+        ax.set_ylabel("Rebased (100)")
+        ax.legend(fontsize=7, ncol=len(rebased.columns))
+    else:
+        df = pd.read_csv(csv_path, sep=';')
+        df['return'] = pd.to_numeric(df['return'], errors='coerce')
+        df = df.dropna(subset=['return']).sort_values('return')
+        palette = {"BUY": "#2e7d32", "SELL": "#c62828"}
+        ax.barh(df['name'], df['return'], color=[palette.get(s, "#9e9e9e") for s in df['signal']])
+        ax.set_xlabel("1D return (%)")
+        ax.tick_params(axis='y', labelsize=6)
+    ax.set_title(title)
+    fig.tight_layout()
+    tmp_path = out_path + ".tmp.png"
+    fig.savefig(tmp_path, dpi=150)
+    plt.close(fig)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+# --- Section cache ---
+def _section_path(name, key):
+    return os.path.join(cache_dir, 'sections', f"{name}-{key}.json")
+
+
+def _chart_path(name, key):
+    return os.path.join(cache_dir, 'charts', f"{name}-{key}.png")
+
+
+def build_section(name, title, key):
+    """Read one section's inputs into a JSON-able spec and its chart job (None if no chart)"""
+    if name == "signals":
+        rows = load_data(section_inputs(name)[0])
+        spec = {"title": "📈 Signal Selection", "headers": ["Name", "Signal", "Return"],
+                "rows": [[r.get("name", ""), r.get("signal", ""), r.get("return", "")] for r in rows]}
+        job = ("signals", section_inputs(name)[0], _chart_path(name, key), "1D Return by Signal") if rows else None
+    else:
+        table_path, history_path = section_inputs(name)
+        rows = load_data(table_path)
+        spec = {"title": title, "headers": ["Name", "1D_Return"],
+                "rows": [[r.get("name", ""), r.get("1D_return", "")] for r in rows],
+                "records": rows}
+        job = None
+        if rows and os.path.exists(history_path):
+            job = ("trend", history_path, _chart_path(name, key), f"{name.replace('_', ' ').title()} Price Trend")
+        elif rows:
+            print(f"[⚠] Missing price data for {name}")
+    spec["chart"] = job[2] if job else None
+    return spec, job
+
+
+def _write_spec(path, spec):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(spec, f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+
+
+def _prune(directory, name, keep):
+    """Drop cached files of section `name` other than `keep`"""
+    if not os.path.isdir(directory):
+        return
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry.startswith(f"{name}-") and path != keep:
+            os.remove(path)
+
+
+def section_specs(rebuild=False, workers=None):
+    """{section: spec}; only sections with changed inputs are rebuilt, charts in parallel"""
+    specs, jobs, rebuilt = {}, [], []
+    for name, title in SECTIONS + [("signals", None)]:
+        key = inputs_hash(section_inputs(name))
+        path = _section_path(name, key)
+        if not rebuild and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                spec = json.load(f)
+            if spec["chart"] is None or os.path.exists(spec["chart"]):
+                specs[name] = spec
+                continue
+        spec, job = build_section(name, title, key)
+        specs[name] = spec
+        rebuilt.append((name, path))
+        if job:
+            jobs.append(job)
+
+    if jobs:
+        os.makedirs(os.path.join(cache_dir, 'charts'), exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as executor:
+            list(executor.map(render_chart, jobs))
+
+    for name, path in rebuilt:
+        _write_spec(path, specs[name])
+        _prune(os.path.join(cache_dir, 'sections'), name, path)
+        _prune(os.path.join(cache_dir, 'charts'), name, specs[name]["chart"])
+    print(f"📦 Sections rebuilt: {', '.join(n for n, _ in rebuilt) or 'none'} "
+          f"({len(jobs)} charts rendered)")
+    return specs
+
+
+# --- Assembly ---
+def make_table(headers, rows):
+    table = Table([headers] + rows)
     table.setStyle(TableStyle([
         ('FONTSIZE', (0, 0), (-1, -1), 8),
         ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
@@ -70,76 +204,94 @@ def make_table(data, headers):
     ]))
     return table
 
-def load_price_csv(asset):
-    path = os.path.join(data_dir, asset, f"{asset}_history.csv")
-    if not os.path.exists(path):
-        print(f"[⚠] Missing price data for {asset}")
-        return None
-    df = pd.read_csv(path)
-    df['date'] = pd.to_datetime(df['date'])
-    df['price'] = pd.to_numeric(df['price'], errors='coerce')
-    return df
-
-def add_section(title, dataset, asset_key):
-    if not dataset:
-        return
-    content.append(Paragraph(title, section_style))
-    content.append(make_table(dataset, ["Name", "1D_Return"]))
-    df = load_price_csv(asset_key)
-    if df is not None:
-        plot_prices(df, title=f"{asset_key.title()} Price Trend", filename=f"{asset_key}_trend.png",
-                    save_pdf=False, export_png=True, show=False)
-        plot_path = os.path.join(plot_dir, f"{asset_key}_trend.png")
-        content.append(Image(plot_path, width=doc.width, height=2.5 * inch))
-    content.append(PageBreak())
-
-# --- Title ---
-content.append(Paragraph(f"<b>📈 BuyPolar Capital Global One-Pager — {today}</b>", styles['Heading1']))
-content.append(Spacer(1, 0.1 * inch))
 
-# --- Gainers & Losers ---
 def get_top_movers(*datasets, top_n=3):
     combined = []
     for dataset in datasets:
         for row in dataset:
             try:
                 ret = float(str(row['1D_return']).replace('%', '').replace(',', '.'))
-                combined.append({'name': row['name'], 'return': ret})
+                combined.append([row['name'], ret])
             except Exception:
                 continue
-    sorted_combined = sorted(combined, key=lambda x: x['return'], reverse=True)
+    sorted_combined = sorted(combined, key=lambda x: x[1], reverse=True)
     return sorted_combined[:top_n], sorted_combined[-top_n:][::-1]
 
-gainers, losers = get_top_movers(indices, commodities, crypto, fixed_income)
-content.append(Paragraph("🏆 Top Gainers", section_style))
-content.append(make_table(gainers, ["Name", "Return (%)"]))
-content.append(Spacer(1, 0.1 * inch))
-content.append(Paragraph("💔 Top Losers", section_style))
-content.append(make_table(losers, ["Name", "Return (%)"]))
-content.append(PageBreak())
-
-# --- Sections ---
-add_section("📊 Major Indices", indices, "indices")
-add_section("🛢 Commodities", commodities, "commodities")
-add_section("🪙 Crypto", crypto, "crypto")
-add_section("💰 Fixed Income", fixed_income, "fixed_income")
-
-# --- Commentary ---
-if summary.get("commentary"):
-    content.append(Paragraph("🧠 LLM Commentary", section_style))
-    clean_text = summary["commentary"].replace("#", "").replace("&", "and")
-    content.append(Paragraph(clean_text, body_style))
+
+def build_report(rebuild=False):
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    today = datetime.date.today().isoformat()
+    specs = section_specs(rebuild=rebuild)
+
+    summary_path = os.path.join(summary_dir, 'summary.csv')
+    summary = pd.read_csv(summary_path, sep=';').iloc[0] if os.path.exists(summary_path) else {"commentary": ""}
+
+    styles = getSampleStyleSheet()
+    section_style = styles['Heading2']
+    body_style = ParagraphStyle(name='Body', fontSize=8, leading=10)
+
+    doc = BaseDocTemplate(
+        os.path.join(output_dir, f"morning_report_{today}.pdf"),
+        pagesize=letter,
+        leftMargin=0.5 * inch,
+        rightMargin=0.5 * inch,
+        topMargin=0.5 * inch,
+        bottomMargin=0.5 * inch,
+    )
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    doc.addPageTemplates([PageTemplate(id='basic', frames=frame)])
+
+    content = [Paragraph(f"<b>📈 BuyPolar Capital Global One-Pager — {today}</b>", styles['Heading1']),
+               Spacer(1, 0.1 * inch)]
+
+    # --- Gainers & Losers ---
+    gainers, losers = get_top_movers(*(specs[name].get("records", []) for name, _ in SECTIONS))
+    content.append(Paragraph("🏆 Top Gainers", section_style))
+    content.append(make_table(["Name", "Return (%)"], gainers))
+    content.append(Spacer(1, 0.1 * inch))
+    content.append(Paragraph("💔 Top Losers", section_style))
+    content.append(make_table(["Name", "Return (%)"], losers))
     content.append(PageBreak())
 
-# --- Signals ---
-if signals:
-    content.append(Paragraph("📈 Signal Selection", section_style))
-    content.append(make_table(signals, ["Name", "Signal", "Return"]))
-    grid_plot = os.path.join(plot_dir, "grid_returns.png")
-    if os.path.exists(grid_plot):
-        content.append(Image(grid_plot, width=doc.width, height=2 * inch))
-
-# --- Finalize PDF ---
-set_bpc_style()
-doc.build(content)
-print(f"✅ Report saved to {doc.filename}")
+    # --- Sections ---
+    for name, _ in SECTIONS:
+        spec = specs[name]
+        if not spec["rows"]:
+            continue
+        content.append(Paragraph(spec["title"], section_style))
+        content.append(make_table(spec["headers"], spec["rows"]))
+        if spec["chart"]:
+            content.append(Image(spec["chart"], width=doc.width, height=2.5 * inch))
+        content.append(PageBreak())
+
+    # --- Commentary ---
+    if summary.get("commentary"):
+        content.append(Paragraph("🧠 LLM Commentary", section_style))
+        clean_text = str(summary["commentary"]).replace("#", "").replace("&", "and")
+        content.append(Paragraph(clean_text, body_style))
+        content.append(PageBreak())
+
+    # --- Signals ---
+    spec = specs["signals"]
+    if spec["rows"]:
+        content.append(Paragraph(spec["title"], section_style))
+        content.append(make_table(spec["headers"], spec["rows"]))
+        if spec["chart"]:
+            content.append(Image(spec["chart"], width=doc.width, height=2.5 * inch))
+
+    # --- Finalize PDF ---
+    doc.build(content)
+    print(f"✅ Report saved to {doc.filename} in {time.perf_counter() - started:.1f}s")
+    return doc.filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the morning one-pager PDF")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore cached sections and charts")
+    args = parser.parse_args()
+    build_report(rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,133 @@
-import pandas as pd
+"""
+Threshold signals for every dashboard asset class.
+
+Each asset class has a (buy, sell) threshold on the 1-day return in
+percent: above buy is BUY, below sell is SELL, anything else HOLD. The
+rules are applied with np.select to whole columns: once to today's
+1D_return tables, and once to the date x ticker return panel built from the
+30-day histories, which gives a signal time series per instrument.
+
+Outputs (data/signals/):
+    signals.parquet / signals.csv   today's snapshot (the CSV feeds the report)
+    signal_history.parquet          date, name, asset_class, return, signal
+
+Usage:
+    python generate_signals_1_1.py
+"""
+
 import os
 
+import numpy as np
+import pandas as pd
+
 # --- Setup ---
 base_dir = os.path.dirname(__file__)
 data_dir = os.path.join(base_dir, 'data')
 signals_dir = os.path.join(data_dir, 'signals')
-os.makedirs(signals_dir, exist_ok=True)
-
-# --- Load index data ---
-indices_path = os.path.join(data_dir, 'indices', 'major_indices.csv')
-df = pd.read_csv(indices_path, sep=';')
-
-# --- Generate simple signals ---
-signals = []
-for _, row in df.iterrows():
-    val = float(row['1D_return'])
-    signal = "BUY" if val > 1 else ("SELL" if val < -1 else "HOLD")
-    signals.append({
-        "name": row["name"],
-        "signal": signal,
-        "return": val
+
+# 1D return thresholds in percent: (buy above, sell below)
+THRESHOLDS = pd.DataFrame(
+    [("indices", 1.0, -1.0),
+     ("commodities", 1.5, -1.5),
+     ("crypto", 3.0, -3.0),
+     ("fixed_income", 0.5, -0.5)],
+    columns=["asset_class", "buy", "sell"],
+).set_index("asset_class")
+
+SIGNALS = np.array(["BUY", "SELL", "HOLD"])
+
+
+def apply_rules(returns, buy, sell):
+    """BUY/SELL/HOLD for an array of returns; thresholds broadcast against it"""
+    returns = np.asarray(returns, dtype=np.float64)
+    choice = np.select([returns > buy, returns < sell], [0, 1], default=2)
+    signals = SIGNALS[choice].astype(object)
+    signals[np.isnan(returns)] = None
+    return signals
+
+
+def parse_returns(values):
+    """'1.23%' / '1,23' / 1.23 -> float percent, NaN when unparseable"""
+    text = pd.Series(values).astype(str).str.replace('%', '', regex=False).str.replace(',', '.', regex=False)
+    return pd.to_numeric(text, errors='coerce').to_numpy()
+
+
+def load_snapshot(groups=THRESHOLDS.index):
+    """name / asset_class / return from each category's 1D_return table"""
+    frames = []
+    for group in groups:
+        path = os.path.join(data_dir, group, f"{group}.csv")
+        if not os.path.exists(path):
+            print(f"[⚠] Skipping missing file: {path}")
+            continue
+        df = pd.read_csv(path, sep=';')
+        frames.append(pd.DataFrame({"name": df["name"], "asset_class": group,
+                                    "return": parse_returns(df["1D_return"])}))
+    if not frames:
+        return pd.DataFrame(columns=["name", "asset_class", "return"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_return_panel(groups=THRESHOLDS.index):
+    """(date x ticker daily returns in percent, ticker -> asset class) from the history CSVs"""
+    frames = []
+    for group in groups:
+        path = os.path.join(data_dir, group, f"{group}_history.csv")
+        if not os.path.exists(path):
+            print(f"[⚠] Missing price data for {group}")
+            continue
+        history = pd.read_csv(path, parse_dates=["date"])
+        history["asset_class"] = group
+        frames.append(history)
+    if not frames:
+        return pd.DataFrame(), pd.Series(dtype=object)
+
+    history = pd.concat(frames, ignore_index=True).dropna(subset=["price"])
+    history = history.drop_duplicates(["date", "ticker"], keep="last").sort_values(["ticker", "date"])
+    # Returns are taken over each instrument's own trading days (crypto also trades weekends)
+    history["return"] = history.groupby("ticker")["price"].pct_change(fill_method=None) * 100
+    returns = history.pivot(index="date", columns="ticker", values="return").sort_index()
+    classes = history.drop_duplicates("ticker").set_index("ticker")["asset_class"].reindex(returns.columns)
+    return returns, classes
+
+
+def snapshot_signals(snapshot):
+    thresholds = THRESHOLDS.reindex(snapshot["asset_class"])
+    out = snapshot.copy()
+    out["signal"] = apply_rules(out["return"], thresholds["buy"].to_numpy(), thresholds["sell"].to_numpy())
+    return out[["name", "signal", "return", "asset_class"]]
+
+
+def signal_history(returns, classes):
+    """Long signal time series over the whole return panel"""
+    if returns.empty:
+        return pd.DataFrame(columns=["date", "name", "asset_class", "return", "signal"])
+    thresholds = THRESHOLDS.reindex(classes.to_numpy())
+    signals = apply_rules(returns.to_numpy(), thresholds["buy"].to_numpy(), thresholds["sell"].to_numpy())
+
+    n_dates, n_tickers = returns.shape
+    out = pd.DataFrame({
+        "date": np.repeat(returns.index.to_numpy(), n_tickers),
+        "name": np.tile(returns.columns.to_numpy(), n_dates),
+        "asset_class": np.tile(classes.to_numpy(), n_dates),
+        "return": returns.to_numpy().ravel(),
+        "signal": signals.ravel(),
     })
+    return out.dropna(subset=["return"]).reset_index(drop=True)
+
+
+def main():
+    os.makedirs(signals_dir, exist_ok=True)
+
+    signals_df = snapshot_signals(load_snapshot())
+    signals_df.to_parquet(os.path.join(signals_dir, "signals.parquet"), index=False)
+    signals_df.to_csv(os.path.join(signals_dir, "signals.csv"), index=False, sep=';')
+    print(f"✅ Signals written to {os.path.join(signals_dir, 'signals.csv')}")
+
+    history_df = signal_history(*load_return_panel())
+    history_df.to_parquet(os.path.join(signals_dir, "signal_history.parquet"), index=False)
+    print(f"✅ {len(history_df)} historical signals written to signal_history.parquet")
+
 
-# --- Save signals ---
-signals_df = pd.DataFrame(signals)
-signals_df.to_csv(os.path.join(signals_dir, "signals.csv"), index=False, sep=';')
-print(f"✅ Signals written to {os.path.join(signals_dir, 'signals.csv')}")
+if __name__ == "__main__":
+    main()
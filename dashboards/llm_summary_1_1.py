@@ -1,32 +1,56 @@
-from transformers import pipeline
-import pandas as pd
 import os
 
+import pandas as pd
+
+from summarizer_1_1 import summarize
+
 # Load market tables
 base_dir = os.path.dirname(__file__)
-summary_path = os.path.join(base_dir, "data", "summary", "summary.csv")
-indices_path = os.path.join(base_dir, "data", "indices", "major_indices.csv")
-commodities_path = os.path.join(base_dir, "data", "commodities", "commodities.csv")
+data_dir = os.path.join(base_dir, "data")
+summary_path = os.path.join(data_dir, "summary", "summary.csv")
+
+groups = {
+    "indices": "equity index",
+    "commodities": "commodity",
+    "crypto": "crypto asset",
+    "fixed_income": "bond fund",
+}
+
+
+def load_returns(group):
+    path = os.path.join(data_dir, group, f"{group}.csv")
+    if not os.path.exists(path):
+        print(f"[⚠] Skipping missing file: {path}")
+        return None
+    df = pd.read_csv(path, sep=';')
+    df["ret"] = pd.to_numeric(df["1D_return"].astype(str).str.rstrip('%'), errors='coerce')
+    return df.dropna(subset=["ret"]).sort_values(by="ret", ascending=False)
+
 
-indices = pd.read_csv(indices_path, sep=';')
-commodities = pd.read_csv(commodities_path, sep=';')
+tables = {group: load_returns(group) for group in groups}
+tables = {group: df for group, df in tables.items() if df is not None and not df.empty}
 
-# Build summary input
-top_idx = indices.sort_values(by='1D_return', ascending=False).iloc[0]
-top_commodity = commodities.sort_values(by='1D_return', ascending=False).iloc[0]
+# Build one prompt per asset class plus the market overview, summarized in a single batch
+prompts = {}
+for group, df in tables.items():
+    top, bottom = df.iloc[0], df.iloc[-1]
+    prompts[group] = (
+        f"In {group.replace('_', ' ')}, the best {groups[group]} was {top['name']} with a return of "
+        f"{top['ret']:.2f}%, while {bottom['name']} was weakest at {bottom['ret']:.2f}%. "
+        f"The average daily return across {len(df)} instruments was {df['ret'].mean():.2f}%."
+    )
 
-input_text = f"""
-Markets saw mixed performance. The top equity index was {top_idx['name']} with a return of {top_idx['1D_return']}%.
-In commodities, {top_commodity['name']} led the way with {top_commodity['1D_return']}% daily return.
-"""
+leaders = [f"the top {groups[g]} was {df.iloc[0]['name']} with {df.iloc[0]['ret']:.2f}%" for g, df in tables.items()]
+prompts["market"] = "Markets saw mixed performance. " + "; ".join(leaders) + "."
 
-# Use HuggingFace T5 model for summarization
-summarizer = pipeline("summarization", model="t5-small", tokenizer="t5-small")
-summary = summarizer(input_text, max_length=50, min_length=20, do_sample=False)[0]["summary_text"]
+summaries = dict(zip(prompts, summarize(list(prompts.values()), max_length=50, min_length=20)))
 
 # Save into summary.csv
-summary_df = pd.read_csv(summary_path, sep=';')
-summary_df["commentary"] = summary
+summary_df = pd.read_csv(summary_path, sep=';') if os.path.exists(summary_path) else pd.DataFrame([{}])
+summary_df["commentary"] = summaries["market"]
+for group in tables:
+    summary_df[f"commentary_{group}"] = summaries[group]
+os.makedirs(os.path.dirname(summary_path), exist_ok=True)
 summary_df.to_csv(summary_path, sep=';', index=False)
 
 print("✅ LLM-generated commentary updated.")
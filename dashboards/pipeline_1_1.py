@@ -0,0 +1,226 @@
+"""
+Incremental runner for the morning-report build.
+
+Each step of run_1_1.txt is declared with the files it reads and writes.
+Dependencies follow from those declarations (a step waits for every step
+that writes one of its inputs). A step is skipped when the content hash of
+its script and inputs matches the last successful run and its outputs still
+exist. Steps whose dependencies are done run in parallel. Every run is
+appended, with its duration, to data/pipeline_timings.csv.
+
+Usage:
+    python pipeline_1_1.py
+    python pipeline_1_1.py --dry-run
+    python pipeline_1_1.py --force llm_summary --jobs 2
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(base_dir, "data")
+STATE_FILE = os.path.join(data_dir, ".pipeline_state.json")
+TIMINGS_FILE = os.path.join(data_dir, "pipeline_timings.csv")
+
+GROUPS = ["indices", "commodities", "crypto", "fixed_income"]
+GROUP_TABLES = [f"data/{g}/{g}.csv" for g in GROUPS]
+GROUP_HISTORY = [f"data/{g}/{g}_history.csv" for g in GROUPS]
+
+
+class Step:
+    """One script of the build with its declared inputs and outputs (paths relative to dashboards/).
+
+    `always` steps (e.g. the market download) have inputs outside the
+    tree and run every time; their unchanged outputs still let downstream
+    steps skip.
+    """
+
+    def __init__(self, name, script, inputs=(), outputs=(), after=(), always=False):
+        self.name = name
+        self.script = script
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.always = always
+
+    def path(self, relative):
+        today = datetime.date.today().isoformat()
+        return os.path.normpath(os.path.join(base_dir, relative.format(today=today)))
+
+    def fingerprint(self):
+        """sha256 over the script and every input file (missing files hash as absent)"""
+        digest = hashlib.sha256()
+        for relative in [self.script] + sorted(self.inputs):
+            digest.update(relative.encode())
+            path = self.path(relative)
+            if not os.path.exists(path):
+                digest.update(b"\0missing")
+                continue
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def outputs_exist(self):
+        return all(os.path.exists(self.path(p)) for p in self.outputs)
+
+
+STEPS = [
+    Step("build_data", "build_data_v2_1_1.py",
+         outputs=GROUP_TABLES + GROUP_HISTORY, always=True),
+    Step("llm_summary", "llm_summary_1_1.py",
+         inputs=GROUP_TABLES + ["data/summary/summary.csv", "summarizer_1_1.py"],
+         outputs=["data/summary/summary.csv"]),
+    Step("plot_all", "plots/plot_all.py", inputs=GROUP_HISTORY),
+    Step("plot_grid", "plots/plot_grid.py", inputs=GROUP_TABLES + GROUP_HISTORY,
+         outputs=["../plots/grid_returns.png"]),
+    Step("generate_signals", "generate_signals_1_1.py", inputs=GROUP_TABLES + GROUP_HISTORY,
+         outputs=["data/signals/signals.csv", "data/signals/signals.parquet",
+                  "data/signals/signal_history.parquet"]),
+    Step("report", "generate_report_reportlab_1_1.py",
+         inputs=GROUP_TABLES + GROUP_HISTORY + ["data/signals/signals.csv", "data/summary/summary.csv"],
+         outputs=["report_outputs/morning_report_{today}.pdf"]),
+]
+
+
+def dependencies(steps):
+    """{step name: set of step names it waits for}"""
+    writers = {}
+    for step in steps:
+        for output in step.outputs:
+            writers.setdefault(step.path(output), set()).add(step.name)
+    deps = {}
+    for step in steps:
+        needed = set(step.after)
+        for relative in step.inputs:
+            needed |= writers.get(step.path(relative), set())
+        needed.discard(step.name)
+        deps[step.name] = needed
+    return deps
+
+
+def _load_state():
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    os.makedirs(data_dir, exist_ok=True)
+    tmp_path = STATE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def _record_timings(rows):
+    os.makedirs(data_dir, exist_ok=True)
+    new_file = not os.path.exists(TIMINGS_FILE)
+    with open(TIMINGS_FILE, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        if new_file:
+            writer.writerow(["started", "step", "status", "seconds"])
+        writer.writerows(rows)
+
+
+def _run_script(step):
+    """Run one step's script from dashboards/; returns (status, seconds)"""
+    script = step.path(step.script)
+    if not os.path.exists(script):
+        print(f"[⚠] {step.name}: {step.script} not found — skipping")
+        return "missing", 0.0
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, script], cwd=base_dir)
+    seconds = time.perf_counter() - started
+    return ("ok" if result.returncode == 0 else "failed"), seconds
+
+
+def run(steps=STEPS, force=(), jobs=4, dry_run=False):
+    """Run every stale step in dependency order; returns {step name: status}"""
+    deps = dependencies(steps)
+    by_name = {step.name: step for step in steps}
+    state = _load_state()
+    status = {}
+    timings = []
+    started_at = datetime.datetime.now().isoformat(timespec="seconds")
+
+    def is_fresh(step):
+        # An upstream step that actually ran can change our inputs, so the
+        # fingerprint is only compared once every dependency has finished
+        if step.always or step.name in force or "all" in force:
+            return False
+        previous = state.get(step.name, {})
+        return previous.get("fingerprint") == step.fingerprint() and step.outputs_exist()
+
+    pending = dict(deps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while pending or running:
+            for name in [n for n, needed in pending.items() if needed <= status.keys()]:
+                del pending[name]
+                step = by_name[name]
+                if any(status[d] == "failed" or status[d] == "blocked" for d in deps[name]):
+                    status[name] = "blocked"
+                    print(f"[❌] {name}: blocked by a failed dependency")
+                elif is_fresh(step):
+                    status[name] = "skipped"
+                    print(f"⏩ {name}: inputs unchanged")
+                elif dry_run:
+                    status[name] = "would run"
+                    print(f"🔄 {name}: would run")
+                else:
+                    print(f"🔄 {name}: running {step.script}")
+                    running[executor.submit(_run_script, step)] = step
+
+            if not running:
+                if pending and not any(needed <= status.keys() for needed in pending.values()):
+                    raise RuntimeError(f"Dependency cycle among: {sorted(pending)}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                result, seconds = future.result()
+                status[step.name] = result
+                timings.append([started_at, step.name, result, f"{seconds:.3f}"])
+                if result == "ok":
+                    # Fingerprint after the run so a step that rewrites its own input is not stale next time
+                    state[step.name] = {"fingerprint": step.fingerprint(), "seconds": round(seconds, 3),
+                                        "finished": datetime.datetime.now().isoformat(timespec="seconds")}
+                    print(f"✅ {step.name}: {seconds:.1f}s")
+                elif result == "failed":
+                    print(f"[‼️] {step.name}: failed after {seconds:.1f}s")
+
+    if not dry_run:
+        _save_state(state)
+        _record_timings(timings)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental morning-report build")
+    parser.add_argument("--force", nargs="*", default=[], help="Step names to rerun ('all' for every step)")
+    parser.add_argument("--jobs", type=int, default=4, help="Steps to run in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Only show which steps would run")
+    args = parser.parse_args()
+
+    status = run(force=set(args.force), jobs=args.jobs, dry_run=args.dry_run)
+    print("\n📊 Pipeline summary:")
+    for name, result in status.items():
+        print(f"   {name:<18} {result}")
+    if any(result in ("failed", "blocked") for result in status.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Local summarization worker for the report builders.
+
+The t5-small pipeline is loaded once from a model directory on disk
+(HF offline mode, nothing is fetched at runtime) and kept warm behind a
+small HTTP server on localhost. Requests carry a batch of prompts; results
+are cached in data/cache/summaries.json keyed by the sha256 of model,
+generation settings and prompt, so only unseen prompts reach the model and
+they go through it as one batch.
+
+summarize() is the client: it posts to the worker when it is running and
+otherwise runs the same cached Summarizer in-process.
+
+Usage:
+    python summarizer_1_1.py --save-model          # one-time, online: store t5-small in models/
+    python summarizer_1_1.py serve                 # keep the model warm on 127.0.0.1:8765
+    python summarizer_1_1.py "text one" "text two" # summarize via the worker (or in-process)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+MODEL_NAME = "t5-small"
+MODEL_DIR = os.environ.get("SUMMARIZER_MODEL_DIR", os.path.join(base_dir, "models", MODEL_NAME))
+CACHE_FILE = os.path.join(base_dir, "data", "cache", "summaries.json")
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("SUMMARIZER_PORT", 8765))
+
+DEFAULT_SETTINGS = {"max_length": 50, "min_length": 20}
+BATCH_SIZE = 8
+
+
+def _offline():
+    # Must be set before transformers is imported
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+def save_model(model_dir=MODEL_DIR, name=MODEL_NAME):
+    """Download `name` once and store model + tokenizer under `model_dir`"""
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    AutoTokenizer.from_pretrained(name).save_pretrained(model_dir)
+    AutoModelForSeq2SeqLM.from_pretrained(name).save_pretrained(model_dir)
+    print(f"✅ Saved {name} to {model_dir}")
+
+
+class SummaryCache:
+    """JSON file of prompt-hash -> summary, written atomically"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def key(prompt, settings, model=MODEL_NAME):
+        payload = json.dumps([model, sorted(settings.items()), prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def update(self, new_entries):
+        with self._lock:
+            self.entries.update(new_entries)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class Summarizer:
+    """Warm summarization pipeline with a prompt cache; safe to share between threads"""
+
+    def __init__(self, model_dir=MODEL_DIR, cache=None, batch_size=BATCH_SIZE):
+        self.model_dir = model_dir
+        self.cache = cache if cache is not None else SummaryCache()
+        self.batch_size = batch_size
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._pipeline is None:
+            if not os.path.isdir(self.model_dir):
+                raise FileNotFoundError(f"No local model in {self.model_dir}; run with --save-model once")
+            _offline()
+            from transformers import pipeline
+
+            print(f"📦 Loading {self.model_dir}...")
+            self._pipeline = pipeline("summarization", model=self.model_dir, tokenizer=self.model_dir)
+        return self._pipeline
+
+    def summarize(self, prompts, **settings):
+        """Summaries for `prompts` (same order); cached prompts skip the model"""
+        settings = {**DEFAULT_SETTINGS, **settings}
+        keys = [self.cache.key(p, settings) for p in prompts]
+        missing = {k: p for k, p in zip(keys, prompts) if self.cache.get(k) is None}
+
+        if missing:
+            with self._lock:
+                outputs = self._load()(list(missing.values()), batch_size=self.batch_size,
+                                       do_sample=False, **settings)
+            self.cache.update({k: out["summary_text"] for k, out in zip(missing, outputs)})
+        return [self.cache.get(k) for k in keys]
+
+
+def _handler(summarizer):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, {"status": "ok", "model": summarizer.model_dir})
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/summarize":
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                settings = {k: int(request[k]) for k in DEFAULT_SETTINGS if k in request}
+                summaries = summarizer.summarize(list(request["prompts"]), **settings)
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._reply(500, {"error": str(e)})
+                return
+            self._reply(200, {"summaries": summaries})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host=HOST, port=PORT, model_dir=MODEL_DIR):
+    """Load the model once and answer /summarize requests until interrupted"""
+    summarizer = Summarizer(model_dir)
+    summarizer._load()
+    server = ThreadingHTTPServer((host, port), _handler(summarizer))
+    print(f"✅ Summarizer listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+_local = None
+
+
+def summarize(prompts, url=f"http://{HOST}:{PORT}", timeout=300, **settings):
+    """Summaries from the running worker, or from an in-process Summarizer if none is listening"""
+    global _local
+    payload = json.dumps({"prompts": list(prompts), **settings}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/summarize", data=payload,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())["summaries"]
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"Summarizer error {e.code}: {e.read().decode('utf-8', 'replace')}")
+    except (urllib.error.URLError, ConnectionError):
+        if _local is None:
+            print("⚠️ No summarizer worker running, loading the model in-process")
+            _local = Summarizer()
+        return _local.summarize(list(prompts), **settings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local cached summarization worker")
+    parser.add_argument("prompts", nargs="*", help="'serve' to run the worker, otherwise texts to summarize")
+    parser.add_argument("--save-model", action="store_true", help="Download and store the model locally")
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+
+    if args.save_model:
+        save_model()
+    elif args.prompts == ["serve"]:
+        serve(port=args.port)
+    elif args.prompts:
+        for summary in summarize(args.prompts, url=f"http://{HOST}:{args.port}"):
+            print(summary)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
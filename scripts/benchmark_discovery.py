@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the plot discovery hot loop.
+
+Generates a synthetic tree of plot paths and times the rank-ordered rule
+tables of PlotDiscoverer._classify against the previous per-keyword
+substring scans (best of --repeat runs, each with a fresh discoverer so
+the per-directory cache starts cold), checking that both pick the same
+category, tags and skip decision.
+With --tree the paths are also materialized as sparse files in a temporary
+directory and a cold and a warm (manifest) discovery run are timed.
+
+Usage:
+    python scripts/benchmark_discovery.py --paths 100000
+    python scripts/benchmark_discovery.py --paths 100000 --tree
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from discover_plots import FALLBACK_RULES, SKIP_PATTERNS, TAG_KEYWORDS, PlotDiscoverer
+
+DIRECTORIES = [
+    "core", "core/strategies", "core/strategies/hft", "core/strategies/relative_value",
+    "core/strategies/cross_listing", "core/strategies/hedge", "assets/equities", "assets/crypto",
+    "assets/fixed_income", "assets/commodities", "plots", "research/notebooks", "reports/archive",
+]
+WORDS = [
+    "vwap", "portfolio", "performance", "risk", "simulation", "backtest", "analysis", "btc", "eth",
+    "yield", "curve", "spread", "ipo", "event", "study", "latency", "order", "book", "hedge",
+    "osebx", "sp500", "dual", "listing", "monthly", "daily", "summary", "chart", "draft", "copy",
+    "alpha", "beta", "gamma", "signal", "regime", "factor", "volatility", "momentum",
+]
+
+
+def synthetic_paths(n, seed=0):
+    """`n` plausible plot paths below a handful of research directories"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(n):
+        directory = rng.choice(DIRECTORIES)
+        depth = "/".join(f"run_{rng.randrange(200)}" for _ in range(rng.randrange(3)))
+        name = "_".join(rng.sample(WORDS, rng.randrange(1, 5))) + f"_{i}.pdf"
+        paths.append(Path(directory, depth, "plots", name) if depth else Path(directory, "plots", name))
+    return paths
+
+
+def legacy_classify(discoverer, pdf_path):
+    """Previous implementation: one substring scan per keyword, per rule"""
+    path_str = str(pdf_path).lower()
+    filename = pdf_path.name.lower()
+
+    skip = any(pattern in filename for pattern in SKIP_PATTERNS)
+
+    category = None
+    for name, config in discoverer.categories.items():
+        if any(d in path_str for d in config["directories"]) or any(k in filename for k in config["keywords"]):
+            category = name
+            break
+    if category is None:
+        category = next((c for c, terms in FALLBACK_RULES if any(t in path_str for t in terms)), "other")
+
+    tags = {tag for tag in TAG_KEYWORDS if tag in filename}
+    return category, tags, skip
+
+
+def _best_of(repeat, run):
+    """(fastest wall time, result of the last run) over `repeat` calls of run()"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_classification(paths, repeat=3):
+    reference = PlotDiscoverer()
+    legacy_s, legacy = _best_of(repeat, lambda: [legacy_classify(reference, p) for p in paths])
+
+    def classify_all():
+        discoverer = PlotDiscoverer()
+        return [discoverer._classify(p) for p in paths]
+
+    rules_s, matched = _best_of(repeat, classify_all)
+
+    mismatches = sum(1 for old, new in zip(legacy, matched)
+                     if old != (new["category"], new["tags"], new["skip"]))
+    print(f"📊 Classified {len(paths):,} paths (best of {repeat})")
+    print(f"   substring scans : {legacy_s * 1e3:8.1f} ms ({legacy_s / len(paths) * 1e6:.2f} µs/path)")
+    print(f"   rule tables     : {rules_s * 1e3:8.1f} ms ({rules_s / len(paths) * 1e6:.2f} µs/path)")
+    print(f"   speedup         : {legacy_s / rules_s:.2f}x")
+    print(f"   mismatches      : {mismatches}")
+    return mismatches
+
+
+def bench_tree(paths):
+    with tempfile.TemporaryDirectory() as root:
+        for rel in paths:
+            path = Path(root, rel)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as f:
+                f.truncate(2048)  # sparse: passes the 1 KB size filter without writing data
+
+        for label in ("cold", "warm"):
+            discoverer = PlotDiscoverer(root)
+            started = time.perf_counter()
+            plots = discoverer.discover_plots()
+            elapsed = time.perf_counter() - started
+            print(f"⏱️ {label} discovery: {elapsed * 1e3:.0f} ms for {len(plots):,} plots "
+                  f"({discoverer.stats['updated']:,} processed)")
+            os.utime(Path(root, paths[0]))  # touch one file between runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark plot discovery")
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tree", action="store_true", help="Also time discovery over a real synthetic tree")
+    args = parser.parse_args()
+
+    paths = synthetic_paths(args.paths, args.seed)
+    mismatches = bench_classification(paths, args.repeat)
+    if args.tree:
+        bench_tree(paths)
+    if mismatches:
+        raise SystemExit(f"❌ {mismatches} classification mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,152 @@
 """
 Plot Discovery Script for Buypolar Capital Website
 Automatically discovers and categorizes PDF plots from various simulation directories
+
+Discovery is incremental: a manifest (.plots_manifest.json) keeps each PDF's
+mtime, size, content hash and extracted metadata, and a single os.scandir
+walk (pruning .git, node_modules, data, ...) only re-processes files whose
+mtime or size changed since the last run.
+
+Thumbnails of each plot's first page are rendered in a process pool
+(pypdfium2, or poppler's pdftoppm as a fallback) to fixed-size WebP files
+named after the content hash, so only new or changed PDFs are rasterized.
+
+Besides plots_data.json, save_shards() writes a lazily loadable layout:
+
+    plots_data/index.json                          compact list: id, title, category, thumbnail, page
+    plots_data/categories/<category>/page-N.json   full records, PAGE_SIZE per page, newest first
+    plots_data/search.json                         token -> positions in index.json's plot list
 """
 
 import os
+import sys
 import json
-import glob
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import re
 
+MANIFEST_FILE = ".plots_manifest.json"
+MANIFEST_VERSION = 3
+
+# Directories never descended into during the walk
+IGNORED_DIRS = {
+    ".git", "node_modules", "data", "__pycache__", ".venv", "venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+}
+
+HASH_CHUNK = 1 << 20
+
+THUMBNAIL_DIR = "assets/thumbnails"
+THUMBNAIL_SIZE = (400, 250)
+THUMBNAIL_FORMAT = "webp"
+
+# Filename substrings that mark temporary/test output
+SKIP_PATTERNS = ["temp", "test", "scratch", "draft", "backup", "old_", "new_", "copy", "version"]
+
+# Path substrings used when no category rule matched, checked in order
+FALLBACK_RULES = [
+    ("vwap", ["vwap", "algorithms"]),
+    ("arbitrage", ["cross_listing", "relative_value"]),
+    ("hft", ["hft"]),
+    ("hedging", ["hedge"]),
+    ("ipo", ["ipo"]),
+    ("equities", ["equities", "stock"]),
+    ("crypto", ["crypto", "binance"]),
+    ("fixed-income", ["fixed_income", "yield"]),
+]
+
+# Filename substrings that become tags
+TAG_KEYWORDS = ["portfolio", "performance", "risk", "simulation", "backtest", "analysis"]
+
+SHARD_DIR = "plots_data"
+PAGE_SIZE = 60
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def file_hash(path):
+    """blake2b content hash of a file, read in 1 MB chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _rasterize_first_page(pdf_path, size):
+    """First page of a PDF as a PIL image no larger than `size`"""
+    from PIL import Image
+
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            scale = min(size[0] / width, size[1] / height) * 2  # oversample, then downscale
+            image = page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+    elif shutil.which("pdftoppm"):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            prefix = os.path.join(tmp_dir, "page")
+            subprocess.run(["pdftoppm", "-png", "-singlefile", "-f", "1", "-l", "1",
+                            "-scale-to", str(max(size) * 2), str(pdf_path), prefix],
+                           check=True, capture_output=True)
+            with Image.open(prefix + ".png") as rendered:
+                image = rendered.copy()
+    else:
+        raise RuntimeError("Neither pypdfium2 nor pdftoppm is available")
+
+    image.thumbnail(size)
+    return image
+
+
+def render_thumbnail(pdf_path, out_path, size=THUMBNAIL_SIZE):
+    """Render the first page of `pdf_path` centred on a fixed-size white canvas"""
+    from PIL import Image
+
+    page = _rasterize_first_page(pdf_path, size).convert("RGB")
+    canvas = Image.new("RGB", size, "white")
+    canvas.paste(page, ((size[0] - page.width) // 2, (size[1] - page.height) // 2))
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    image_format = out_path.suffix.lstrip(".").upper().replace("JPG", "JPEG")
+    canvas.save(tmp_path, format=image_format, quality=80, optimize=True)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def _render_job(job):
+    """Process-pool entry point; returns (out_path, error or None)"""
+    pdf_path, out_path, size = job
+    try:
+        render_thumbnail(pdf_path, out_path, size)
+        return out_path, None
+    except Exception as e:
+        return out_path, str(e)
+
+
 class PlotDiscoverer:
-    def __init__(self, base_dir="."):
+    def __init__(self, base_dir=".", manifest_file=MANIFEST_FILE):
         self.base_dir = Path(base_dir)
         self.plots_data = []
+        self.manifest_path = self.base_dir / manifest_file
+        self.manifest = {}
+        self.stats = {"scanned": 0, "reused": 0, "updated": 0, "removed": 0}
+        self._rules = None
+        self._dir_ranks = {}
         
         # Define plot categories and their associated directories/keywords
         self.categories = {
@@ -52,71 +185,203 @@ class PlotDiscoverer:
             }
         }
     
+    def _compile_rules(self):
+        """Flatten the category, fallback, tag and skip rules into rank-ordered lookup tables.
+
+        Each term carries the rank of its rule (category or fallback order).
+        Terms ending in "/" can only occur in the parent directory, so they
+        are resolved once per directory; terms without "/" are also checked
+        against the filename, and terms with an inner "/" against the whole
+        path. Every table is sorted by rank so a scan stops at the first hit.
+        """
+        category_terms = []
+        for rank, config in enumerate(self.categories.values()):
+            category_terms += [(d.lower(), rank, "path") for d in config["directories"]]
+            category_terms += [(k.lower(), rank, "name") for k in config["keywords"]]
+        fallback_terms = [(t.lower(), rank, "path") for rank, (_, terms) in enumerate(FALLBACK_RULES) for t in terms]
+
+        def split(terms):
+            parent = [(t, r) for t, r, scope in terms if scope == "path"]
+            name = [(t, r) for t, r, scope in terms if scope == "name" or "/" not in t]
+            span = [(t, r) for t, r, scope in terms if scope == "path" and "/" in t.rstrip("/")]
+            return tuple(tuple(sorted(table, key=lambda x: x[1])) for table in (parent, name, span))
+
+        return {
+            "names": list(self.categories),
+            "category": split(category_terms),
+            "fallback": split(fallback_terms),
+            "tags": tuple(t.lower() for t in TAG_KEYWORDS),
+            "skip": re.compile("|".join(re.escape(p.lower()) for p in SKIP_PATTERNS)) if SKIP_PATTERNS else None,
+        }
+
+    @staticmethod
+    def _first_rank(table, text, best):
+        """Lowest rank below `best` of a (term, rank) table with a term in `text`"""
+        for term, rank in table:
+            if rank >= best:
+                break
+            if term in text:
+                return rank
+        return best
+
+    def _classify(self, pdf_path):
+        """Chosen category, tags and skip flag of a plot path.
+
+        Directory and fallback rules apply to the whole path; keyword, tag
+        and skip rules only to the filename. The category is the first one
+        (in self.categories order) with any hit, then the first fallback
+        rule, then "other". Directory hits are cached per parent directory,
+        so each file only checks the rules that could still win against its
+        name.
+        """
+        rules = self._rules
+        if rules is None:
+            rules = self._rules = self._compile_rules()
+            self._dir_ranks = {}
+        path_str = str(pdf_path).lower()
+        parent, sep, name = path_str.rpartition(os.sep)
+        parent += sep
+
+        n_categories, n_fallbacks = len(rules["names"]), len(FALLBACK_RULES)
+        dir_ranks = self._dir_ranks.get(parent)
+        if dir_ranks is None:
+            dir_ranks = self._dir_ranks[parent] = (
+                self._first_rank(rules["category"][0], parent, n_categories),
+                self._first_rank(rules["fallback"][0], parent, n_fallbacks),
+            )
+
+        _, name_terms, span_terms = rules["category"]
+        best = self._first_rank(name_terms, name, dir_ranks[0])
+        best = self._first_rank(span_terms, path_str, best)
+        if best < n_categories:
+            category = rules["names"][best]
+        else:
+            _, name_terms, span_terms = rules["fallback"]
+            best = self._first_rank(name_terms, name, dir_ranks[1])
+            best = self._first_rank(span_terms, path_str, best)
+            category = FALLBACK_RULES[best][0] if best < n_fallbacks else "other"
+
+        tags = {tag for tag in rules["tags"] if tag in name}
+        skip = rules["skip"] is not None and rules["skip"].search(name) is not None
+        return {"category": category, "tags": tags, "skip": skip}
+
+    def _config_key(self):
+        """Fingerprint of the categorization/thumbnail rules; cached metadata is dropped when they change"""
+        rules = json.dumps([self.categories, FALLBACK_RULES, TAG_KEYWORDS, SKIP_PATTERNS,
+                            THUMBNAIL_DIR, THUMBNAIL_FORMAT], sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(rules, digest_size=8).hexdigest()
+
+    def _load_manifest(self):
+        """Load the previous run's manifest (empty if missing, outdated or unreadable)"""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("config") != self._config_key():
+            return {}
+        return manifest.get("files", {})
+
+    def _save_manifest(self):
+        """Atomically write the manifest for the next incremental run"""
+        data = {"version": MANIFEST_VERSION, "config": self._config_key(), "files": self.manifest}
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _walk_pdfs(self):
+        """Yield (path string, stat) for every PDF below base_dir in one pruned scandir walk"""
+        stack = [str(self.base_dir)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in IGNORED_DIRS:
+                                    stack.append(entry.path)
+                            elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                                yield entry.path, entry.stat()
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"⚠️ Cannot scan {directory}: {e}")
+
     def discover_plots(self):
-        """Discover all PDF plots in the project"""
+        """Discover all PDF plots in the project, reusing the manifest for unchanged files"""
         print("🔍 Discovering PDF plots...")
-        
-        # Search for PDF files recursively
-        pdf_patterns = [
-            "**/*.pdf",
-            "plots/**/*.pdf",
-            "core/**/plots/*.pdf",
-            "assets/**/plots/*.pdf",
-            "core/strategies/**/plots/*.pdf"
-        ]
-        
-        all_pdfs = []
-        for pattern in pdf_patterns:
-            pdfs = list(self.base_dir.glob(pattern))
-            all_pdfs.extend(pdfs)
-        
-        # Remove duplicates and filter out temporary/test files
-        unique_pdfs = list(set(all_pdfs))
-        filtered_pdfs = [pdf for pdf in unique_pdfs if self._is_valid_plot(pdf)]
-        
-        print(f"📊 Found {len(filtered_pdfs)} valid PDF plots")
-        
-        # Process each plot
-        for pdf_path in filtered_pdfs:
-            plot_info = self._extract_plot_info(pdf_path)
-            if plot_info:
-                self.plots_data.append(plot_info)
-        
+        started = time.perf_counter()
+        previous = self._load_manifest()
+        manifest = {}
+
+        # Keys are sliced off the walked path strings; Path objects are only built for changed files
+        prefix_len = len(os.path.join(str(self.base_dir), ""))
+        for path_str, stat in self._walk_pdfs():
+            key = path_str[prefix_len:].replace(os.sep, "/")
+            self.stats["scanned"] += 1
+
+            cached = previous.get(key)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                manifest[key] = cached
+                self.stats["reused"] += 1
+                continue
+
+            # New or changed file: hash it and re-extract its metadata
+            pdf_path = Path(path_str)
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": None, "info": None}
+            match = self._classify(pdf_path)
+            if self._is_valid_plot(pdf_path, stat, match):
+                try:
+                    entry["hash"] = file_hash(pdf_path)
+                except OSError as e:
+                    print(f"⚠️ Error reading {pdf_path}: {e}")
+                    continue
+                entry["info"] = self._extract_plot_info(pdf_path, stat, entry["hash"], match)
+            manifest[key] = entry
+            self.stats["updated"] += 1
+
+        self.stats["removed"] = len(set(previous) - set(manifest))
+        self.manifest = manifest
+        if self.stats["updated"] or self.stats["removed"]:
+            self._save_manifest()
+
+        self.plots_data = [entry["info"] for _, entry in sorted(manifest.items()) if entry.get("info")]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"📊 Found {len(self.plots_data)} valid PDF plots "
+              f"({self.stats['updated']} new/changed, {self.stats['reused']} unchanged, "
+              f"{self.stats['removed']} removed) in {elapsed_ms:.0f} ms")
         return self.plots_data
     
-    def _is_valid_plot(self, pdf_path):
+    def _is_valid_plot(self, pdf_path, stat=None, match=None):
         """Check if a PDF file is a valid plot (not temporary/test file)"""
-        filename = pdf_path.name.lower()
-        
         # Skip temporary and test files
-        skip_patterns = [
-            "temp", "test", "scratch", "draft", "backup",
-            "old_", "new_", "copy", "version"
-        ]
-        
-        for pattern in skip_patterns:
-            if pattern in filename:
-                return False
+        match = match or self._classify(pdf_path)
+        if match["skip"]:
+            return False
         
         # Skip very small files (likely corrupted or empty)
         try:
-            if pdf_path.stat().st_size < 1000:  # Less than 1KB
+            size = stat.st_size if stat is not None else pdf_path.stat().st_size
+            if size < 1000:  # Less than 1KB
                 return False
-        except:
+        except OSError:
             return False
         
         return True
     
-    def _extract_plot_info(self, pdf_path):
+    def _extract_plot_info(self, pdf_path, stat=None, content_hash=None, match=None):
         """Extract metadata from a PDF plot file"""
         try:
-            # Get file stats
-            stat = pdf_path.stat()
+            # Get file stats (reuse the walk's stat when given)
+            stat = stat if stat is not None else pdf_path.stat()
             file_size = stat.st_size
             modified_time = datetime.fromtimestamp(stat.st_mtime)
             
             # Determine category
-            category = self._categorize_plot(pdf_path)
+            match = match or self._classify(pdf_path)
+            category = match["category"]
             
             # Generate title from filename
             title = self._generate_title(pdf_path.name)
@@ -138,8 +403,8 @@ class PlotDiscoverer:
                 "size_bytes": file_size,
                 "modified": modified_time.isoformat(),
                 "modified_date": modified_time.strftime("%B %d, %Y"),
-                "thumbnail": self._generate_thumbnail_path(pdf_path),
-                "tags": self._extract_tags(pdf_path, category)
+                "thumbnail": self._generate_thumbnail_path(pdf_path, content_hash),
+                "tags": self._extract_tags(pdf_path, category, match)
             }
             
             return plot_info
@@ -150,40 +415,7 @@ class PlotDiscoverer:
     
     def _categorize_plot(self, pdf_path):
         """Categorize a plot based on its path and filename"""
-        path_str = str(pdf_path).lower()
-        filename = pdf_path.name.lower()
-        
-        # Check each category
-        for category, config in self.categories.items():
-            # Check directories
-            for directory in config["directories"]:
-                if directory in path_str:
-                    return category
-            
-            # Check keywords in filename
-            for keyword in config["keywords"]:
-                if keyword in filename:
-                    return category
-        
-        # Default category based on directory structure
-        if "vwap" in path_str or "algorithms" in path_str:
-            return "vwap"
-        elif "cross_listing" in path_str or "relative_value" in path_str:
-            return "arbitrage"
-        elif "hft" in path_str:
-            return "hft"
-        elif "hedge" in path_str:
-            return "hedging"
-        elif "ipo" in path_str:
-            return "ipo"
-        elif "equities" in path_str or "stock" in path_str:
-            return "equities"
-        elif "crypto" in path_str or "binance" in path_str:
-            return "crypto"
-        elif "fixed_income" in path_str or "yield" in path_str:
-            return "fixed-income"
-        
-        return "other"
+        return self._classify(pdf_path)["category"]
     
     def _generate_title(self, filename):
         """Generate a human-readable title from filename"""
@@ -249,32 +481,58 @@ class PlotDiscoverer:
             size_bytes /= 1024.0
         return f"{size_bytes:.1f} TB"
     
-    def _generate_thumbnail_path(self, pdf_path):
-        """Generate path for thumbnail image (placeholder for now)"""
-        # For now, return a placeholder. In a real implementation,
-        # you might generate actual thumbnails from PDFs
-        return f"assets/thumbnails/{pdf_path.stem}.png"
+    def _generate_thumbnail_path(self, pdf_path, content_hash=None):
+        """Thumbnail path for a plot; the content hash in the name keeps it cache-safe"""
+        stem = self._generate_id(pdf_path.name)
+        suffix = f"-{content_hash[:12]}" if content_hash else ""
+        return f"{THUMBNAIL_DIR}/{stem}{suffix}.{THUMBNAIL_FORMAT}"
+
+    def build_thumbnails(self, workers=None, size=THUMBNAIL_SIZE):
+        """Render missing thumbnails in parallel and prune ones no plot references"""
+        # Identical PDFs share one content-hash thumbnail
+        wanted = {}
+        for plot in self.plots_data:
+            if plot.get("thumbnail"):
+                wanted.setdefault(plot["thumbnail"], []).append(plot)
+
+        jobs = [(str(self.base_dir / plots[0]["path"]), str(self.base_dir / thumb), size)
+                for thumb, plots in wanted.items() if not (self.base_dir / thumb).exists()]
+        print(f"🖼️ Thumbnails: {len(wanted) - len(jobs)} up to date, {len(jobs)} to render")
+
+        failed = set()
+        if jobs:
+            workers = workers or min(len(jobs), os.cpu_count() or 1)
+            if workers > 1 and len(jobs) > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_render_job, jobs, chunksize=8))
+            else:
+                results = [_render_job(job) for job in jobs]
+            for out_path, error in results:
+                if error:
+                    failed.add(Path(out_path).relative_to(self.base_dir).as_posix())
+                    print(f"⚠️ Thumbnail failed for {out_path}: {error}")
+
+        # Plots without a rendered thumbnail fall back to the gallery placeholder
+        for thumb in failed:
+            for plot in wanted.pop(thumb):
+                plot["thumbnail"] = None
+
+        thumb_dir = self.base_dir / THUMBNAIL_DIR
+        removed = 0
+        if thumb_dir.exists():
+            for entry in os.scandir(thumb_dir):
+                rel = f"{THUMBNAIL_DIR}/{entry.name}"
+                if entry.is_file() and entry.name.endswith(f".{THUMBNAIL_FORMAT}") and rel not in wanted:
+                    os.remove(entry.path)
+                    removed += 1
+        if removed:
+            print(f"🧹 Removed {removed} stale thumbnails")
+        return len(jobs) - len(failed)
     
-    def _extract_tags(self, pdf_path, category):
+    def _extract_tags(self, pdf_path, category, match=None):
         """Extract relevant tags from the plot"""
-        filename = pdf_path.name.lower()
-        tags = [category]
-        
-        # Add tags based on filename content
-        if "portfolio" in filename:
-            tags.append("portfolio")
-        if "performance" in filename:
-            tags.append("performance")
-        if "risk" in filename:
-            tags.append("risk")
-        if "simulation" in filename:
-            tags.append("simulation")
-        if "backtest" in filename:
-            tags.append("backtest")
-        if "analysis" in filename:
-            tags.append("analysis")
-        
-        return list(set(tags))  # Remove duplicates
+        match = match or self._classify(pdf_path)
+        return sorted(match["tags"] | {category})
     
     def save_to_json(self, output_file="plots_data.json"):
         """Save the plots data to a JSON file"""
@@ -295,6 +553,88 @@ class PlotDiscoverer:
         print(f"💾 Saved plots data to {output_path}")
         return output_path
     
+    def _write_json_if_changed(self, path, data):
+        """Write compact JSON only when the content differs, so unchanged shards keep their mtime/ETag"""
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        try:
+            if path.read_bytes() == payload:
+                return False
+        except OSError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+        return True
+
+    def _tokenize(self, *texts):
+        tokens = set()
+        for text in texts:
+            tokens.update(t for t in TOKEN_PATTERN.findall(str(text).lower()) if len(t) > 1)
+        return tokens
+
+    def save_shards(self, output_dir=SHARD_DIR, page_size=PAGE_SIZE):
+        """Emit a compact index, paginated per-category shards and a search index"""
+        shard_root = self.base_dir / output_dir
+        by_category = {}
+        for plot in self.plots_data:
+            by_category.setdefault(plot["category"], []).append(plot)
+
+        index, search, written, expected = [], {}, 0, set()
+        categories = {}
+        for category in sorted(by_category):
+            plots = sorted(by_category[category], key=lambda p: (p["modified"], p["id"]), reverse=True)
+            pages = max(1, -(-len(plots) // page_size))
+            categories[category] = {"count": len(plots), "pages": pages}
+
+            for page in range(pages):
+                chunk = plots[page * page_size:(page + 1) * page_size]
+                shard_path = shard_root / "categories" / category / f"page-{page + 1}.json"
+                expected.add(shard_path)
+                written += self._write_json_if_changed(shard_path, {
+                    "category": category, "page": page + 1, "pages": pages, "plots": chunk,
+                })
+                for plot in chunk:
+                    position = len(index)
+                    index.append({
+                        "id": plot["id"],
+                        "title": plot["title"],
+                        "category": category,
+                        "thumbnail": plot.get("thumbnail"),
+                        "page": page + 1,
+                    })
+                    for token in self._tokenize(plot["title"], category, *plot.get("tags", [])):
+                        search.setdefault(token, []).append(position)
+
+        written += self._write_json_if_changed(shard_root / "search.json",
+                                               {"tokens": dict(sorted(search.items()))})
+        # Stamped with the newest plot rather than the run time, so an unchanged tree leaves index.json untouched
+        self._write_json_if_changed(shard_root / "index.json", {
+            "metadata": {
+                "generated_at": max((plot["modified"] for plot in self.plots_data), default=None),
+                "total_plots": len(index),
+                "page_size": page_size,
+                "categories": categories,
+            },
+            "plots": index,
+        })
+
+        # Drop pages of categories that shrank or disappeared
+        removed = 0
+        category_root = shard_root / "categories"
+        if category_root.exists():
+            for shard_path in category_root.glob("*/page-*.json"):
+                if shard_path not in expected:
+                    shard_path.unlink()
+                    removed += 1
+            for directory in category_root.iterdir():
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+
+        print(f"🗂️ Wrote {written} changed shard(s), removed {removed}, "
+              f"{len(categories)} categories in {shard_root}")
+        return shard_root / "index.json"
+    
     def generate_summary(self):
         """Generate a summary of discovered plots"""
         print("\n📈 Plot Discovery Summary:")
@@ -324,8 +664,13 @@ def main():
     plots = discoverer.discover_plots()
     
     if plots:
-        # Save to JSON
+        # Render thumbnails for new/changed plots
+        if "--no-thumbnails" not in sys.argv:
+            discoverer.build_thumbnails()
+
+        # Save to JSON (full file plus lazily loadable shards)
         discoverer.save_to_json()
+        discoverer.save_shards()
         
         # Generate summary
         discoverer.generate_summary()